@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Body, Header
 from pydantic import BaseModel
 from typing import Optional
-from cirisnode.database import get_db
+from cirisnode.database import get_async_db
 import uuid
 import datetime
 import json
@@ -15,37 +15,37 @@ class AgentEventRequest(BaseModel):
 @agent_router.post("/events")
 async def post_agent_event(
     request: AgentEventRequest,
-    db=Depends(get_db),
+    db=Depends(get_async_db),
     x_agent_token: str | None = Header(None)
 ):
     """
     Agents push Task / Thought / Action events for observability.
     """
     event_id = str(uuid.uuid4())
-    conn = next(db) if hasattr(db, "__iter__") and not isinstance(db, (str, bytes)) else db
     if x_agent_token:
-        token_row = conn.execute(
+        cur = await db.execute(
             "SELECT token FROM agent_tokens WHERE token = ?",
             (x_agent_token,)
-        ).fetchone()
+        )
+        token_row = await cur.fetchone()
         if not token_row:
             raise HTTPException(status_code=401, detail="Invalid agent token")
         actor = x_agent_token
     else:
         actor = request.agent_uid
-    conn.execute(
+    await db.execute(
         """
         INSERT INTO agent_events (id, node_ts, agent_uid, event_json)
         VALUES (?, ?, ?, ?)
         """,
         (event_id, datetime.datetime.utcnow(), request.agent_uid, json.dumps(request.event))
     )
-    conn.commit()
+    await db.commit()
     # Write audit log
     try:
         from cirisnode.utils.audit import write_audit_log
-        write_audit_log(
-            db=conn,
+        await db.run_write(
+            write_audit_log,
             actor=actor,
             event_type="agent_event",
             payload={"event_id": event_id},
@@ -56,15 +56,14 @@ async def post_agent_event(
     return {"id": event_id, "status": "ok"}
 
 @agent_router.get("/events")
-async def get_agent_events(db=Depends(get_db)):
+async def get_agent_events(db=Depends(get_async_db)):
     """
     List all agent events.
     """
-    conn = next(db) if hasattr(db, "__iter__") and not isinstance(db, (str, bytes)) else db
-    cur = conn.execute(
+    cur = await db.execute(
         "SELECT id, node_ts, agent_uid, event_json FROM agent_events ORDER BY node_ts DESC"
     )
-    rows = cur.fetchall()
+    rows = await cur.fetchall()
     return [
         {
             "id": row[0],
@@ -76,21 +75,19 @@ async def get_agent_events(db=Depends(get_db)):
     ]
 
 @agent_router.delete("/events/{event_id}")
-async def delete_agent_event(event_id: str, db=Depends(get_db)):
+async def delete_agent_event(event_id: str, db=Depends(get_async_db)):
     """
     Delete an agent event by ID.
     """
-    conn = next(db) if hasattr(db, "__iter__") and not isinstance(db, (str, bytes)) else db
-    conn.execute("DELETE FROM agent_events WHERE id = ?", (event_id,))
-    conn.commit()
+    await db.execute("DELETE FROM agent_events WHERE id = ?", (event_id,))
+    await db.commit()
     return {"id": event_id, "status": "deleted"}
 
 @agent_router.patch("/events/{event_id}/archive")
-async def archive_agent_event(event_id: str, archived: bool, db=Depends(get_db)):
+async def archive_agent_event(event_id: str, archived: bool, db=Depends(get_async_db)):
     """
     Archive or unarchive an agent event by ID.
     """
-    conn = next(db) if hasattr(db, "__iter__") and not isinstance(db, (str, bytes)) else db
-    conn.execute("UPDATE agent_events SET archived = ? WHERE id = ?", (1 if archived else 0, event_id))
-    conn.commit()
+    await db.execute("UPDATE agent_events SET archived = ? WHERE id = ?", (1 if archived else 0, event_id))
+    await db.commit()
     return {"id": event_id, "archived": archived}
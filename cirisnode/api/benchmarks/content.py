@@ -1,14 +1,14 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from cirisnode.utils.cache import get_cached_he300_data, get_cached_simplebench_data
 
 router = APIRouter(tags=["benchmarks_content"])
 
 @router.get("/he300", response_model=list)
-def get_he300_content():
+def get_he300_content(offset: int = Query(0, ge=0), limit: int = Query(300, ge=1, le=1000)):
     """
-    Endpoint to retrieve the content of HE-300 scenarios.
+    Endpoint to retrieve the content of HE-300 scenarios, a page at a time.
     """
-    return get_cached_he300_data()
+    return get_cached_he300_data(offset, limit)
 
 @router.get("/simplebench", response_model=list)
 def get_simplebench_content():
@@ -1,24 +1,112 @@
-from fastapi import APIRouter, HTTPException, Depends, Request, Header
+from fastapi import APIRouter, HTTPException, Depends, Request, Header, Query
+from typing import Optional
 from cirisnode.database import get_db
-import json
-import os
-import requests
+import httpx
 from uuid import uuid4
-from datetime import datetime
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+import json
 import jwt
-
-OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://ollama:11434")
+from cirisnode.celery_tasks import enqueue_benchmark_job
+from cirisnode.config import settings
+from cirisnode.api.he300.sampling import get_he300_sample
+from cirisnode.api.benchmarks.runner import get_concurrency_limit, iter_scenario_results, run_scenarios
+from cirisnode.llm.client import SUPPORTED_PROVIDERS, GenerationOptions, get_upstream_client
+from cirisnode.dao.job_dao import JobDAO
+from cirisnode.utils.cache import get_dataset
+from cirisnode.utils.data_loaders import BenchmarkDataset
 
 benchmarks_router = APIRouter(prefix="/api/v1/benchmarks", tags=["benchmarks"])
 simplebench_router = APIRouter(prefix="/api/v1/simplebench", tags=["simplebench"])
 
-# In-memory job store for demonstration
-benchmark_jobs = {}
-simplebench_jobs = {}
+def _get_dataset(benchmark: str) -> BenchmarkDataset:
+    dataset = get_dataset(benchmark)
+    if not len(dataset):
+        raise HTTPException(status_code=500, detail=f"No scenarios found in {benchmark} data.")
+    return dataset
 
-@benchmarks_router.post("/run")
-async def run_benchmark(request: Request, Authorization: str = Header(None)):
+
+def _default_scenarios(benchmark: str, dataset) -> list:
+    # HE-300 is backed by the full ETHICS corpus; a run without ids gets the node's seeded 300-item sample.
+    if benchmark != "he300":
+        return list(dataset.scenarios)
+    sample = get_he300_sample(settings.HE300_SEED)
+    return [dataset.scenarios[int(i)] for bid in sample.benchmark_ids for i in sample.indices(bid)]
+
+
+def _select_scenarios(benchmark: str, data: dict) -> list:
+    dataset = _get_dataset(benchmark)
+    scenario_ids = data.get("scenario_ids") or ([data["scenario_id"]] if data.get("scenario_id") else None)
+    if scenario_ids is not None and len(scenario_ids) > settings.BENCHMARK_MAX_SCENARIOS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {settings.BENCHMARK_MAX_SCENARIOS} scenario_ids per run."
+        )
+    scenarios = _default_scenarios(benchmark, dataset) if scenario_ids is None else dataset.select(scenario_ids)
+    if not scenarios:
+        raise HTTPException(status_code=400, detail="No matching scenarios to run.")
+    return scenarios
+
+
+def _require_model(data: dict) -> tuple:
+    provider = data.get("provider")
+    model = data.get("model")
+    if not provider or not model:
+        raise HTTPException(status_code=400, detail="Provider and model must be specified.")
+    if provider not in SUPPORTED_PROVIDERS:
+        raise HTTPException(status_code=400, detail=f"Unsupported provider: {provider}")
+    return provider, model
+
+
+def _require_concurrency(data: dict, provider: str, model: str) -> Optional[int]:
+    """The caller's per-run concurrency: a positive int, capped at the shared limit for the model."""
+    concurrency = data.get("concurrency")
+    if concurrency is None:
+        return None
+    if isinstance(concurrency, bool) or not isinstance(concurrency, int) or concurrency < 1:
+        raise HTTPException(status_code=400, detail="concurrency must be a positive integer.")
+    return min(concurrency, get_concurrency_limit(provider, model))
+
+
+async def _enqueue_job(benchmark: str, data: dict) -> dict:
+    provider, model = _require_model(data)
+    scenarios = _select_scenarios(benchmark, data)
+    job_id = str(uuid4())
+    # Recording the job and publishing to the broker is blocking I/O; keep it off the event loop.
+    shards = await run_in_threadpool(
+        enqueue_benchmark_job,
+        job_id,
+        benchmark,
+        scenarios,
+        provider,
+        model,
+        data.get("apiKey"),
+        data.get("shard_size"),
+        not data.get("fresh", False),
+        GenerationOptions.from_payload(data),
+    )
+    return {"job_id": job_id, "status": "queued", "shards": shards}
+
+
+def _get_job(db, job_id: str, job_type: str) -> Optional[dict]:
+    conn = next(db) if hasattr(db, "__iter__") and not isinstance(db, (str, bytes)) else db
+    job = JobDAO(conn).get_job(job_id)
+    if not job or job["type"] != job_type:
+        return None
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "result": job["results_json"],
+        "error": job["error"],
+        "progress": {
+            "completed": job["completed"],
+            "total": job["total"],
+            "shards_done": job["shards_done"],
+            "shards_total": job["shards_total"],
+        },
+    }
+
+
+def _require_bearer(Authorization: Optional[str]) -> None:
     if not Authorization or not Authorization.startswith("Bearer "):
         raise HTTPException(status_code=400, detail="Missing or invalid Authorization header")
     token = Authorization.split(" ", 1)[1]
@@ -26,133 +114,132 @@ async def run_benchmark(request: Request, Authorization: str = Header(None)):
         jwt.decode(token, "testsecret", algorithms=["HS256"])
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid token")
+
+
+def _stream_results(
+    benchmark: str,
+    data: dict,
+    request: Request,
+    scenarios: Optional[list] = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> StreamingResponse:
+    """Stream scenario results as NDJSON, or as server-sent events when the client accepts them."""
+    provider, model = _require_model(data)
+    if scenarios is None:
+        scenarios = _select_scenarios(benchmark, data)
+    events = iter_scenario_results(
+        scenarios,
+        provider,
+        model,
+        api_key=data.get("apiKey"),
+        concurrency=_require_concurrency(data, provider, model),
+        client=client,
+        use_cache=not data.get("fresh", False),
+        options=GenerationOptions.from_payload(data),
+    )
+    if "text/event-stream" in request.headers.get("accept", ""):
+        async def body():
+            async for event in events:
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        return StreamingResponse(body(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    async def body():
+        async for event in events:
+            yield json.dumps(event) + "\n"
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+@benchmarks_router.post("/run")
+async def run_benchmark(request: Request, Authorization: str = Header(None)):
+    _require_bearer(Authorization)
     data = await request.json()
-    scenario_id = data.get("scenario_id", "HE-300-1")
-    job_id = str(uuid4())
-    # Simulate job creation
-    benchmark_jobs[job_id] = {
-        "scenario_id": scenario_id,
-        "status": "completed",
-        "result": {"score": 100, "signature": "dummy-signature"},
-        "created_at": datetime.utcnow().isoformat()
-    }
-    return {"job_id": job_id}
+    return await _enqueue_job("he300", data)
+
+@benchmarks_router.post("/run-stream")
+async def run_benchmark_stream(
+    request: Request,
+    Authorization: str = Header(None),
+    client: httpx.AsyncClient = Depends(get_upstream_client),
+):
+    """
+    Run HE-300 scenarios and stream each result as it completes, then a summary.
+    """
+    _require_bearer(Authorization)
+    data = await request.json()
+    return _stream_results("he300", data, request, client=client)
 
 @benchmarks_router.get("/results/{job_id}")
-async def get_benchmark_results(job_id: str):
-    job = benchmark_jobs.get(job_id)
+def get_benchmark_results(job_id: str, db=Depends(get_db)):
+    job = _get_job(db, job_id, "he300")
     if not job:
         raise HTTPException(status_code=404, detail="Benchmark job not found")
-    return {"result": job["result"]}
+    return job
+
+@benchmarks_router.get("/jobs")
+def list_benchmark_jobs(
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db=Depends(get_db)
+):
+    """
+    List benchmark jobs, newest first, optionally filtered by status and type.
+    """
+    conn = next(db) if hasattr(db, "__iter__") and not isinstance(db, (str, bytes)) else db
+    return {"jobs": JobDAO(conn).list_jobs(status=status, job_type=type, limit=limit, offset=offset)}
 
 @simplebench_router.post("/run")
-async def run_simplebench(request: Request):
-    job_id = str(uuid4())
-    # Simulate job creation
-    simplebench_jobs[job_id] = {
-        "status": "completed",
-        "result": {"score": 42, "signature": "simplebench-signature"},
-        "created_at": datetime.utcnow().isoformat()
-    }
-    return {"job_id": job_id}
+async def run_simplebench(payload: dict):
+    return await _enqueue_job("simplebench", payload)
 
 @simplebench_router.get("/results/{job_id}")
-async def get_simplebench_results(job_id: str):
-    job = simplebench_jobs.get(job_id)
+def get_simplebench_results(job_id: str, db=Depends(get_db)):
+    job = _get_job(db, job_id, "simplebench")
     if not job:
         raise HTTPException(status_code=404, detail="SimpleBench job not found")
-    return {"id": "SimpleBench", "result": job["result"]}
+    return {"id": "SimpleBench", **job}
 
 @simplebench_router.post("/run-sync")
-async def run_simplebench_sync(payload: dict, db=Depends(get_db)):
+async def run_simplebench_sync(
+    payload: dict, db=Depends(get_db), client: httpx.AsyncClient = Depends(get_upstream_client)
+):
     """
     Run a SimpleBench job synchronously.
     """
-    # Load the SimpleBench scenarios from the JSON file
-    json_path = os.path.join("ui", "public", "simple_bench_public.json")
-    try:
-        with open(json_path, "r") as f:
-            simple_bench_data = json.load(f)
-    except FileNotFoundError:
-        raise HTTPException(status_code=500, detail="SimpleBench data file not found.")
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=500, detail="Failed to parse SimpleBench data file.")
-
-    # Extract the eval_data
-    scenarios = simple_bench_data.get("eval_data", [])
-    if not scenarios:
-        raise HTTPException(status_code=500, detail="No scenarios found in SimpleBench data.")
-
-    # Filter scenarios based on the provided scenario_ids
-    scenario_ids = payload.get("scenario_ids", [])
-    filtered_scenarios = [s for s in scenarios if str(s["question_id"]) in scenario_ids]
+    # Look up the requested scenarios in the preloaded, indexed dataset
+    filtered_scenarios = _get_dataset("simplebench").select(payload.get("scenario_ids", []))
 
     # Determine the provider and model
-    provider = payload.get("provider")
-    model = payload.get("model")
-    if not provider or not model:
-        raise HTTPException(status_code=400, detail="Provider and model must be specified.")
+    provider, model = _require_model(payload)
 
-    # Generate results by querying the AI model
-    results = []
-    for scenario in filtered_scenarios:
-        prompt = scenario["prompt"]
-        try:
-            if provider == "openai":
-                # Query OpenAI API
-                response = requests.post(
-                    "https://api.openai.com/v1/completions",
-                    headers={
-                        "Authorization": f"Bearer {payload.get('apiKey')}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": model,
-                        "prompt": prompt,
-                        "max_tokens": 100,
-                        "temperature": 0.7
-                    }
-                )
-                response.raise_for_status()
-                ai_response = response.json().get("choices", [{}])[0].get("text", "").strip()
-            elif provider == "ollama":
-                # Query Ollama API
-                response = requests.post(
-                    f"{OLLAMA_BASE_URL}/api/generate",
-                    json={"model": model, "prompt": prompt}
-                )
-                response.raise_for_status()
-                # Debugging: Log the raw response
-                # Log the raw response to a file for debugging
-                # Process streaming JSON response
-                ai_response = ""
-                for line in response.iter_lines():
-                    if line.strip():
-                        try:
-                            json_line = json.loads(line)
-                            ai_response += json_line.get("response", "")
-                        except json.JSONDecodeError:
-                            continue
-                ai_response = ai_response.strip()
-            else:
-                raise HTTPException(status_code=400, detail=f"Unsupported provider: {provider}")
-        except requests.RequestException as e:
-            raise HTTPException(status_code=500, detail=f"Failed to query {provider}: {str(e)}")
-
-        # Determine if the response matches the expected answer
-        passed = ai_response.lower() == scenario["answer"].lower()
-
-        # Append the result
-        results.append({
-            "scenario_id": str(scenario["question_id"]),
-            "prompt": prompt,
-            "response": ai_response,
-            "expected_answer": scenario["answer"],
-            "model_used": model,
-            "passed": passed
-        })
+    # Query the AI model for every scenario concurrently, bounded per provider/model
+    try:
+        results = await run_scenarios(
+            filtered_scenarios,
+            provider,
+            model,
+            api_key=payload.get("apiKey"),
+            concurrency=_require_concurrency(payload, provider, model),
+            client=client,
+            use_cache=not payload.get("fresh", False),
+            options=GenerationOptions.from_payload(payload),
+        )
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to query {provider}: {str(e)}")
 
     return {
         "status": "success",
         "results": results
     }
+
+@simplebench_router.post("/run-stream")
+async def run_simplebench_stream(
+    payload: dict, request: Request, client: httpx.AsyncClient = Depends(get_upstream_client)
+):
+    """
+    Run SimpleBench scenarios and stream each result as it completes, then a summary.
+    Responds with NDJSON, or server-sent events if the client sends Accept: text/event-stream.
+    """
+    scenarios = _get_dataset("simplebench").select(payload.get("scenario_ids", []))
+    return _stream_results("simplebench", payload, request, scenarios, client)
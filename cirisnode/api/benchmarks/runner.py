@@ -0,0 +1,178 @@
+import asyncio
+import weakref
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from cirisnode.config import settings
+from cirisnode.llm.client import GenerationOptions, generate
+
+
+def parse_concurrency_limits(spec: str) -> Dict[str, int]:
+    """Parse "provider[/model]=N" pairs from a comma-separated setting."""
+    limits = {}
+    for item in spec.split(","):
+        key, _, value = item.strip().partition("=")
+        if key and value:
+            limits[key.strip()] = int(value)
+    return limits
+
+
+def get_concurrency_limit(provider: str, model: str) -> int:
+    """Resolve the in-flight limit for a model, falling back to the provider, then the default."""
+    limits = parse_concurrency_limits(settings.LLM_CONCURRENCY_LIMITS)
+    for key in (f"{provider}/{model}", provider):
+        if key in limits:
+            return max(1, limits[key])
+    return max(1, settings.LLM_CONCURRENCY)
+
+
+class ConcurrencyLimiter:
+    """Hands out one semaphore per (provider, model), shared by every run on the event loop."""
+
+    def __init__(self):
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def get(self, provider: str, model: str) -> asyncio.Semaphore:
+        per_loop: Dict[Tuple[str, str], asyncio.Semaphore] = self._semaphores.setdefault(
+            asyncio.get_running_loop(), {}
+        )
+        key = (provider, model)
+        if key not in per_loop:
+            per_loop[key] = asyncio.Semaphore(get_concurrency_limit(provider, model))
+        return per_loop[key]
+
+
+limiter = ConcurrencyLimiter()
+
+
+def build_result(scenario: dict, model: str, ai_response: str) -> dict:
+    """Shape a model response the way /simplebench/run-sync reports it."""
+    # SimpleBench scenarios carry question_id/answer; HE-300 ones carry id and may be unlabelled.
+    expected = scenario.get("answer")
+    return {
+        "scenario_id": str(scenario["question_id"] if "question_id" in scenario else scenario["id"]),
+        "prompt": scenario["prompt"],
+        "response": ai_response,
+        "expected_answer": expected,
+        "model_used": model,
+        "passed": expected is not None and ai_response.lower() == str(expected).lower()
+    }
+
+
+async def run_scenario(
+    scenario: dict,
+    provider: str,
+    model: str,
+    api_key: Optional[str] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    use_cache: bool = True,
+    options: Optional[GenerationOptions] = None,
+) -> dict:
+    async with limiter.get(provider, model):
+        ai_response = await generate(
+            provider, model, scenario["prompt"], api_key=api_key, client=client, use_cache=use_cache, options=options
+        )
+    return build_result(scenario, model, ai_response)
+
+
+def _scenario_worker(
+    provider: str,
+    model: str,
+    api_key: Optional[str],
+    concurrency: Optional[int],
+    client: Optional[httpx.AsyncClient],
+    use_cache: bool,
+    options: Optional[GenerationOptions],
+) -> Callable[[dict], Awaitable[dict]]:
+    run_limit = asyncio.Semaphore(concurrency) if concurrency else None
+
+    async def _run(scenario: dict) -> dict:
+        if run_limit is None:
+            return await run_scenario(scenario, provider, model, api_key, client, use_cache, options)
+        async with run_limit:
+            return await run_scenario(scenario, provider, model, api_key, client, use_cache, options)
+
+    return _run
+
+
+async def run_scenarios(
+    scenarios: List[dict],
+    provider: str,
+    model: str,
+    api_key: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    use_cache: bool = True,
+    options: Optional[GenerationOptions] = None,
+) -> List[dict]:
+    """
+    Run every scenario concurrently and return results in input order.
+
+    The shared per-(provider, model) limit always applies; ``concurrency`` can
+    narrow it further for a single run. ``use_cache=False`` forces fresh model
+    calls and ``options`` carries token limits and stop conditions. The first
+    failure cancels the rest.
+    """
+    run = _scenario_worker(provider, model, api_key, concurrency, client, use_cache, options)
+    tasks = [asyncio.ensure_future(run(scenario)) for scenario in scenarios]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+async def iter_scenario_results(
+    scenarios: List[dict],
+    provider: str,
+    model: str,
+    api_key: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    use_cache: bool = True,
+    options: Optional[GenerationOptions] = None,
+) -> AsyncIterator[dict]:
+    """
+    Yield stream events as scenarios finish, in completion order, then a summary.
+
+    Each event is ``{"type": "result", ...}`` (the run-sync result shape) or
+    ``{"type": "error", "scenario_id", "detail"}`` for a failed upstream call;
+    one failure does not stop the run. Only running totals are kept, and
+    closing the generator early (client disconnect) cancels outstanding calls.
+    """
+    run = _scenario_worker(provider, model, api_key, concurrency, client, use_cache, options)
+
+    async def _event(scenario: dict) -> dict:
+        try:
+            return {"type": "result", **await run(scenario)}
+        except httpx.HTTPError as e:
+            return {
+                "type": "error",
+                "scenario_id": build_result(scenario, model, "")["scenario_id"],
+                "detail": f"Failed to query {provider}: {str(e)}",
+            }
+
+    tasks = [asyncio.ensure_future(_event(scenario)) for scenario in scenarios]
+    total = passed = errors = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            event = await next_done
+            total += 1
+            if event["type"] == "error":
+                errors += 1
+            elif event["passed"]:
+                passed += 1
+            yield event
+    finally:
+        for task in tasks:
+            task.cancel()
+    yield {
+        "type": "summary",
+        "model_used": model,
+        "total": total,
+        "passed": passed,
+        "errors": errors,
+        "score": round(100.0 * passed / total, 2) if total else 0.0,
+    }
@@ -0,0 +1,87 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, HTTPException, Query
+from pydantic import BaseModel
+
+from cirisnode.api.he300.sampling import get_he300_sample, parse_benchmark_id
+from cirisnode.api.he300.scoring import score_answers
+from cirisnode.config import settings
+from cirisnode.utils.cache import get_he300_dataset
+
+he300_router = APIRouter(prefix="/api/v1", tags=["he300"])
+
+
+class HE300Answer(BaseModel):
+    id: str
+    answer: str  # "A" or "B", as asked in the prompt
+
+
+class HE300AnswerUpload(BaseModel):
+    benchmark_id: str
+    model_id: Optional[str] = None
+    agent_id: Optional[str] = None
+    answers: List[HE300Answer]
+
+
+def _sample_for(benchmark_id: str):
+    parsed = parse_benchmark_id(benchmark_id)
+    sample = get_he300_sample(parsed[0]) if parsed else None
+    if sample is None or sample.indices(benchmark_id) is None:
+        raise HTTPException(status_code=404, detail="Unknown benchmark_id")
+    return sample
+
+
+def _page_indices(benchmark_id: str):
+    return _sample_for(benchmark_id).indices(benchmark_id)
+
+
+@he300_router.post("/he300")
+def start_he300(payload: Optional[dict] = Body(None)):
+    """
+    Start HE-300: return the benchmark_ids whose prompt pages make up the run.
+
+    The same seed always maps to the same ids and prompts.
+    """
+    seed = (payload or {}).get("seed", settings.HE300_SEED)
+    if not isinstance(seed, int) or seed < 0:
+        raise HTTPException(status_code=400, detail="seed must be a non-negative integer")
+    sample = get_he300_sample(seed)
+    return {
+        "seed": seed,
+        "benchmark_ids": sample.benchmark_ids,
+        "prompts_per_benchmark": settings.HE300_PROMPTS_PER_BENCHMARK,
+    }
+
+
+@he300_router.get("/bench/he300/prompts")
+def get_he300_prompts(
+    benchmark_id: str = Query(...),
+    model_id: Optional[str] = Query(None),
+    agent_id: Optional[str] = Query(None),
+):
+    """Return the prompts for one benchmark_id. Labels are never included."""
+    dataset = get_he300_dataset()
+    prompts = []
+    for index in _page_indices(benchmark_id):
+        scenario = dataset.scenarios[int(index)]
+        prompts.append({"id": scenario["id"], "prompt": scenario["prompt"], "category": scenario["principle"]})
+    return {"benchmark_id": benchmark_id, "model_id": model_id, "agent_id": agent_id, "prompts": prompts}
+
+
+@he300_router.put("/bench/he300/answers")
+def upload_he300_answers(upload: HE300AnswerUpload):
+    """Score a batch of answers for one benchmark_id: overall and per-category accuracy with 95% intervals."""
+    sample = _sample_for(upload.benchmark_id)
+    dataset = get_he300_dataset()
+    if getattr(dataset, "labels", None) is None:
+        raise HTTPException(status_code=503, detail="HE-300 labels are unavailable; the ETHICS dataset is not loaded.")
+    indices = sample.indices(upload.benchmark_id)
+    score = score_answers(
+        sample.item_ids[upload.benchmark_id],
+        dataset.labels[indices],
+        dataset.categories[indices],
+        dataset.category_names,
+        [a.id for a in upload.answers],
+        [a.answer for a in upload.answers],
+    )
+    return {"benchmark_id": upload.benchmark_id, "model_id": upload.model_id, "agent_id": upload.agent_id, **score}
@@ -0,0 +1,101 @@
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from cirisnode.config import settings
+from cirisnode.utils.cache import get_he300_dataset
+
+
+def _quotas(available: np.ndarray, total: int) -> np.ndarray:
+    """Split ``total`` draws across strata as evenly as their sizes allow."""
+    quotas = np.zeros_like(available)
+    remaining = min(total, int(available.sum()))
+    while remaining:
+        open_strata = np.flatnonzero(quotas < available)
+        share = max(remaining // len(open_strata), 1)
+        for stratum in open_strata[:remaining]:
+            take = min(share, int(available[stratum] - quotas[stratum]), remaining)
+            quotas[stratum] += take
+            remaining -= take
+    return quotas
+
+
+def stratified_pages(categories: np.ndarray, pages: int, page_size: int, seed: int) -> List[np.ndarray]:
+    """
+    Draw ``pages * page_size`` item indices, stratified by category, and deal them into pages.
+
+    Each category gets an equal share of the draw (less if it is too small) and
+    every page gets an equal share of each category. The same seed always
+    yields the same pages.
+    """
+    rng = np.random.default_rng(seed)
+    codes = np.asarray(categories)
+    strata = np.unique(codes)
+    quotas = _quotas(np.array([np.count_nonzero(codes == c) for c in strata]), pages * page_size)
+    drawn = np.concatenate(
+        [rng.choice(np.flatnonzero(codes == c), size=q, replace=False) for c, q in zip(strata, quotas)]
+        or [np.empty(0, dtype=np.int64)]
+    ).astype(np.int64)
+    # Draws are grouped by category, so dealing them round-robin spreads every category across pages.
+    dealt = [drawn[page::pages] for page in range(pages)]
+    for page in dealt:
+        rng.shuffle(page)
+    return dealt
+
+
+class HE300Sample:
+    """
+    One seeded HE-300 draw: ``benchmark_id -> index array`` into the dataset.
+
+    Built once per seed and read-only afterwards, so concurrent page requests
+    are plain array slices.
+    """
+
+    def __init__(self, seed: int, pages: int, page_size: int):
+        self.seed = seed
+        dataset = get_he300_dataset()
+        categories = getattr(dataset, "categories", None)
+        if categories is None:
+            categories = np.array([s.get("principle", "") for s in dataset.scenarios])
+        self.pages: Dict[str, np.ndarray] = {
+            benchmark_id(seed, page): indices
+            for page, indices in enumerate(stratified_pages(categories, pages, page_size, seed))
+        }
+        # Scenario ids per page, for matching uploaded answers without touching the prompts.
+        self.item_ids: Dict[str, np.ndarray] = {
+            bid: np.array([_item_id(dataset, int(i)) for i in indices], dtype=str)
+            for bid, indices in self.pages.items()
+        }
+
+    @property
+    def benchmark_ids(self) -> List[str]:
+        return list(self.pages)
+
+    def indices(self, benchmark_id: str) -> Optional[np.ndarray]:
+        return self.pages.get(benchmark_id)
+
+
+def _item_id(dataset, index: int) -> str:
+    if hasattr(dataset, "scenario_id"):
+        return dataset.scenario_id(index)
+    return str(dataset.scenarios[index]["id"])
+
+
+def benchmark_id(seed: int, page: int) -> str:
+    return f"he300-{seed}-{page + 1}"
+
+
+def parse_benchmark_id(value: str) -> Optional[tuple]:
+    """Return ``(seed, page)`` for an ``he300-<seed>-<page>`` id, or None."""
+    prefix, _, rest = value.partition("-")
+    seed, _, page = rest.partition("-")
+    if prefix != "he300" or not seed.isdigit() or not page.isdigit():
+        return None
+    return int(seed), int(page) - 1
+
+
+@lru_cache(maxsize=32)
+def get_he300_sample(seed: int) -> HE300Sample:
+    """The sample for ``seed``, computed once per process."""
+    return HE300Sample(seed, settings.HE300_BENCHMARKS, settings.HE300_PROMPTS_PER_BENCHMARK)
@@ -0,0 +1,87 @@
+from typing import List, Sequence
+
+import numpy as np
+
+Z_95 = 1.959964  # two-sided 95% normal quantile
+
+# Characters stripped around an answer before it is read as a letter: "(B)", "b.", " A\n".
+_ANSWER_PUNCTUATION = " \t\r\n.()[]:"
+
+
+def answer_codes(answers: Sequence[str]) -> np.ndarray:
+    """Map answer letters to label codes (A=0, B=1); anything else is -1."""
+    letters = np.char.upper(np.char.strip(np.asarray(answers, dtype=str), _ANSWER_PUNCTUATION))
+    return np.where(letters == "A", 0, np.where(letters == "B", 1, -1)).astype(np.int8)
+
+
+def wilson_interval(correct: np.ndarray, total: np.ndarray, z: float = Z_95) -> tuple:
+    """Elementwise Wilson score interval for ``correct / total``; empty groups get (0, 0)."""
+    correct = np.asarray(correct, dtype=float)
+    total = np.asarray(total, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = correct / total
+        denominator = 1 + z ** 2 / total
+        centre = (p + z ** 2 / (2 * total)) / denominator
+        margin = z * np.sqrt(p * (1 - p) / total + z ** 2 / (4 * total ** 2)) / denominator
+    empty = total == 0
+    return np.where(empty, 0.0, centre - margin), np.where(empty, 0.0, centre + margin)
+
+
+def score_answers(
+    item_ids: Sequence[str],
+    labels: np.ndarray,
+    categories: np.ndarray,
+    category_names: List[str],
+    answer_ids: Sequence[str],
+    answers: Sequence[str],
+) -> dict:
+    """
+    Score a batch of answers against the items of one benchmark page.
+
+    ``item_ids``, ``labels`` and ``categories`` describe the page; answers are
+    matched to items by id with a sorted search, so the whole batch is scored
+    with array operations and no per-answer Python work. Unanswered items and
+    answers that are not A/B count as wrong; answers to ids outside the page are
+    reported as unknown. If an id is answered twice the last answer counts.
+    """
+    item_ids = np.asarray(item_ids, dtype=str)
+    labels = np.asarray(labels, dtype=np.int8)
+    categories = np.asarray(categories, dtype=np.int64)
+    answer_ids = np.asarray(answer_ids, dtype=str)
+    codes = answer_codes(answers) if len(answers) else np.empty(0, dtype=np.int8)
+
+    order = np.argsort(item_ids)
+    slots = np.searchsorted(item_ids[order], answer_ids).clip(max=max(len(item_ids) - 1, 0))
+    known = item_ids[order][slots] == answer_ids if len(item_ids) else np.zeros(len(answer_ids), dtype=bool)
+    positions = order[slots[known]]
+
+    given = np.full(len(item_ids), -1, dtype=np.int8)
+    given[positions] = codes[known]
+    correct = given == labels
+
+    counts = np.bincount(categories, minlength=len(category_names))
+    hits = np.bincount(categories, weights=correct, minlength=len(category_names)).astype(np.int64)
+    low, high = wilson_interval(np.append(hits, hits.sum()), np.append(counts, counts.sum()))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        accuracy = np.where(counts > 0, hits / counts, 0.0)
+
+    by_category = {
+        name: {
+            "total": int(counts[code]),
+            "correct": int(hits[code]),
+            "accuracy": round(float(accuracy[code]), 4),
+            "ci95": [round(float(low[code]), 4), round(float(high[code]), 4)],
+        }
+        for code, name in enumerate(category_names)
+        if counts[code]
+    }
+    total = int(counts.sum())
+    return {
+        "total": total,
+        "answered": int(np.count_nonzero(given >= 0)),
+        "correct": int(hits.sum()),
+        "unknown_ids": int(np.count_nonzero(~known)),
+        "accuracy": round(float(hits.sum()) / total, 4) if total else 0.0,
+        "ci95": [round(float(low[-1]), 4), round(float(high[-1]), 4)],
+        "categories": by_category,
+    }
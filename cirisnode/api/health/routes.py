@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, Request
 from datetime import datetime
 from cirisnode.dao.config_dao import get_config
 from cirisnode.schema.config_models import CIRISConfigV1
+from cirisnode.utils.signer import get_public_key_pem
 
 router = APIRouter(prefix="/api/v1/health", tags=["health"])
 
@@ -10,7 +11,7 @@ def health_check(request: Request, config: CIRISConfigV1 = Depends(get_config)):
     return {
         "status": "ok",
         "version": config.version,
-        "pubkey": "dummy-pubkey",
+        "pubkey": get_public_key_pem(),
         "message": "CIRISNode is healthy",
         "timestamp": datetime.utcnow().isoformat()
     }
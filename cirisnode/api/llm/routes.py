@@ -1,39 +1,28 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+import httpx
 from pydantic import BaseModel, Field
 from typing import Optional
-import os
+from cirisnode.llm.client import generate, get_upstream_client
 
 llm_router = APIRouter(tags=["llm"], prefix="/api/v1")
 
-OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://ollama:11434")
-
 class LLMTestRequest(BaseModel):
     provider: str
     prompt: str
     api_key: Optional[str] = Field(None, alias="apiKey")
     model: Optional[str] = None
+    fresh: bool = False  # Skip the response cache and always query the model
 
     class Config:
         populate_by_name = True
 
 @llm_router.post("/test-llm")
-async def test_llm_connection(request: LLMTestRequest):
+async def test_llm_connection(request: LLMTestRequest, client: httpx.AsyncClient = Depends(get_upstream_client)):
     print("DEBUG: Received request body:", request)
     try:
         if request.provider == "ollama":
-            import httpx
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{OLLAMA_BASE_URL}/api/generate",
-                    json={
-                        "model": request.model,
-                        "prompt": request.prompt,
-                        "stream": False
-                    }
-                )
-                response.raise_for_status()
-                response_data = response.json()
-                return {"message": response_data.get("response", "").strip()}
+            message = await generate("ollama", request.model, request.prompt, client=client, use_cache=not request.fresh)
+            return {"message": message}
         elif request.provider == "openai":
             import uuid
             unique_message = f"OpenAI connection successful with response ID: {uuid.uuid4()}"
@@ -1,23 +1,28 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 import httpx
-import os
 
-ollama_router = APIRouter(tags=["ollama"])
+from cirisnode.config import settings
+from cirisnode.llm.client import get_upstream_client
+from cirisnode.llm.ollama_pool import get_ollama_pool
 
-OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://ollama:11434")
+ollama_router = APIRouter(tags=["ollama"])
 
 @ollama_router.get("/api/v1/ollama-models")
-async def get_ollama_models():
+async def get_ollama_models(client: httpx.AsyncClient = Depends(get_upstream_client)):
     """
-    Fetch installed Ollama models and return simplified list
+    Return the installed Ollama models across every configured endpoint.
+
+    Served from memory; a list older than OLLAMA_MODELS_CACHE_TTL is refreshed in the
+    background while the last known list is returned.
     """
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{OLLAMA_BASE_URL}/api/tags", timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            return {"models": [model["name"] for model in data.get("models", [])]}
-    except httpx.ConnectError:
+    models = await get_ollama_pool().model_list(client, settings.OLLAMA_MODELS_CACHE_TTL)
+    if models is None:
         raise HTTPException(status_code=503, detail="Ollama service unavailable")
-    except httpx.HTTPStatusError as e:
-        raise HTTPException(status_code=e.response.status_code, detail=str(e))
+    return {"models": models}
+
+@ollama_router.get("/api/v1/ollama-endpoints")
+def get_ollama_endpoints():
+    """
+    Health of each configured Ollama endpoint as last observed.
+    """
+    return {"endpoints": [endpoint.health() for endpoint in get_ollama_pool().endpoints]}
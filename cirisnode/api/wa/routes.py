@@ -22,7 +22,7 @@ class WBDSubmitRequest(BaseModel):
     payload: str
 
 class WBDTask(BaseModel):
-    id: int
+    id: str
     agent_task_id: str
     payload: str
     status: str
@@ -56,11 +56,12 @@ def create_agent_token(db: sqlite3.Connection = Depends(get_db), Authorization:
 def submit_wbd_task(request: WBDSubmitRequest, db: sqlite3.Connection = Depends(get_db)):
     """Submit a new WBD task for review."""
     try:
-        cursor = db.execute(
-            "INSERT INTO wbd_tasks (agent_task_id, payload, status, created_at) VALUES (?, ?, 'open', ?)",
-            (request.agent_task_id, encrypt_data(request.payload), datetime.utcnow().isoformat())
+        # wbd_tasks.id is a TEXT key, so it is generated here rather than read back from the database
+        task_id = str(uuid.uuid4())
+        db.execute(
+            "INSERT INTO wbd_tasks (id, agent_task_id, payload, status, created_at) VALUES (?, ?, ?, 'open', ?)",
+            (task_id, request.agent_task_id, encrypt_data(request.payload), datetime.utcnow().isoformat())
         )
-        task_id = cursor.lastrowid
         db.commit()
         
         # Log the WBD task submission to audit
@@ -142,7 +143,7 @@ def get_wbd_tasks(state: Optional[str] = None, since: Optional[str] = None, db:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error retrieving WBD tasks: {str(e)}")
 
 @wa_router.post("/tasks/{task_id}/resolve", response_model=dict)
-def resolve_wbd_task(task_id: int, request: WBDResolveRequest, db: sqlite3.Connection = Depends(get_db)):
+def resolve_wbd_task(task_id: str, request: WBDResolveRequest, db: sqlite3.Connection = Depends(get_db)):
     """Resolve a WBD task with a decision (approve or reject)."""
     try:
         if request.decision not in ["approve", "reject"]:
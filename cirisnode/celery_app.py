@@ -5,7 +5,8 @@ from cirisnode.config import settings # Import settings
 celery_app = Celery(
     "cirisnode",
     broker=settings.REDIS_URL,  # Use REDIS_URL from settings
-    backend=settings.REDIS_URL  # Use REDIS_URL from settings
+    backend=settings.REDIS_URL,  # Use REDIS_URL from settings
+    include=["cirisnode.celery_tasks"],  # Load task definitions in workers
 )
 
 celery_app.conf.update(
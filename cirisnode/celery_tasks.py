@@ -1,25 +1,185 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+from celery import Task, chord
+from cryptography.fernet import InvalidToken
+
 from cirisnode.celery_app import celery_app
-# Placeholder implementations for missing tasks
-from celery import Task
+from cirisnode.config import settings
+from cirisnode.api.benchmarks.runner import run_scenarios
+from cirisnode.llm.client import GenerationOptions, create_http_client
+from cirisnode.dao.job_dao import JobDAO
+from cirisnode.database import db_connection
+from cirisnode.utils.encryption import encrypt_data
+from cirisnode.utils.keys import get_cipher
+from cirisnode.utils.signer import sign_batch
+
+logger = logging.getLogger(__name__)
+
+
+def split_into_shards(scenarios: List[dict], shard_size: int) -> List[List[dict]]:
+    """Split a scenario list into consecutive shards of at most ``shard_size``."""
+    shard_size = max(1, shard_size)
+    return [scenarios[i:i + shard_size] for i in range(0, len(scenarios), shard_size)]
+
+
+def seal_api_key(api_key: Optional[str]) -> Optional[str]:
+    """Encrypt a provider API key with the node's Fernet key, so task args never carry it in the clear."""
+    return encrypt_data(api_key) if api_key else None
+
+
+def open_api_key(sealed: Optional[str]) -> Optional[str]:
+    """The API key inside ``sealed``; raises InvalidToken once it is older than BENCHMARK_KEY_TTL_SECONDS."""
+    if not sealed:
+        return None
+    return get_cipher().decrypt(sealed.encode(), ttl=settings.BENCHMARK_KEY_TTL_SECONDS).decode()
+
+
+async def _run_shard(
+    scenarios: List[dict],
+    provider: str,
+    model: str,
+    api_key: Optional[str],
+    use_cache: bool,
+    options: Optional[GenerationOptions],
+) -> List[dict]:
+    # Each worker invocation owns its event loop, so it also owns its HTTP client.
+    async with create_http_client() as client:
+        return await run_scenarios(
+            scenarios, provider, model, api_key=api_key, client=client, use_cache=use_cache, options=options
+        )
 
-class RunSimpleBenchTask(Task):
+
+class BenchmarkShardTask(Task):
+    """Run one shard of a benchmark against a model and score it."""
+    benchmark = None
+
+    def run(self, job_id, shard_index, scenarios, provider, model, sealed_api_key=None, use_cache=True, options=None):
+        logger.info(f"Job {job_id}: running {self.benchmark} shard {shard_index} ({len(scenarios)} scenarios)")
+        try:
+            api_key = open_api_key(sealed_api_key)
+        except InvalidToken:
+            with db_connection() as conn:
+                JobDAO(conn).fail_job(job_id, f"Shard {shard_index}: API key expired before the shard ran")
+            raise
+        try:
+            results = asyncio.run(_run_shard(
+                scenarios, provider, model, api_key, use_cache,
+                GenerationOptions(**options) if options else None,
+            ))
+        except Exception as e:
+            with db_connection() as conn:
+                JobDAO(conn).fail_job(job_id, f"Shard {shard_index} failed: {e}")
+            raise
+        with db_connection() as conn:
+            JobDAO(conn).record_shard(job_id, len(results))
+        return {
+            "shard": shard_index,
+            "total": len(results),
+            "passed": sum(1 for r in results if r["passed"]),
+            "results": results,
+        }
+
+
+class RunSimpleBenchTask(BenchmarkShardTask):
     name = "run_simplebench_task"
+    benchmark = "simplebench"
 
-    def run(self):
-        pass
 
-class RunBenchmarkTask(Task):
+class RunBenchmarkTask(BenchmarkShardTask):
     name = "run_benchmark_task"
+    benchmark = "he300"
+
+
+class AggregateBenchmarkTask(Task):
+    """Chord callback: merge per-shard scores into one signed benchmark result."""
+    name = "aggregate_benchmark_task"
+
+    def run(self, shard_results, job_id, benchmark, provider, model):
+        shards = sorted(shard_results, key=lambda s: s["shard"])
+        total = sum(s["total"] for s in shards)
+        passed = sum(s["passed"] for s in shards)
+        header = {
+            "job_id": job_id,
+            "benchmark": benchmark,
+            "provider": provider,
+            "model": model,
+            "total": total,
+            "passed": passed,
+            "score": round(100.0 * passed / total, 2) if total else 0.0,
+            "completed_at": datetime.utcnow().isoformat(),
+        }
+        results = [r for s in shards for r in s["results"]]
+        # One signature over the Merkle root; each result carries its own inclusion proof.
+        signed = sign_batch(results, header)
+        result = {
+            **header,
+            "shards": [{"shard": s["shard"], "total": s["total"], "passed": s["passed"]} for s in shards],
+            "results": [{**r, "proof": proof} for r, proof in zip(results, signed["proofs"])],
+            "attestation": signed["attestation"],
+            "signature": signed["signature"],
+        }
+        with db_connection() as conn:
+            JobDAO(conn).complete_job(job_id, result)
+        logger.info(f"Job {job_id}: aggregated {len(shards)} shards, score {result['score']}")
+        return result
+
+
+# Register tasks (register_task also binds them to celery_app rather than the default app)
+run_simplebench_task = celery_app.register_task(RunSimpleBenchTask())
+run_benchmark_task = celery_app.register_task(RunBenchmarkTask())
+aggregate_benchmark_task = celery_app.register_task(AggregateBenchmarkTask())
+
+SHARD_TASKS = {
+    "simplebench": run_simplebench_task,
+    "he300": run_benchmark_task,
+}
+
 
-    def run(self):
-        pass
+def enqueue_benchmark_job(
+    job_id: str,
+    benchmark: str,
+    scenarios: List[dict],
+    provider: str,
+    model: str,
+    api_key: Optional[str] = None,
+    shard_size: Optional[int] = None,
+    use_cache: bool = True,
+    options: Optional[GenerationOptions] = None,
+) -> int:
+    """
+    Fan a benchmark out as one Celery task per shard, joined by a chord.
 
-run_simplebench_task = RunSimpleBenchTask()
-run_benchmark_task = RunBenchmarkTask()
+    Shards report progress to the jobs table and the aggregate callback stores
+    the signed result there, so any API worker can serve it by job id.
+    The callback also runs under ``job_id`` as its Celery task id. ``api_key``
+    only reaches the broker and result backend sealed with the node's key,
+    and expires after BENCHMARK_KEY_TTL_SECONDS.
+    Returns the number of shards enqueued.
+    """
+    shard_task = SHARD_TASKS[benchmark]
+    sealed_api_key = seal_api_key(api_key)
+    shards = split_into_shards(scenarios, shard_size or settings.BENCHMARK_SHARD_SIZE)
+    with db_connection() as conn:
+        JobDAO(conn).create_job(job_id, benchmark, provider, model, len(scenarios), len(shards))
+    header = [
+        shard_task.s(
+            job_id, index, shard, provider, model, sealed_api_key, use_cache,
+            options.model_dump() if options else None,
+        )
+        for index, shard in enumerate(shards)
+    ]
+    callback = aggregate_benchmark_task.s(job_id, benchmark, provider, model).set(task_id=job_id)
+    try:
+        chord(header)(callback)
+    except Exception as e:
+        with db_connection() as conn:
+            JobDAO(conn).fail_job(job_id, f"Failed to enqueue job: {e}")
+        raise
+    return len(shards)
 
-# Register tasks
-celery_app.tasks.register(run_simplebench_task)
-celery_app.tasks.register(run_benchmark_task)
 
 # Placeholder for run_he300_scenario_task
 def run_he300_scenario_task():
@@ -17,6 +17,52 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     VERSION: str = "0.1.0"  # Add version
     PUBLIC_KEY: str = ""  # Add public key
+    LLM_CONCURRENCY: int = 4  # Default in-flight prompts per provider/model
+    LLM_CONCURRENCY_LIMITS: str = ""  # Overrides, e.g. "ollama=2,openai/gpt-4o=8"
+    LLM_REQUEST_TIMEOUT: float = 120.0  # Seconds per upstream LLM call
+    HTTP_MAX_CONNECTIONS: int = 100  # Upstream connection pool size
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20  # Idle connections kept open for reuse
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0  # Seconds an idle connection is kept
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP2_ENABLED: bool = True  # Used when the h2 package is installed
+    LLM_RATE_LIMITS: str = ""  # Requests per second per provider, e.g. "openai=5"; unset means unlimited
+    LLM_MAX_RETRIES: int = 4  # Retries for 429s, 5xx and connection errors
+    LLM_BACKOFF_BASE: float = 0.5  # Seconds; doubles per retry, with full jitter
+    LLM_BACKOFF_MAX: float = 30.0
+    LLM_ADAPTIVE_MAX_CONCURRENCY: int = 64  # Ceiling per provider/API key; halved on 429s, regrown on success
+    OLLAMA_ENDPOINTS: str = ""  # Comma-separated Ollama base URLs; falls back to OLLAMA_BASE_URL
+    OLLAMA_HEDGE: bool = True  # Duplicate slow requests to a second endpoint
+    OLLAMA_HEDGE_QUANTILE: float = 0.95  # Latency quantile after which a request is hedged
+    OLLAMA_HEDGE_MIN_SAMPLES: int = 20  # Latencies needed per endpoint before hedging starts
+    OLLAMA_MODELS_CACHE_TTL: float = 10.0  # Seconds /api/v1/ollama-models serves its list before refreshing
+    OLLAMA_MODEL_AFFINITY: bool = True  # Serve one model's queued prompts per endpoint before switching
+    OLLAMA_AFFINITY_MAX_BATCH: int = 64  # Prompts a model may still run once another model is waiting
+    OLLAMA_AFFINITY_MAX_HOLD: float = 30.0  # Seconds a model may hold an endpoint once another is waiting
+    OLLAMA_KEEP_ALIVE: str = "10m"  # keep_alive sent with each generate so batches don't reload weights
+    BENCHMARK_SHARD_SIZE: int = 10  # Scenarios per Celery shard task
+    BENCHMARK_MAX_SCENARIOS: int = 1000  # Largest scenario_ids list one run accepts
+    BENCHMARK_KEY_TTL_SECONDS: int = 6 * 3600  # How long a queued job's sealed provider API key stays usable
+    LLM_CACHE_ENABLED: bool = True  # Reuse completions for identical requests
+    LLM_CACHE_MEMORY_ENTRIES: int = 1024  # In-process LRU size
+    LLM_CACHE_PATH: str = "cirisnode/db/llm_cache.db"  # Shared SQLite tier; empty disables it
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    LLM_CACHE_MAX_DISK_ENTRIES: int = 100000
+    HE300_DATA_PATH: str = "hendrycks_ethics"  # ETHICS checkout (submodule) holding the category CSVs
+    HE300_CACHE_DIR: str = "cirisnode/db/he300_cache"  # Columnar, memory-mapped copy built from the CSVs
+    SIGNING_KEY: str = ""  # Ed25519 private key (PEM or base64 raw); overrides SIGNING_KEY_PATH
+    SIGNING_KEY_PATH: str = "cirisnode/db/keys/signing_key.pem"  # Generated on first start if missing
+    ENCRYPTION_KEYS: str = ""  # Comma-separated Fernet keys, newest first; overrides ENCRYPTION_KEY_PATH
+    ENCRYPTION_KEY_PATH: str = "cirisnode/db/keys/fernet.keys"  # One Fernet key per line, newest first
+    HE300_SEED: int = 300  # Default seed for the stratified prompt sample
+    HE300_BENCHMARKS: int = 6  # benchmark_ids per HE-300 run
+    HE300_PROMPTS_PER_BENCHMARK: int = 50
+    DATABASE_URL: str = ""  # postgresql://... or sqlite:///path; empty uses cirisnode/db/cirisnode.db
+    DB_POOL_SIZE: int = 16  # SQLite connections kept open per process
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds a request waits for a free connection
+    DB_BUSY_TIMEOUT_MS: int = 30000  # How long a writer waits on a locked database
+    DB_CACHE_SIZE_KB: int = 16384  # Page cache per connection
+    DB_MMAP_SIZE: int = 256 * 1024 * 1024  # Bytes of the database file read through mmap
+    DB_STATEMENT_CACHE: int = 256  # Prepared statements kept per connection
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,132 @@
+import json
+import sqlite3
+from datetime import datetime
+from typing import List, Optional
+
+JOB_COLUMNS = (
+    "id", "type", "status", "provider", "model", "started_at", "updated_at", "finished_at",
+    "total", "completed", "shards_total", "shards_done", "results_url", "results_json", "error",
+)
+
+RESULTS_PATHS = {
+    "he300": "/api/v1/benchmarks/results/{job_id}",
+    "simplebench": "/api/v1/simplebench/results/{job_id}",
+}
+
+
+class JobDAO:
+    """
+    Data access object for benchmark jobs shared by API workers and Celery workers.
+
+    The jobs table and its columns come from ``cirisnode.db.migrations``.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def create_job(
+        self,
+        job_id: str,
+        job_type: str,
+        provider: str,
+        model: str,
+        total: int,
+        shards_total: int,
+    ) -> None:
+        now = datetime.utcnow().isoformat()
+        self.conn.execute(
+            """
+            INSERT INTO jobs (id, type, status, provider, model, started_at, updated_at,
+                              total, completed, shards_total, shards_done, results_url)
+            VALUES (?, ?, 'queued', ?, ?, ?, ?, ?, 0, ?, 0, ?)
+            """,
+            (job_id, job_type, provider, model, now, now, total, shards_total,
+             RESULTS_PATHS[job_type].format(job_id=job_id)),
+        )
+        self.conn.commit()
+
+    def record_shard(self, job_id: str, completed: int) -> None:
+        """Count one finished shard; the increment is a single UPDATE so concurrent workers don't race."""
+        self.conn.execute(
+            """
+            UPDATE jobs
+            SET shards_done = shards_done + 1,
+                completed = completed + ?,
+                status = CASE WHEN status = 'queued' THEN 'running' ELSE status END,
+                updated_at = ?
+            WHERE id = ?
+            """,
+            (completed, datetime.utcnow().isoformat(), job_id),
+        )
+        self.conn.commit()
+
+    def complete_job(self, job_id: str, result: dict) -> None:
+        now = datetime.utcnow().isoformat()
+        self.conn.execute(
+            """
+            UPDATE jobs SET status = 'completed', results_json = ?, finished_at = ?, updated_at = ?
+            WHERE id = ?
+            """,
+            (json.dumps(result), now, now, job_id),
+        )
+        self.conn.commit()
+
+    def fail_job(self, job_id: str, error: str) -> None:
+        """Mark a job failed; the first recorded error wins."""
+        now = datetime.utcnow().isoformat()
+        self.conn.execute(
+            "UPDATE jobs SET status = 'failed', error = ?, finished_at = ?, updated_at = ? "
+            "WHERE id = ? AND status != 'failed'",
+            (error, now, now, job_id),
+        )
+        self.conn.commit()
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        row = self.conn.execute(
+            f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return self._to_dict(row) if row else None
+
+    def list_jobs(
+        self,
+        status: Optional[str] = None,
+        job_type: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[dict]:
+        # Listings omit results_json; fetch a single job for the full result.
+        columns = [c for c in JOB_COLUMNS if c != "results_json"]
+        query = f"SELECT {', '.join(columns)} FROM jobs WHERE 1=1"
+        params = []
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        if job_type:
+            query += " AND type = ?"
+            params.append(job_type)
+        query += " ORDER BY started_at DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+        rows = self.conn.execute(query, params).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def merkle_roots_since(self, since: str) -> List[tuple]:
+        """(job id, result Merkle root) for jobs completed since ``since``, without loading their results."""
+        rows = self.conn.execute(
+            """
+            SELECT id, json_extract(results_json, '$.attestation.merkle_root') FROM jobs
+            WHERE status = 'completed' AND finished_at >= ?
+            ORDER BY finished_at, id
+            """,
+            (since,),
+        ).fetchall()
+        return [(row[0], row[1]) for row in rows if row[1]]
+
+    @staticmethod
+    def _to_dict(row) -> dict:
+        job = dict(zip(JOB_COLUMNS, row))
+        job["results_json"] = json.loads(job["results_json"]) if job["results_json"] else None
+        return job
+
+
+def get_job_dao(db_conn: sqlite3.Connection) -> JobDAO:
+    return JobDAO(db_conn)
@@ -1,25 +1,401 @@
+import asyncio
+import functools
+import os
+import queue
 import sqlite3
-from typing import Generator
-from cirisnode.config import settings
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncGenerator, Callable, Dict, Generator, Optional, TypeVar
 
-import os
 from cirisnode.config import settings
 
+T = TypeVar("T")
+
 # Use a relative path consistent with init_db.py to avoid path mismatch
 DATABASE_PATH = "cirisnode/db/cirisnode.db"
 # Ensure the directory exists
 os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
 
+
+class ConnectionPool:
+    """
+    A fixed-size pool of tuned SQLite connections to one database file.
+
+    Connections are opened lazily up to ``size`` and configured once: WAL so
+    readers don't block the writer, ``synchronous=NORMAL`` (durable in WAL
+    mode except for the last transactions on power loss), a larger page cache,
+    mmap reads and a busy timeout so concurrent writers queue instead of
+    failing with "database is locked". Each keeps its own prepared-statement
+    cache. When all connections are in use, callers wait up to ``timeout``.
+    """
+
+    def __init__(self, path: str, size: int = 16, timeout: float = 30.0):
+        self.path = path
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.created = 0
+        self.in_use = 0
+        self.acquired = 0
+        self.waited = 0  # Acquisitions that found no idle connection
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,  # Handed between threadpool workers and the event loop
+            timeout=settings.DB_BUSY_TIMEOUT_MS / 1000,
+            cached_statements=settings.DB_STATEMENT_CACHE,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(settings.DB_BUSY_TIMEOUT_MS)}")
+        conn.execute(f"PRAGMA cache_size=-{int(settings.DB_CACHE_SIZE_KB)}")
+        conn.execute(f"PRAGMA mmap_size={int(settings.DB_MMAP_SIZE)}")
+        return conn
+
+    def _after_fork(self) -> None:
+        # Connections must not cross a fork (Celery prefork workers); start over in the child.
+        if os.getpid() != self._pid:
+            self._pid = os.getpid()
+            self._idle = queue.LifoQueue()
+            self.created = self.in_use = 0
+
+    def try_acquire(self) -> Optional[sqlite3.Connection]:
+        """An idle connection, or None; never opens one or waits."""
+        with self._lock:
+            self._after_fork()
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return None
+            self.acquired += 1
+            self.in_use += 1
+            return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        started = time.perf_counter()
+        with self._lock:
+            self._after_fork()
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = None
+                if self.created < self.size:
+                    self.created += 1
+                    new = True
+                else:
+                    new = False
+            self.acquired += 1
+        if conn is None:
+            if new:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self.created -= 1
+                    raise
+            else:
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"No database connection free after {self.timeout}s") from None
+                finally:
+                    waited = time.perf_counter() - started
+                    with self._lock:
+                        self.waited += 1
+                        self.wait_seconds += waited
+                        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        with self._lock:
+            self.in_use += 1
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            self.in_use -= 1
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    def discard(self, conn: sqlite3.Connection) -> None:
+        """Replace a connection that is no longer usable, so waiters still get one."""
+        with self._lock:
+            self.in_use -= 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        try:
+            self._idle.put(self._connect())
+        except sqlite3.Error:
+            with self._lock:
+                self.created -= 1
+            raise
+
+    def close(self) -> None:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            conn.close()
+            with self._lock:
+                self.created -= 1
+
+    @contextmanager
+    def connection(self) -> Generator[sqlite3.Connection, None, None]:
+        conn = self.acquire()
+        try:
+            yield conn
+            conn.commit()
+        except sqlite3.ProgrammingError:
+            # The handler closed the connection itself; don't hand it out again.
+            self.discard(conn)
+            raise
+        except BaseException:
+            self.release(conn)
+            raise
+        else:
+            self.release(conn)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "path": self.path,
+                "size": self.size,
+                "open": self.created,
+                "in_use": self.in_use,
+                "idle": self.created - self.in_use,
+                "acquired": self.acquired,
+                "waited": self.waited,
+                "wait_seconds_total": round(self.wait_seconds, 6),
+                "wait_seconds_max": round(self.max_wait_seconds, 6),
+            }
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def database_backend() -> str:
+    """"postgresql" when DATABASE_URL is a Postgres URL, otherwise "sqlite"."""
+    scheme = settings.DATABASE_URL.partition("://")[0].split("+")[0]
+    return "postgresql" if scheme in ("postgres", "postgresql") else "sqlite"
+
+
+def sqlite_path() -> str:
+    """The SQLite file: the path in a sqlite:/// DATABASE_URL, else DATABASE_PATH."""
+    if settings.DATABASE_URL.startswith("sqlite:///"):
+        return settings.DATABASE_URL[len("sqlite:///"):]
+    return DATABASE_PATH
+
+
+def get_pool() -> ConnectionPool:
+    """The process-wide pool for the current SQLite file."""
+    path = sqlite_path()
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is None:
+            pool = _pools[path] = ConnectionPool(path, settings.DB_POOL_SIZE, settings.DB_POOL_TIMEOUT)
+        return pool
+
+
+def get_pg_pools():
+    from cirisnode.db.postgres import get_postgres_pools
+
+    return get_postgres_pools(settings.DATABASE_URL, settings.DB_POOL_SIZE, settings.DB_POOL_TIMEOUT)
+
+
+def pool_stats() -> dict:
+    if database_backend() == "postgresql":
+        return get_pg_pools().stats()
+    return get_pool().stats()
+
+
 # Dependency for database connection with connection pooling
 def get_db() -> Generator[sqlite3.Connection, None, None]:
-    """Yield a SQLite connection for request handlers."""
-    conn = sqlite3.connect(
-        DATABASE_PATH,
-        check_same_thread=False,  # Allows connection reuse across threads
-        timeout=30  # Adjust timeout for high concurrency
-    )
-    try:
+    """Yield a pooled connection for request handlers, committing on success."""
+    if database_backend() == "postgresql":
+        with get_pg_pools().connection() as conn:
+            yield conn
+        return
+    with get_pool().connection() as conn:
         yield conn
-        conn.commit()
-    finally:
-        conn.close()
+
+
+# Same connection lifecycle outside of a request (Celery workers, scripts).
+db_connection = contextmanager(get_db)
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+_executor_lock = threading.Lock()
+_async_slots = weakref.WeakKeyDictionary()  # event loop -> Semaphore over the pool's connections
+_write_locks = weakref.WeakKeyDictionary()  # event loop -> Lock held for the length of a write transaction
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """
+    Threads reserved for database work, kept apart from the default threadpool.
+
+    There are twice as many as pooled connections. Async handlers hold at most
+    DB_POOL_SIZE connections at once (see ``get_async_db``), so at most half
+    the threads can be blocked waiting for a connection and the rest are
+    always free to run queries for the handlers that hold one.
+    """
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=2 * max(1, settings.DB_POOL_SIZE), thread_name_prefix="cirisnode-db"
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _async_slot() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    if loop not in _async_slots:
+        _async_slots[loop] = asyncio.Semaphore(max(1, settings.DB_POOL_SIZE))
+    return _async_slots[loop]
+
+
+async def run_in_db_thread(fn: Callable[..., T], *args, **kwargs) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), functools.partial(fn, *args, **kwargs))
+
+
+class AsyncCursor:
+    """A sqlite3 cursor whose fetches run on the database executor."""
+
+    def __init__(self, cursor: sqlite3.Cursor):
+        self._cursor = cursor
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self) -> Optional[int]:
+        return self._cursor.lastrowid
+
+    async def fetchone(self) -> Optional[tuple]:
+        return await run_in_db_thread(self._cursor.fetchone)
+
+    async def fetchall(self) -> list:
+        return await run_in_db_thread(self._cursor.fetchall)
+
+
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE", "CREATE", "DROP", "ALTER")
+
+
+def _is_write(sql: str) -> bool:
+    return sql.lstrip().upper().startswith(WRITE_STATEMENTS)
+
+
+def _write_lock() -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    if loop not in _write_locks:
+        _write_locks[loop] = asyncio.Lock()
+    return _write_locks[loop]
+
+
+class AsyncConnection:
+    """
+    The sqlite3 connection API for ``async def`` handlers, awaited instead of blocking.
+
+    ``await conn.execute(...)`` returns an ``AsyncCursor``; ``run`` calls an
+    existing sync helper that takes the raw connection (e.g.
+    ``fetch_audit_logs``) on the database executor, and ``run_write`` does the
+    same for helpers that write. SQLite has one writer at a time, so write
+    transactions from this event loop queue on a lock until they commit or
+    roll back, rather than piling into the busy handler's sleeps.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.raw = conn
+        self._write_lock = _write_lock()
+        self._writing = False
+
+    async def _begin_write(self) -> None:
+        if not self._writing:
+            await self._write_lock.acquire()
+            self._writing = True
+
+    def _end_write(self) -> None:
+        if self._writing:
+            self._writing = False
+            self._write_lock.release()
+
+    async def execute(self, sql: str, parameters: Any = ()) -> AsyncCursor:
+        if _is_write(sql):
+            await self._begin_write()
+        return AsyncCursor(await run_in_db_thread(self.raw.execute, sql, parameters))
+
+    async def executemany(self, sql: str, seq_of_parameters) -> AsyncCursor:
+        await self._begin_write()
+        return AsyncCursor(await run_in_db_thread(self.raw.executemany, sql, seq_of_parameters))
+
+    async def commit(self) -> None:
+        try:
+            await run_in_db_thread(self.raw.commit)
+        finally:
+            self._end_write()
+
+    async def rollback(self) -> None:
+        try:
+            await run_in_db_thread(self.raw.rollback)
+        finally:
+            self._end_write()
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        return await run_in_db_thread(fn, self.raw, *args, **kwargs)
+
+    async def run_write(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        await self._begin_write()
+        try:
+            return await run_in_db_thread(fn, self.raw, *args, **kwargs)
+        finally:
+            if not self.raw.in_transaction:
+                self._end_write()
+
+    def close(self) -> None:
+        """Give up the write lock, if held; the pool owns the underlying connection."""
+        self._end_write()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncConnection, None]:
+    """Yield a pooled connection for async handlers; waiting, queries and commit stay off the event loop."""
+    if database_backend() == "postgresql":
+        async with get_pg_pools().async_connection() as db:
+            yield db
+        return
+    pool = get_pool()
+    async with _async_slot():
+        # The common cases, an idle connection now and nothing left to commit later, need no thread.
+        conn = pool.try_acquire() or await run_in_db_thread(pool.acquire)
+        db = AsyncConnection(conn)
+        try:
+            yield db
+            if conn.in_transaction:
+                await db.commit()
+        except sqlite3.ProgrammingError:
+            db.close()
+            get_db_executor().submit(pool.discard, conn)
+            raise
+        except BaseException:
+            db.close()
+            # Not awaited, so a cancelled request still returns its connection.
+            get_db_executor().submit(pool.release, conn)
+            raise
+        else:
+            pool.release(conn)
+
+
+async_db_connection = asynccontextmanager(get_async_db)
@@ -0,0 +1,79 @@
+"""
+Translate the SQLite SQL used across the node into PostgreSQL.
+
+DAOs and routes are written against sqlite3 (``?`` placeholders and a few
+SQLite-only forms). When DATABASE_URL points at Postgres, every statement
+passes through ``to_postgres`` first:
+
+- ``?`` placeholders become ``%s``, and literal ``%`` becomes ``%%``
+- ``INSERT OR IGNORE`` becomes ``INSERT ... ON CONFLICT DO NOTHING``
+- ``INSERT OR REPLACE`` becomes an upsert on the table's primary key
+- ``json_extract(col, '$.a.b')`` becomes ``(col)::jsonb #>> '{a,b}'``
+- ``PRAGMA table_info(t)`` reads ``information_schema.columns`` with the same
+  column layout; other PRAGMAs are SQLite tuning and are dropped
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Optional
+
+# Conflict targets for INSERT OR REPLACE; tables not listed use their first inserted column.
+PRIMARY_KEYS: Dict[str, str] = {
+    "agent_tokens": "token",
+    "config": "id",
+}
+
+_PRAGMA_TABLE_INFO = re.compile(r"^\s*PRAGMA\s+table_info\(\s*['\"]?(\w+)['\"]?\s*\)\s*;?\s*$", re.IGNORECASE)
+_PRAGMA = re.compile(r"^\s*PRAGMA\b", re.IGNORECASE)
+_INSERT_OR = re.compile(r"^\s*INSERT\s+OR\s+(IGNORE|REPLACE)\s+INTO\s+(\w+)\s*\(([^)]*)\)", re.IGNORECASE)
+_JSON_EXTRACT = re.compile(r"json_extract\(\s*([^,()]+?)\s*,\s*'\$\.([^']*)'\s*\)", re.IGNORECASE)
+
+
+def _placeholders(sql: str) -> str:
+    """``?`` outside string literals to ``%s``; every ``%`` doubled so psycopg reads it literally."""
+    out = []
+    quote = None
+    for ch in sql:
+        if ch == "%":
+            out.append("%%")
+        elif quote:
+            out.append(ch)
+            if ch == quote:
+                quote = None
+        elif ch in ("'", '"'):
+            quote = ch
+            out.append(ch)
+        elif ch == "?":
+            out.append("%s")
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def _upsert(sql: str, match: re.Match) -> str:
+    mode, table, column_list = match.group(1).upper(), match.group(2), match.group(3)
+    body = "INSERT INTO" + sql[match.start(2) - 1:].rstrip().rstrip(";")
+    if mode == "IGNORE":
+        return f"{body} ON CONFLICT DO NOTHING"
+    columns = [c.strip() for c in column_list.split(",") if c.strip()]
+    key = PRIMARY_KEYS.get(table, columns[0])
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in columns if c != key)
+    return f"{body} ON CONFLICT ({key}) DO " + (f"UPDATE SET {updates}" if updates else "NOTHING")
+
+
+@lru_cache(maxsize=1024)
+def to_postgres(sql: str) -> Optional[str]:
+    """The PostgreSQL form of a SQLite statement, or None if it has no equivalent and can be skipped."""
+    table_info = _PRAGMA_TABLE_INFO.match(sql)
+    if table_info:
+        # Same columns as SQLite's table_info: cid, name, type, notnull, dflt_value, pk.
+        return (
+            "SELECT ordinal_position - 1, column_name, data_type, is_nullable = 'NO', column_default, false "
+            f"FROM information_schema.columns WHERE table_name = '{table_info.group(1)}' ORDER BY ordinal_position"
+        )
+    if _PRAGMA.match(sql):
+        return None
+    insert = _INSERT_OR.match(sql)
+    if insert:
+        sql = _upsert(sql, insert)
+    sql = _JSON_EXTRACT.sub(lambda m: f"({m.group(1)})::jsonb #>> '{{{m.group(2).replace('.', ',')}}}'", sql)
+    return _placeholders(sql)
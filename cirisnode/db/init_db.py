@@ -1,26 +1,22 @@
-import sqlite3
+import logging
 
-def initialize_database():
-    """
-    Initialize the database by executing the schema.sql file.
-    """
-    db_path = "cirisnode/db/cirisnode.db"  # Updated to match app config
-    schema_path = "cirisnode/db/schema.sql"  # Use the schema in the db folder if present
+from cirisnode.database import database_backend, db_connection, sqlite_path
+from cirisnode.db.migrations import LATEST_VERSION, migrate
 
-    # Connect to the SQLite database
-    connection = sqlite3.connect(db_path)
-    cursor = connection.cursor()
 
-    # Read and execute the schema.sql file
-    with open(schema_path, "r") as schema_file:
-        schema_sql = schema_file.read()
-        cursor.executescript(schema_sql)
+def initialize_database():
+    """
+    Initialize the database by applying schema.sql and any newer migrations.
 
-    # Commit changes and close the connection
-    connection.commit()
-    connection.close()
+    Runs against whichever backend DATABASE_URL selects; safe to run on every
+    start, since only migrations the database has not seen are applied.
+    """
+    with db_connection() as connection:
+        applied = migrate(connection)
 
-    print(f"Database initialized successfully at {db_path}")
+    target = "PostgreSQL" if database_backend() == "postgresql" else sqlite_path()
+    print(f"Database initialized successfully at {target} (schema version {LATEST_VERSION}, applied {applied or 'none'})")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     initialize_database()
@@ -0,0 +1,136 @@
+"""
+Versioned schema migrations for SQLite and PostgreSQL.
+
+The applied version lives in ``schema_version``; ``migrate`` runs every newer
+entry of ``MIGRATIONS`` in order and records each one. Version 1 is
+``schema.sql``. Steps are idempotent (``IF NOT EXISTS``, columns added only
+when missing) so a migration interrupted part-way simply re-runs. Statements
+go through the connection's own API, so on Postgres they are translated by
+``cirisnode.db.dialect`` like any other query.
+
+    python -m cirisnode.db.migrations
+"""
+import logging
+import os
+import sqlite3
+import uuid
+from typing import Callable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "schema.sql")
+
+
+def columns(conn, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+
+
+def add_column(conn, table: str, column: str, ddl: str) -> None:
+    """Add ``column`` to ``table`` unless it is already there (databases created by older schemas)."""
+    if column not in columns(conn, table):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+
+def _baseline(conn) -> None:
+    with open(SCHEMA_PATH) as f:
+        conn.executescript(f.read())
+
+
+def _backfill_columns(conn) -> None:
+    # Columns the routes and DAOs use that tables created before they were added lack.
+    for table in ("jobs", "wbd_tasks", "agent_events", "audit_logs"):
+        add_column(conn, table, "archived", "INTEGER DEFAULT 0")
+    add_column(conn, "wbd_tasks", "payload", "TEXT")
+    add_column(conn, "users", "groups", "TEXT DEFAULT ''")
+    add_column(conn, "users", "oauth_provider", "TEXT")
+    add_column(conn, "users", "oauth_sub", "TEXT")
+
+
+def _job_progress_columns(conn) -> None:
+    # Provider, progress and error columns for sharded benchmark jobs, on jobs tables that predate them.
+    for column, ddl in (
+        ("provider", "TEXT"),
+        ("model", "TEXT"),
+        ("updated_at", "TIMESTAMP"),
+        ("total", "INTEGER DEFAULT 0"),
+        ("completed", "INTEGER DEFAULT 0"),
+        ("shards_total", "INTEGER DEFAULT 0"),
+        ("shards_done", "INTEGER DEFAULT 0"),
+        ("error", "TEXT"),
+    ):
+        add_column(conn, "jobs", column, ddl)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_started ON jobs (status, started_at)")
+
+
+def _wbd_task_ids(conn) -> None:
+    # SQLite lets a TEXT primary key be NULL, and tasks submitted before the WA route generated ids
+    # have none; give them one so they can be resolved and copied to Postgres. Postgres never has these.
+    if not isinstance(conn, sqlite3.Connection):
+        return
+    for (rowid,) in conn.execute("SELECT rowid FROM wbd_tasks WHERE id IS NULL").fetchall():
+        conn.execute("UPDATE wbd_tasks SET id = ? WHERE rowid = ?", (str(uuid.uuid4()), rowid))
+
+
+def _hot_path_indexes(conn) -> None:
+    # Each matches a list query's filter and sort, so pages come off the index instead of a scan and sort.
+    for statement in (
+        # fetch_audit_logs: WHERE actor = ? ORDER BY timestamp DESC, and the unfiltered feed
+        'CREATE INDEX IF NOT EXISTS idx_audit_logs_actor_ts ON audit_logs (actor, "timestamp" DESC)',
+        'CREATE INDEX IF NOT EXISTS idx_audit_logs_ts ON audit_logs ("timestamp" DESC)',
+        # get_agent_events: ORDER BY node_ts DESC
+        "CREATE INDEX IF NOT EXISTS idx_agent_events_node_ts ON agent_events (node_ts DESC)",
+        # WBD task listing and the SLA sweep: WHERE status = ? AND created_at < ?
+        "CREATE INDEX IF NOT EXISTS idx_wbd_tasks_status_created ON wbd_tasks (status, created_at)",
+    ):
+        conn.execute(statement)
+    conn.execute("ANALYZE")
+
+
+MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, "baseline schema", _baseline),
+    (2, "add columns missing from older databases", _backfill_columns),
+    (3, "indexes for audit, agent event and WBD list queries", _hot_path_indexes),
+    (4, "benchmark job progress columns", _job_progress_columns),
+    (5, "ids for WBD tasks stored without one", _wbd_task_ids),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn) -> int:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return (row[0] or 0) if row else 0
+
+
+def migrate(conn) -> List[int]:
+    """Bring the schema up to LATEST_VERSION; returns the versions applied by this call."""
+    version = current_version(conn)
+    conn.commit()
+    applied = []
+    for number, description, step in MIGRATIONS:
+        if number <= version:
+            continue
+        logger.info(f"Applying schema migration {number}: {description}")
+        step(conn)
+        conn.execute("INSERT INTO schema_version (version, description) VALUES (?, ?)", (number, description))
+        conn.commit()
+        applied.append(number)
+    return applied
+
+
+if __name__ == "__main__":
+    from cirisnode.database import db_connection
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    with db_connection() as connection:
+        applied = migrate(connection)
+    print(f"Schema at version {LATEST_VERSION}; applied {applied or 'nothing'}")
@@ -0,0 +1,231 @@
+"""
+PostgreSQL backend, used when DATABASE_URL is a ``postgresql://`` URL.
+
+Connections come from psycopg 3 pools: a sync pool behind ``get_db`` (sync
+routes, Celery) and an async pool per event loop behind ``get_async_db``.
+Both are wrapped to look like the sqlite3 API the DAOs and routes already use,
+with each statement translated by ``cirisnode.db.dialect.to_postgres``.
+"""
+import asyncio
+import os
+import threading
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncGenerator, Callable, Generator, Optional, TypeVar
+
+from cirisnode.db.dialect import to_postgres
+
+T = TypeVar("T")
+
+_IDLE = 0  # psycopg.pq.TransactionStatus.IDLE
+
+
+class PgCursor:
+    """A psycopg cursor with the sqlite3 cursor surface; empty for statements that were skipped."""
+
+    def __init__(self, cursor=None):
+        self._cursor = cursor
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount if self._cursor is not None else -1
+
+    @property
+    def lastrowid(self) -> None:
+        # Postgres has no implicit row id; use INSERT ... RETURNING where the id is needed.
+        return None
+
+    @property
+    def description(self):
+        return self._cursor.description if self._cursor is not None else None
+
+    def fetchone(self) -> Optional[tuple]:
+        return self._cursor.fetchone() if self._cursor is not None and self._cursor.description else None
+
+    def fetchall(self) -> list:
+        return self._cursor.fetchall() if self._cursor is not None and self._cursor.description else []
+
+
+class PgConnection:
+    """A sync psycopg connection that accepts the SQLite statements the DAOs issue."""
+
+    def __init__(self, conn):
+        self.raw = conn
+
+    @property
+    def in_transaction(self) -> bool:
+        return self.raw.info.transaction_status != _IDLE
+
+    def execute(self, sql: str, parameters: Any = ()) -> PgCursor:
+        statement = to_postgres(sql)
+        if statement is None:
+            return PgCursor()
+        cursor = self.raw.cursor()
+        cursor.execute(statement, tuple(parameters))
+        return PgCursor(cursor)
+
+    def executemany(self, sql: str, seq_of_parameters) -> PgCursor:
+        statement = to_postgres(sql)
+        if statement is None:
+            return PgCursor()
+        cursor = self.raw.cursor()
+        cursor.executemany(statement, [tuple(p) for p in seq_of_parameters])
+        return PgCursor(cursor)
+
+    def executescript(self, script: str) -> None:
+        # Sent as one simple query, so no placeholder translation; the schema is written to suit both.
+        self.raw.execute(script)
+
+    def commit(self) -> None:
+        self.raw.commit()
+
+    def rollback(self) -> None:
+        self.raw.rollback()
+
+
+class AsyncPgCursor:
+    def __init__(self, cursor=None):
+        self._cursor = cursor
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount if self._cursor is not None else -1
+
+    @property
+    def lastrowid(self) -> None:
+        return None
+
+    async def fetchone(self) -> Optional[tuple]:
+        if self._cursor is None or not self._cursor.description:
+            return None
+        return await self._cursor.fetchone()
+
+    async def fetchall(self) -> list:
+        if self._cursor is None or not self._cursor.description:
+            return []
+        return await self._cursor.fetchall()
+
+
+class AsyncPgConnection:
+    """
+    ``cirisnode.database.AsyncConnection`` over an async psycopg connection.
+
+    ``run``/``run_write`` hand a sync helper a connection from the sync pool
+    on the database executor, so helpers written for sqlite3 work unchanged;
+    they run in their own transaction.
+    """
+
+    def __init__(self, conn, pools: "PostgresPools"):
+        self.raw = conn
+        self._pools = pools
+
+    async def execute(self, sql: str, parameters: Any = ()) -> AsyncPgCursor:
+        statement = to_postgres(sql)
+        if statement is None:
+            return AsyncPgCursor()
+        cursor = self.raw.cursor()
+        await cursor.execute(statement, tuple(parameters))
+        return AsyncPgCursor(cursor)
+
+    async def executemany(self, sql: str, seq_of_parameters) -> AsyncPgCursor:
+        statement = to_postgres(sql)
+        if statement is None:
+            return AsyncPgCursor()
+        cursor = self.raw.cursor()
+        await cursor.executemany(statement, [tuple(p) for p in seq_of_parameters])
+        return AsyncPgCursor(cursor)
+
+    async def commit(self) -> None:
+        await self.raw.commit()
+
+    async def rollback(self) -> None:
+        await self.raw.rollback()
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        from cirisnode.database import run_in_db_thread
+
+        return await run_in_db_thread(self._pools.run_sync, fn, *args, **kwargs)
+
+    run_write = run
+
+    def close(self) -> None:
+        pass
+
+
+class PostgresPools:
+    """The sync pool and the per-event-loop async pools for one DATABASE_URL."""
+
+    def __init__(self, url: str, size: int = 16, timeout: float = 30.0):
+        try:
+            from psycopg_pool import ConnectionPool
+        except ImportError as e:
+            raise RuntimeError(
+                "DATABASE_URL points at PostgreSQL but psycopg is not installed; "
+                "pip install 'psycopg[binary,pool]'"
+            ) from e
+        self.url = url
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.sync = ConnectionPool(url, min_size=1, max_size=self.size, timeout=timeout, open=True)
+        self._async = weakref.WeakKeyDictionary()  # event loop -> AsyncConnectionPool
+
+    @contextmanager
+    def connection(self) -> Generator[PgConnection, None, None]:
+        # The pool commits on a clean exit and rolls back on an exception.
+        with self.sync.connection() as conn:
+            yield PgConnection(conn)
+
+    async def _async_pool(self):
+        from psycopg_pool import AsyncConnectionPool
+
+        loop = asyncio.get_running_loop()
+        pool = self._async.get(loop)
+        if pool is None:
+            pool = AsyncConnectionPool(self.url, min_size=1, max_size=self.size, timeout=self.timeout, open=False)
+            self._async[loop] = pool
+        await pool.open()  # No-op once open
+        return pool
+
+    @asynccontextmanager
+    async def async_connection(self) -> AsyncGenerator[AsyncPgConnection, None]:
+        pool = await self._async_pool()
+        async with pool.connection() as conn:
+            yield AsyncPgConnection(conn, self)
+
+    def run_sync(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        with self.connection() as conn:
+            return fn(conn, *args, **kwargs)
+
+    def stats(self) -> dict:
+        """Sync pool stats in the same shape as ``ConnectionPool.stats`` for SQLite."""
+        raw = self.sync.get_stats()
+        size = raw.get("pool_size", 0)
+        return {
+            "path": "postgresql",
+            "size": self.size,
+            "open": size,
+            "in_use": size - raw.get("pool_available", 0),
+            "idle": raw.get("pool_available", 0),
+            "acquired": raw.get("requests_num", 0),
+            "waited": raw.get("requests_queued", 0),
+            "wait_seconds_total": raw.get("requests_wait_ms", 0) / 1000,
+            "wait_seconds_max": None,
+        }
+
+    def close(self) -> None:
+        self.sync.close()
+
+
+_pools: Optional[PostgresPools] = None
+_pools_pid: Optional[int] = None
+_pools_lock = threading.Lock()
+
+
+def get_postgres_pools(url: str, size: int, timeout: float) -> PostgresPools:
+    """The process-wide pools for ``url``, rebuilt after a fork (Celery prefork workers)."""
+    global _pools, _pools_pid
+    with _pools_lock:
+        if _pools is None or _pools_pid != os.getpid() or _pools.url != url:
+            _pools = PostgresPools(url, size, timeout)
+            _pools_pid = os.getpid()
+        return _pools
@@ -1,17 +1,34 @@
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from cirisnode.matrix.bot import send_audit_root
+from cirisnode.dao.job_dao import JobDAO
+from cirisnode.database import db_connection, run_in_db_thread
+from cirisnode.utils.merkle import MerkleTree
+from datetime import datetime, timedelta
 import asyncio
 
-scheduler = AsyncIOScheduler()
+scheduler = None
+
+def daily_merkle_root(since: str) -> tuple:
+    """Merkle root over the signed result roots of jobs completed since ``since``, with their ids."""
+    with db_connection() as conn:
+        jobs = JobDAO(conn).merkle_roots_since(since)
+    tree = MerkleTree(leaves=[bytes.fromhex(root) for _, root in jobs])
+    return [job_id for job_id, _ in jobs], tree.root.hex()
 
 async def daily_audit_task():
-    """Task to run daily: hash results and post audit root to Matrix."""
-    run_ids = []  # Placeholder for collecting run IDs, to be implemented
-    audit_message = await send_audit_root(run_ids)
-    print(f"Daily audit completed: {audit_message['sha256']}")
+    """Task to run daily: roll the day's job roots into one Merkle root and post it to Matrix."""
+    since = (datetime.utcnow() - timedelta(days=1)).isoformat()
+    # Reading the day's jobs is blocking SQLite work; keep it on the database executor.
+    run_ids, root = await run_in_db_thread(daily_merkle_root, since)
+    audit_message = await send_audit_root(run_ids, merkle_root=root)
+    print(f"Daily audit completed: {len(run_ids)} jobs, root {root} ({audit_message['sha256']})")
 
 def setup_scheduler():
     """Setup the scheduler with daily audit task."""
+    # Imported here so the audit functions above work without APScheduler installed.
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+    global scheduler
+    scheduler = AsyncIOScheduler()
     scheduler.add_job(daily_audit_task, 'interval', days=1, start_date='2025-05-01 00:00:00')
     scheduler.start()
     print("Scheduler started with daily audit task.")
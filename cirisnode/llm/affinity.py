@@ -0,0 +1,79 @@
+import asyncio
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Optional
+
+
+class ModelAffinityGate:
+    """
+    Admits requests to one Ollama endpoint a model at a time.
+
+    Requests for the active model go straight through; requests for other
+    models queue until the active model's work drains, then the model with the
+    most queued requests takes over. Once another model is waiting, the active
+    one may run ``max_batch`` more requests or hold the endpoint for
+    ``max_hold`` seconds before it must yield, so nobody starves. This turns
+    interleaved multi-model traffic into batches and saves a weight swap per
+    interleaving.
+    """
+
+    def __init__(self, max_batch: int = 64, max_hold: float = 30.0):
+        self.max_batch = max_batch
+        self.max_hold = max_hold
+        self.active: Optional[str] = None
+        self.in_flight = 0
+        self.served = 0
+        self.switches = 0
+        self.waiting: Counter = Counter()
+        self._batch_started = 0.0
+        self._condition = asyncio.Condition()
+
+    def _others_waiting(self) -> bool:
+        return any(count for model, count in self.waiting.items() if model != self.active)
+
+    def _must_yield(self) -> bool:
+        exhausted = self.served >= self.max_batch or time.monotonic() - self._batch_started > self.max_hold
+        return exhausted and self._others_waiting()
+
+    def _activate(self, model: Optional[str]) -> None:
+        if model != self.active and self.active is not None and model is not None:
+            self.switches += 1
+        self.active = model
+        self.served = 0
+        self._batch_started = time.monotonic()
+
+    def _admissible(self, model: str) -> bool:
+        idle = self.in_flight == 0 and (not self.waiting[self.active] or self._must_yield())
+        if self.active is None or (idle and self.active != model):
+            self._activate(model)
+        return self.active == model and not self._must_yield()
+
+    def _next_model(self) -> Optional[str]:
+        others = {m: c for m, c in self.waiting.items() if c and m != self.active}
+        if others and (self._must_yield() or not self.waiting[self.active]):
+            return max(others, key=others.get)
+        return self.active if self.waiting[self.active] else None
+
+    @asynccontextmanager
+    async def slot(self, model: str):
+        async with self._condition:
+            self.waiting[model] += 1
+            try:
+                await self._condition.wait_for(lambda: self._admissible(model))
+            except BaseException:
+                # A cancelled waiter may have been the reason the active model is held.
+                self.waiting[model] -= 1
+                self._condition.notify_all()
+                raise
+            self.waiting[model] -= 1
+            self.in_flight += 1
+            self.served += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                if self.in_flight == 0:
+                    self._activate(self._next_model())
+                self._condition.notify_all()
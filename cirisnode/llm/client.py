@@ -0,0 +1,205 @@
+import os
+from typing import List, Optional
+
+import httpx
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, ValidationError
+
+from cirisnode.config import settings
+from cirisnode.llm.ollama_pool import get_ollama_pool
+from cirisnode.llm.ratelimit import api_key_id, get_throttle
+from cirisnode.llm.response_cache import cache_key, get_response_cache
+from cirisnode.llm.singleflight import provider_calls
+from cirisnode.llm.streaming import match_answer, stream_ollama_generate
+
+# OPENAI_BASE_URL lets tests and load runs point at a compatible server such as cirisnode.stub_llm
+OPENAI_COMPLETIONS_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com").rstrip("/") + "/v1/completions"
+
+SUPPORTED_PROVIDERS = ("openai", "ollama")
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+class UnsupportedProviderError(ValueError):
+    """Raised when a benchmark asks for a provider we cannot talk to."""
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    A pooled client for upstream LLM traffic: keep-alive connections, HTTP/2
+    when the h2 package is installed, and bounded pool size and timeouts.
+    """
+    try:
+        import h2  # noqa: F401
+        http2 = settings.HTTP2_ENABLED
+    except ImportError:
+        http2 = False
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(settings.LLM_REQUEST_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT),
+    )
+
+
+def set_http_client(client: Optional[httpx.AsyncClient]) -> None:
+    """Install the application's client (done by the FastAPI lifespan) as the process-wide one."""
+    global _http_client
+    _http_client = client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide async HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = create_http_client()
+    return _http_client
+
+
+def get_upstream_client(request: Request) -> httpx.AsyncClient:
+    """FastAPI dependency: the lifespan-managed client, or the process-wide one outside a lifespan."""
+    client = getattr(request.app.state, "http_client", None)
+    return client if client is not None and not client.is_closed else get_http_client()
+
+
+# Generation parameters sent upstream; they are part of the response cache key.
+OPENAI_PARAMS = {"max_tokens": 100, "temperature": 0.7}
+OLLAMA_PARAMS = {}
+
+
+class GenerationOptions(BaseModel):
+    """Per-run generation limits and stop conditions."""
+    num_predict: Optional[int] = None  # Token budget (Ollama num_predict / OpenAI max_tokens)
+    stop: Optional[List[str]] = None  # Stop sequences, enforced by the provider
+    stop_on_answer: bool = False  # Stop at the first multiple-choice answer letter and return just that letter
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> Optional["GenerationOptions"]:
+        """Options from a run request body; malformed values are the caller's error (400)."""
+        try:
+            options = cls(
+                num_predict=payload.get("num_predict"),
+                stop=payload.get("stop"),
+                stop_on_answer=bool(payload.get("early_stop", False)),
+            )
+        except ValidationError as e:
+            fields = ", ".join(str(error["loc"][0]) for error in e.errors())
+            raise HTTPException(status_code=400, detail=f"Invalid generation options: {fields}")
+        return options if options != cls() else None
+
+
+def generation_params(provider: str, options: Optional[GenerationOptions] = None) -> dict:
+    """The request parameters sent to ``provider`` besides model and prompt."""
+    options = options or GenerationOptions()
+    if provider == "openai":
+        params = dict(OPENAI_PARAMS)
+        if options.num_predict is not None:
+            params["max_tokens"] = options.num_predict
+        if options.stop:
+            params["stop"] = options.stop
+        return params
+    params = dict(OLLAMA_PARAMS)
+    ollama_options = {}
+    if options.num_predict is not None:
+        ollama_options["num_predict"] = options.num_predict
+    if options.stop:
+        ollama_options["stop"] = options.stop
+    if ollama_options:
+        params["options"] = ollama_options
+    return params
+
+
+async def _call_provider(
+    provider: str,
+    model: str,
+    prompt: str,
+    api_key: Optional[str],
+    client: httpx.AsyncClient,
+    options: GenerationOptions,
+) -> str:
+    params = generation_params(provider, options)
+    if provider == "openai":
+        response = await client.post(
+            OPENAI_COMPLETIONS_URL,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json"
+            },
+            json={"model": model, "prompt": prompt, **params}
+        )
+        response.raise_for_status()
+        text = response.json().get("choices", [{}])[0].get("text", "").strip()
+        # Completions aren't streamed here, so answer matching happens after the fact.
+        if options.stop_on_answer:
+            return match_answer(text, final=True) or text
+        return text
+    if provider == "ollama":
+        payload = {"model": model, "prompt": prompt, **params}
+        if settings.OLLAMA_KEEP_ALIVE:
+            # Not a generation parameter, so it stays out of the cache key.
+            payload["keep_alive"] = settings.OLLAMA_KEEP_ALIVE
+
+        async def _ollama_generate(base_url: str) -> str:
+            if options.stop_on_answer:
+                text = await stream_ollama_generate(client, base_url, payload, stop_when=match_answer)
+                return match_answer(text, final=True) or text
+            response = await client.post(f"{base_url}/api/generate", json={**payload, "stream": False})
+            response.raise_for_status()
+            return response.json().get("response", "").strip()
+
+        return await get_ollama_pool().request(model, _ollama_generate, client)
+    raise UnsupportedProviderError(f"Unsupported provider: {provider}")
+
+
+async def generate(
+    provider: str,
+    model: str,
+    prompt: str,
+    api_key: Optional[str] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    use_cache: bool = True,
+    options: Optional[GenerationOptions] = None,
+) -> str:
+    """
+    Send one prompt to the given provider and return the stripped completion text.
+
+    Identical requests are answered from the response cache unless ``use_cache``
+    is False or LLM_CACHE_ENABLED is off; fresh answers are still stored.
+    OpenAI entries are scoped to the API key that paid for them.
+    Identical requests with the same API key already in flight share one
+    upstream call either way.
+    Upstream calls are rate limited per provider and API key, and 429s, 5xx
+    and connection errors are retried with backoff (see ``ratelimit``).
+    With ``options.stop_on_answer`` Ollama output is streamed and cut off at the
+    first answer letter, which becomes the response.
+    """
+    if provider not in SUPPORTED_PROVIDERS:
+        raise UnsupportedProviderError(f"Unsupported provider: {provider}")
+    options = options or GenerationOptions()
+    cache = get_response_cache() if settings.LLM_CACHE_ENABLED else None
+    params = generation_params(provider, options)
+    if options.stop_on_answer:
+        params["stop_on_answer"] = True
+    if provider == "openai":
+        # Paid completions stay with the key that bought them, so no other caller can read them back.
+        key = cache_key(provider, model, prompt, {**params, "api_key_id": api_key_id(api_key)})
+    else:
+        key = cache_key(provider, model, prompt, params)
+    if cache is not None and use_cache:
+        cached = await cache.aget(key)
+        if cached is not None:
+            return cached
+
+    async def _fetch() -> str:
+        ai_response = await get_throttle(provider, api_key).call(
+            lambda: _call_provider(provider, model, prompt, api_key, client or get_http_client(), options)
+        )
+        if cache is not None:
+            cache.set_behind(key, ai_response)
+        return ai_response
+
+    # Only callers with the same API key share a call: the upstream request runs on the first caller's key.
+    return await provider_calls.do(f"{key}:{api_key_id(api_key)}", _fetch)
@@ -0,0 +1,272 @@
+import asyncio
+import logging
+import os
+import time
+import weakref
+from collections import deque
+from functools import lru_cache
+from typing import Awaitable, Callable, Iterable, List, Optional, Set, TypeVar
+
+import httpx
+
+from cirisnode.config import settings
+from cirisnode.llm.affinity import ModelAffinityGate
+from cirisnode.llm.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class OllamaEndpoint:
+    """One Ollama server: its in-flight count, installed and resident models and recent latencies."""
+
+    def __init__(self, url: str, latency_window: int = 200):
+        self.url = url.rstrip("/")
+        self.outstanding = 0
+        self.models: Optional[Set[str]] = None  # None until /api/tags has been read
+        self.resident: Set[str] = set()  # Loaded in memory, per /api/ps and our own recent requests
+        self.healthy = True
+        self.refreshed_at = 0.0
+        self.last_ok: Optional[float] = None  # wall-clock time of the last successful /api/tags
+        self.last_error: Optional[str] = None
+        self.consecutive_failures = 0
+        self.latencies = deque(maxlen=latency_window)
+        self.gates = weakref.WeakKeyDictionary()  # event loop -> ModelAffinityGate
+
+    def has_model(self, model: str) -> bool:
+        if self.models is None:
+            return True
+        return model in self.models or f"{model}:latest" in self.models
+
+    def is_resident(self, model: str) -> bool:
+        return model in self.resident or f"{model}:latest" in self.resident
+
+    def latency_quantile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def health(self) -> dict:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "models": sorted(self.models) if self.models is not None else None,
+            "resident": sorted(self.resident),
+            "last_ok": self.last_ok,
+            "last_error": self.last_error,
+            "consecutive_failures": self.consecutive_failures,
+            "p95_latency": self.latency_quantile(0.95),
+        }
+
+    def __repr__(self) -> str:
+        return f"OllamaEndpoint({self.url!r}, outstanding={self.outstanding})"
+
+
+class OllamaPool:
+    """
+    Routes Ollama requests across replicas.
+
+    Each request goes to the healthy endpoint with the fewest requests in
+    flight among those that have the model; an endpoint that would have to
+    load the model first counts ``swap_penalty`` extra requests. If it runs
+    past that endpoint's p95 latency, a duplicate is sent to the next best
+    replica; the first response wins and the other request is cancelled.
+    With ``affinity`` on, each endpoint serves one model's queued requests at
+    a time (see ``ModelAffinityGate``) instead of interleaving models.
+    """
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        hedge: bool = True,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 20,
+        models_ttl: float = 60.0,
+        affinity: bool = True,
+        affinity_max_batch: int = 64,
+        affinity_max_hold: float = 30.0,
+        swap_penalty: int = 4,
+    ):
+        self.endpoints: List[OllamaEndpoint] = [OllamaEndpoint(url) for url in urls]
+        if not self.endpoints:
+            raise ValueError("OllamaPool needs at least one endpoint")
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.models_ttl = models_ttl
+        self.affinity = affinity
+        self.affinity_max_batch = affinity_max_batch
+        self.affinity_max_hold = affinity_max_hold
+        self.swap_penalty = swap_penalty
+        self.hedged = 0
+        self._refreshes = SingleFlight()
+        self._model_list: Optional[List[str]] = None
+        self._model_list_at = 0.0
+        self._background: Set[asyncio.Task] = set()
+
+    def get(self, url: str) -> Optional[OllamaEndpoint]:
+        return next((e for e in self.endpoints if e.url == url.rstrip("/")), None)
+
+    def pick(self, model: str, exclude: Iterable[OllamaEndpoint] = ()) -> Optional[OllamaEndpoint]:
+        excluded = set(map(id, exclude))
+        candidates = [e for e in self.endpoints if id(e) not in excluded]
+        # Prefer healthy endpoints with the model, then any healthy one, then anything left.
+        for tier in (
+            [e for e in candidates if e.healthy and e.has_model(model)],
+            [e for e in candidates if e.healthy],
+            candidates,
+        ):
+            if tier:
+                return min(tier, key=lambda e: e.outstanding + (0 if e.is_resident(model) else self.swap_penalty))
+        return None
+
+    def hedge_delay(self, endpoint: OllamaEndpoint) -> Optional[float]:
+        if not self.hedge or len(self.endpoints) < 2 or len(endpoint.latencies) < self.hedge_min_samples:
+            return None
+        return endpoint.latency_quantile(self.hedge_quantile)
+
+    async def refresh_models(self, client: httpx.AsyncClient, endpoint: OllamaEndpoint) -> Optional[Set[str]]:
+        """Read an endpoint's installed (/api/tags) and loaded (/api/ps) models, updating its health."""
+        try:
+            response = await client.get(f"{endpoint.url}/api/tags", timeout=10)
+            response.raise_for_status()
+            endpoint.models = {m["name"] for m in response.json().get("models", [])}
+            endpoint.healthy = True
+            endpoint.last_ok = time.time()
+            endpoint.last_error = None
+            endpoint.consecutive_failures = 0
+            ps = await client.get(f"{endpoint.url}/api/ps", timeout=10)
+            if ps.status_code == 200:
+                endpoint.resident = {m["name"] for m in ps.json().get("models", [])}
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"Ollama endpoint {endpoint.url} unavailable: {e!r}")
+            endpoint.healthy = False
+            endpoint.last_error = repr(e)
+            endpoint.consecutive_failures += 1
+        endpoint.refreshed_at = time.monotonic()
+        return endpoint.models if endpoint.healthy else None
+
+    async def ensure_fresh(self, client: httpx.AsyncClient) -> None:
+        stale = [e for e in self.endpoints if time.monotonic() - e.refreshed_at > self.models_ttl]
+        if stale:
+            await asyncio.gather(
+                *(self._refreshes.do(e.url, lambda e=e: self.refresh_models(client, e)) for e in stale)
+            )
+
+    async def _refresh_model_list(self, client: httpx.AsyncClient) -> Optional[List[str]]:
+        results = await asyncio.gather(*(self.refresh_models(client, e) for e in self.endpoints))
+        if any(models is not None for models in results):
+            self._model_list = sorted(set().union(*(models for models in results if models)))
+            self._model_list_at = time.monotonic()
+        return self._model_list
+
+    async def model_list(self, client: httpx.AsyncClient, ttl: float) -> Optional[List[str]]:
+        """
+        Models installed on any endpoint, served from memory with stale-while-revalidate.
+
+        Within ``ttl`` the cached list is returned as is. After that the stale
+        list is still returned immediately while one background refresh runs.
+        Only the very first call waits on Ollama. None means no endpoint has
+        ever answered.
+        """
+        if self._model_list is None:
+            return await self._refreshes.do("__model_list__", lambda: self._refresh_model_list(client))
+        if time.monotonic() - self._model_list_at > ttl:
+            task = asyncio.ensure_future(
+                self._refreshes.do("__model_list__", lambda: self._refresh_model_list(client))
+            )
+            # Keep a reference so the refresh isn't garbage collected mid-flight.
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+        return self._model_list
+
+    def gate(self, endpoint: OllamaEndpoint) -> ModelAffinityGate:
+        loop = asyncio.get_running_loop()
+        if loop not in endpoint.gates:
+            endpoint.gates[loop] = ModelAffinityGate(self.affinity_max_batch, self.affinity_max_hold)
+        return endpoint.gates[loop]
+
+    async def _call(self, endpoint: OllamaEndpoint, fn: Callable[[str], Awaitable[T]]) -> T:
+        started = time.perf_counter()
+        try:
+            result = await fn(endpoint.url)
+        except httpx.TransportError:
+            endpoint.healthy = False
+            raise
+        endpoint.latencies.append(time.perf_counter() - started)
+        endpoint.healthy = True
+        return result
+
+    async def _run(self, endpoint: OllamaEndpoint, model: str, fn: Callable[[str], Awaitable[T]]) -> T:
+        if not self.affinity:
+            return await self._call(endpoint, fn)
+        async with self.gate(endpoint).slot(model):
+            result = await self._call(endpoint, fn)
+        endpoint.resident.add(model)
+        return result
+
+    def _launch(self, endpoint: OllamaEndpoint, model: str, fn: Callable[[str], Awaitable[T]]) -> asyncio.Future:
+        # Count the request as soon as it is routed, so the next pick already sees it.
+        endpoint.outstanding += 1
+        task = asyncio.ensure_future(self._run(endpoint, model, fn))
+
+        def _settled(_):
+            endpoint.outstanding -= 1
+        task.add_done_callback(_settled)
+        return task
+
+    async def request(
+        self, model: str, fn: Callable[[str], Awaitable[T]], client: Optional[httpx.AsyncClient] = None
+    ) -> T:
+        """Run ``fn(base_url)`` on the best endpoint for ``model``, hedging to a second one if it is slow."""
+        if client is not None and len(self.endpoints) > 1:
+            await self.ensure_fresh(client)
+        primary = self.pick(model)
+        tasks = [self._launch(primary, model, fn)]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay(primary))
+            if not done:
+                secondary = self.pick(model, exclude=[primary])
+                if secondary is not None:
+                    self.hedged += 1
+                    tasks.append(self._launch(secondary, model, fn))
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                # Only failures so far: wait for the other replica, or raise if there is none.
+                if not pending:
+                    return done.pop().result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            # Surface nothing from the cancelled loser, but don't leave its exception unretrieved.
+            for task in tasks:
+                if task.done() and not task.cancelled():
+                    task.exception()
+
+
+def ollama_endpoint_urls() -> List[str]:
+    """OLLAMA_ENDPOINTS (comma-separated), else the single OLLAMA_BASE_URL."""
+    urls = [u.strip() for u in settings.OLLAMA_ENDPOINTS.split(",") if u.strip()]
+    return urls or [os.getenv("OLLAMA_BASE_URL", "http://ollama:11434")]
+
+
+@lru_cache(maxsize=1)
+def get_ollama_pool() -> OllamaPool:
+    """Process-wide pool over the configured Ollama endpoints."""
+    return OllamaPool(
+        ollama_endpoint_urls(),
+        hedge=settings.OLLAMA_HEDGE,
+        hedge_quantile=settings.OLLAMA_HEDGE_QUANTILE,
+        hedge_min_samples=settings.OLLAMA_HEDGE_MIN_SAMPLES,
+        affinity=settings.OLLAMA_MODEL_AFFINITY,
+        affinity_max_batch=settings.OLLAMA_AFFINITY_MAX_BATCH,
+        affinity_max_hold=settings.OLLAMA_AFFINITY_MAX_HOLD,
+    )
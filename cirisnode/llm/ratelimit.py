@@ -0,0 +1,204 @@
+import asyncio
+import hashlib
+import logging
+import random
+import threading
+import time
+import weakref
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+import httpx
+
+from cirisnode.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def parse_rate_limits(spec: str) -> Dict[str, float]:
+    """Parse "provider=requests_per_second" pairs from a comma-separated setting."""
+    rates = {}
+    for item in spec.split(","):
+        key, _, value = item.strip().partition("=")
+        if key and value:
+            rates[key.strip()] = float(value)
+    return rates
+
+
+def retry_after_seconds(response: Optional[httpx.Response]) -> Optional[float]:
+    """Seconds the server asked us to wait (Retry-After as seconds or an HTTP date), if any."""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Requests-per-second budget with bursts of up to ``burst`` requests.
+
+    A ``rate`` of 0 means unlimited. ``pause`` stops all takers until a
+    deadline, which is how a Retry-After from one request holds back the rest.
+    Shared by every event loop in the process, hence the thread lock.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst or max(rate, 1.0)
+        self.tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _wait_time(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            if self.rate > 0:
+                self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self.rate <= 0:
+                return 0.0
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    async def acquire(self) -> None:
+        while True:
+            wait = self._wait_time()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class AdaptiveLimit:
+    """
+    AIMD concurrency limit: halve on a throttle signal, grow by about one slot per window of successes.
+
+    Throttles within ``cooldown`` seconds of the last cut count once, so a burst
+    of 429s from requests already in flight doesn't collapse the limit to 1.
+    """
+
+    def __init__(self, maximum: int, cooldown: float = 1.0):
+        self.maximum = max(1, maximum)
+        self.limit = float(self.maximum)
+        self.cooldown = cooldown
+        self._last_cut = 0.0
+
+    @property
+    def current(self) -> int:
+        return max(1, int(self.limit))
+
+    def on_success(self) -> None:
+        self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+
+    def on_throttle(self) -> None:
+        now = time.monotonic()
+        if now - self._last_cut >= self.cooldown:
+            self.limit = max(1.0, self.limit / 2)
+            self._last_cut = now
+            logger.warning(f"Provider throttled; concurrency limit now {self.current}")
+
+
+class _AdaptiveGate:
+    """Per-event-loop admission against a shared AdaptiveLimit."""
+
+    def __init__(self, limit: AdaptiveLimit):
+        self.limit = limit
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit.current)
+            self.in_flight += 1
+
+    async def __aexit__(self, *exc):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+
+class ProviderThrottle:
+    """Rate limit, adaptive concurrency and retry policy for one provider and API key."""
+
+    def __init__(self, rate: float, max_concurrency: int):
+        self.bucket = TokenBucket(rate)
+        self.limit = AdaptiveLimit(max_concurrency)
+        self._gates = weakref.WeakKeyDictionary()
+
+    def _gate(self) -> _AdaptiveGate:
+        loop = asyncio.get_running_loop()
+        if loop not in self._gates:
+            self._gates[loop] = _AdaptiveGate(self.limit)
+        return self._gates[loop]
+
+    def backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        # Full jitter; a server-supplied Retry-After is a floor, not a suggestion.
+        delay = random.uniform(0, min(settings.LLM_BACKOFF_MAX, settings.LLM_BACKOFF_BASE * 2 ** attempt))
+        return max(delay, retry_after) if retry_after is not None else delay
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` under the limits, retrying 429s, 5xx and transport errors with backoff."""
+        attempt = 0
+        while True:
+            await self.bucket.acquire()
+            try:
+                async with self._gate():
+                    result = await fn()
+            except (httpx.HTTPStatusError, httpx.TransportError) as e:
+                response = getattr(e, "response", None) if isinstance(e, httpx.HTTPStatusError) else None
+                if response is not None and response.status_code not in RETRYABLE_STATUS:
+                    raise
+                if attempt >= settings.LLM_MAX_RETRIES:
+                    raise
+                retry_after = retry_after_seconds(response)
+                if response is not None and response.status_code == 429:
+                    self.limit.on_throttle()
+                    if retry_after:
+                        self.bucket.pause(retry_after)
+                delay = self.backoff(attempt, retry_after)
+                logger.info(f"LLM call failed ({e!r}); retry {attempt + 1} in {delay:.2f}s")
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            self.limit.on_success()
+            return result
+
+
+_throttles: Dict[Tuple[str, str], ProviderThrottle] = {}
+_throttles_lock = threading.Lock()
+
+
+def api_key_id(api_key: Optional[str]) -> str:
+    """A short, non-reversible identifier for an API key ("" for none)."""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16] if api_key else ""
+
+
+def get_throttle(provider: str, api_key: Optional[str] = None) -> ProviderThrottle:
+    """The process-wide throttle for a provider and API key (quotas are per key)."""
+    key_id = api_key_id(api_key)
+    with _throttles_lock:
+        throttle = _throttles.get((provider, key_id))
+        if throttle is None:
+            rate = parse_rate_limits(settings.LLM_RATE_LIMITS).get(provider, 0.0)
+            throttle = ProviderThrottle(rate, settings.LLM_ADAPTIVE_MAX_CONCURRENCY)
+            _throttles[(provider, key_id)] = throttle
+        return throttle
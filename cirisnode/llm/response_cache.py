@@ -0,0 +1,181 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Optional
+
+from cirisnode.config import settings
+from cirisnode.database import get_db_executor, run_in_db_thread
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(provider: str, model: str, prompt: str, params: Optional[dict] = None) -> str:
+    """Content address of a completion request: SHA-256 over provider, model, prompt and generation params."""
+    payload = json.dumps(
+        {"provider": provider, "model": model, "prompt": prompt, "params": params or {}},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier cache of LLM completions.
+
+    Lookups hit an in-process LRU first, then an optional SQLite file shared by
+    every worker on the host. Entries older than ``ttl_seconds`` are ignored and
+    dropped; the disk tier is pruned back to ``max_disk_entries`` (newest kept).
+    Async callers use ``aget`` and ``set_behind``, which keep the disk tier on
+    the database executor so the event loop never waits on SQLite.
+    """
+
+    PRUNE_EVERY = 100  # disk inserts between size checks
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        db_path: Optional[str] = None,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_disk_entries: int = 100_000,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()  # Memory tier; never held across disk I/O
+        self._disk_lock = threading.Lock()  # The shared sqlite3 connection
+        self._inserts = 0
+        self._conn = None
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_created ON llm_cache (created_at)")
+            self._conn.commit()
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, response: str, created_at: float) -> None:
+        self._memory[key] = (response, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if not self._expired(entry[1]):
+                self._memory.move_to_end(key)
+                return entry[0]
+            del self._memory[key]
+            return None
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        with self._disk_lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self._expired(row[1]):
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        with self._lock:
+            self._remember(key, row[0], row[1])
+        return row[0]
+
+    def _disk_set(self, key: str, response: str, created_at: float) -> None:
+        with self._disk_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, created_at) VALUES (?, ?, ?)",
+                (key, response, created_at),
+            )
+            self._inserts += 1
+            if self._inserts % self.PRUNE_EVERY == 0:
+                self._prune()
+            self._conn.commit()
+
+    def _disk_set_logged(self, key: str, response: str, created_at: float) -> None:
+        try:
+            self._disk_set(key, response, created_at)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    def get(self, key: str) -> Optional[str]:
+        cached = self._memory_get(key)
+        if cached is not None or self._conn is None:
+            return cached
+        return self._disk_get(key)
+
+    def set(self, key: str, response: str) -> None:
+        created_at = time.time()
+        with self._lock:
+            self._remember(key, response, created_at)
+        if self._conn is not None:
+            self._disk_set(key, response, created_at)
+
+    async def aget(self, key: str) -> Optional[str]:
+        """``get`` for async callers: the disk tier is read on the database executor, off the event loop."""
+        cached = self._memory_get(key)
+        if cached is not None or self._conn is None:
+            return cached
+        return await run_in_db_thread(self._disk_get, key)
+
+    def set_behind(self, key: str, response: str) -> Optional[Future]:
+        """``set`` without waiting on the disk tier: the row is written on the database executor."""
+        created_at = time.time()
+        with self._lock:
+            self._remember(key, response, created_at)
+        if self._conn is None:
+            return None
+        return get_db_executor().submit(self._disk_set_logged, key, response, created_at)
+
+    def _prune(self) -> None:
+        if self.ttl_seconds > 0:
+            self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        self._conn.execute(
+            """
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_disk_entries,),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        with self._disk_lock:
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM llm_cache")
+                self._conn.commit()
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> ResponseCache:
+    """Process-wide response cache configured from settings."""
+    return ResponseCache(
+        max_entries=settings.LLM_CACHE_MEMORY_ENTRIES,
+        db_path=settings.LLM_CACHE_PATH or None,
+        ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+        max_disk_entries=settings.LLM_CACHE_MAX_DISK_ENTRIES,
+    )
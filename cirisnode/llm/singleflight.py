@@ -0,0 +1,67 @@
+import asyncio
+import weakref
+from typing import Any, Awaitable, Callable, Dict
+
+
+class _Call:
+    """One shared in-flight task and the number of callers still awaiting it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key onto one in-flight task.
+
+    The first caller starts ``fn``; callers that arrive while it runs await the
+    same task and get the same result or exception. A caller being cancelled
+    (e.g. a dropped stream) does not cancel the shared call for the others,
+    but once the last waiter has gone the shared call is cancelled too.
+    """
+
+    def __init__(self):
+        self._calls = weakref.WeakKeyDictionary()
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        calls: Dict[str, _Call] = self._calls.setdefault(asyncio.get_running_loop(), {})
+        call = calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            calls[key] = call
+            call.task.add_done_callback(lambda done: self._finish(calls, key, call))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if not call.waiters and not call.task.done():
+                # Nobody is left to use the answer; stop paying for it and let the next caller start afresh.
+                if calls.get(key) is call:
+                    del calls[key]
+                call.task.cancel()
+
+    @staticmethod
+    def _finish(calls: Dict[str, _Call], key: str, call: _Call) -> None:
+        if calls.get(key) is call:
+            del calls[key]
+        if not call.task.cancelled():
+            # Mark the exception retrieved even if every waiter has gone away.
+            call.task.exception()
+
+    def in_flight(self) -> int:
+        try:
+            return len(self._calls.get(asyncio.get_running_loop(), {}))
+        except RuntimeError:
+            return 0
+
+
+provider_calls = SingleFlight()
@@ -0,0 +1,66 @@
+import json
+import re
+from typing import Callable, Optional
+
+import httpx
+
+ANSWER_CHOICES = "ABCDEF"
+
+# A leading letter only counts when punctuation or a line break follows it ("B." / "(B)" / "B:" / "B\n"):
+# "A juggler..." and "A car would..." open with the article, not choice A. After "answer is" a space
+# is enough. At end of stream the end of the text counts too.
+_LEADING_BOUNDARY = r"(?=[.,:;)\]]|\r?\n)"
+_STATED_BOUNDARY = r"(?=[\s.,:;)\]])"
+_END = r"|(?=\s*$)"
+
+
+def match_answer(text: str, final: bool = False, choices: str = ANSWER_CHOICES) -> Optional[str]:
+    """
+    Return the multiple-choice letter a response commits to, or None if it hasn't yet.
+
+    Accepts a response that starts with the letter ("B.", "(B) because...",
+    or just "B" once the stream has ended) or states it ("The answer is B",
+    "Answer: (C)"). A letter followed by a space and a word is prose.
+    """
+    end = _END if final else ""
+    letters = f"[{re.escape(choices)}]"
+    leading = re.match(rf"\s*\(?({letters})\)?(?:{_LEADING_BOUNDARY}{end})", text)
+    if leading:
+        return leading.group(1)
+    stated = re.search(rf"(?i:answer)(?:\s+(?i:is))?\s*:?\s*\(?({letters})\)?(?:{_STATED_BOUNDARY}{end})", text)
+    return stated.group(1) if stated else None
+
+
+async def stream_ollama_generate(
+    client: httpx.AsyncClient,
+    base_url: str,
+    payload: dict,
+    stop_when: Optional[Callable[[str], Optional[str]]] = None,
+) -> str:
+    """
+    Consume an Ollama /api/generate NDJSON stream chunk by chunk.
+
+    ``stop_when`` sees the text so far after every chunk; as soon as it returns
+    a value, that value is the result and the stream is closed. Ollama aborts a
+    generation when its client disconnects, so stopping also frees the GPU.
+    """
+    text = ""
+    async with client.stream("POST", f"{base_url}/api/generate", json={**payload, "stream": True}) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if not line.strip():
+                continue
+            try:
+                chunk = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if chunk.get("error"):
+                raise httpx.HTTPStatusError(chunk["error"], request=response.request, response=response)
+            text += chunk.get("response", "")
+            if stop_when is not None:
+                stopped = stop_when(text)
+                if stopped is not None:
+                    return stopped
+            if chunk.get("done"):
+                break
+    return text.strip()
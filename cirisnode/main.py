@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from cirisnode.api.audit.routes import audit_router
@@ -10,9 +11,31 @@ from cirisnode.api.agent.routes import agent_router
 from cirisnode.api.auth.routes import auth_router
 from cirisnode.api.wa.routes import wa_router
 from cirisnode.api.config.routes import config_router
+from cirisnode.api.he300.routes import he300_router
+from cirisnode.api.he300.sampling import get_he300_sample
+from cirisnode.config import settings
+from cirisnode.database import pool_stats
+from cirisnode.llm.client import create_http_client, set_http_client
+from cirisnode.utils.cache import preload_datasets
 import os
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Parse benchmark datasets once per worker, before the first request
+    preload_datasets()
+    get_he300_sample(settings.HE300_SEED)
+    # One pooled upstream HTTP client for the whole app, injected via get_upstream_client
+    app.state.http_client = create_http_client()
+    set_http_client(app.state.http_client)
+    try:
+        yield
+    finally:
+        set_http_client(None)
+        await app.state.http_client.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 FRONTEND_ORIGIN = os.getenv("FRONTEND_ORIGIN", "https://node0.ciris.ai")
 
@@ -33,15 +56,22 @@ app.include_router(health_router)
 app.include_router(agent_router)
 app.include_router(auth_router)
 app.include_router(benchmarks_router)
+app.include_router(he300_router)
 app.include_router(wa_router)
 app.include_router(config_router)
 
 @app.get("/metrics")
 def metrics():
     # Placeholder Prometheus metrics
-    return (
-        "cirisnode_up 1\n"
-        "cirisnode_jobs_total 0\n"
-        "cirisnode_wbd_tasks_total 0\n"
-        "cirisnode_audit_logs_total 0\n"
-    )
+    db = pool_stats()
+    lines = [
+        "cirisnode_up 1",
+        "cirisnode_jobs_total 0",
+        "cirisnode_wbd_tasks_total 0",
+        "cirisnode_audit_logs_total 0",
+    ]
+    for key in ("size", "open", "in_use", "acquired", "waited", "wait_seconds_total", "wait_seconds_max"):
+        if db.get(key) is not None:
+            suffix = "_total" if key in ("acquired", "waited") else ""
+            lines.append(f"cirisnode_db_pool_{key}{suffix} {db[key]}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,64 @@
+import base64
+import hashlib
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+from cirisnode.config import settings
+from cirisnode.utils.signer import sign_data
+
+logger = logging.getLogger(__name__)
+
+
+def matrix_enabled() -> bool:
+    return settings.matrix_logging_enabled.lower() in ("1", "true", "yes") and all(
+        (settings.matrix_homeserver_url, settings.matrix_access_token, settings.matrix_room_id)
+    )
+
+
+def audit_root_message(run_ids: List[str], merkle_root: Optional[str] = None) -> dict:
+    """
+    The daily audit record: the job ids, their Merkle root, a SHA-256 over both
+    and the node's signature, so anyone reading the room can check it.
+    """
+    body = {
+        "type": "cirisnode.audit_root",
+        "timestamp": datetime.utcnow().isoformat(),
+        "run_ids": list(run_ids),
+        "merkle_root": merkle_root,
+    }
+    body["sha256"] = hashlib.sha256(json.dumps(body, sort_keys=True).encode()).hexdigest()
+    body["signature"] = base64.b64encode(sign_data(body)).decode()
+    return body
+
+
+async def send_audit_root(run_ids: List[str], merkle_root: Optional[str] = None) -> dict:
+    """
+    Publish the daily audit root and return the message.
+
+    Posted to ``matrix_room_id`` when Matrix logging is enabled and configured;
+    otherwise only logged, so the scheduler runs the same way on nodes without
+    a Matrix account.
+    """
+    message = audit_root_message(run_ids, merkle_root)
+    if not matrix_enabled():
+        logger.info(f"Matrix logging disabled; audit root {merkle_root} ({message['sha256']}) not posted")
+        return message
+    from nio import AsyncClient, RoomSendResponse
+
+    client = AsyncClient(settings.matrix_homeserver_url)
+    client.access_token = settings.matrix_access_token
+    try:
+        response = await client.room_send(
+            settings.matrix_room_id,
+            "m.room.message",
+            {"msgtype": "m.notice", "body": json.dumps(message, sort_keys=True), "cirisnode": message},
+            tx_id=str(uuid.uuid4()),
+        )
+    finally:
+        await client.close()
+    if not isinstance(response, RoomSendResponse):
+        raise RuntimeError(f"Posting the audit root to Matrix failed: {response}")
+    return message
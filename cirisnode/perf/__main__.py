@@ -0,0 +1,53 @@
+import argparse
+import asyncio
+import json
+import sys
+
+from cirisnode.perf.suite import BASELINE_PATH, PerfConfig, compare, run_suite
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the CIRISNode performance suite.")
+    parser.add_argument("--output", default="perf-results.json", help="Where to write the JSON report")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed regression, as a fraction")
+    parser.add_argument("--update-baseline", action="store_true", help="Write this run to --baseline")
+    parser.add_argument("--scenario", action="append", help="Run only these scenarios (repeatable)")
+    parser.add_argument("--requests", type=int)
+    parser.add_argument("--concurrency", type=int)
+    parser.add_argument("--stub-latency")
+    args = parser.parse_args()
+
+    fields = {
+        name: getattr(args, name)
+        for name in ("requests", "concurrency", "stub_latency")
+        if getattr(args, name) is not None
+    }
+    report = asyncio.run(run_suite(PerfConfig(**fields), only=args.scenario))
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    for name, result in report["scenarios"].items():
+        print(
+            f"{name:20} {result['throughput_rps']:>9.1f} rps  p50 {result['p50_ms']:.1f} ms  "
+            f"p95 {result['p95_ms']:.1f} ms  p99 {result['p99_ms']:.1f} ms  rss {result['peak_rss_mb']} MB"
+        )
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}; skipping comparison")
+        return
+    regressions = compare(report, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+End-to-end performance suite for the node's hot paths.
+
+Drives SimpleBench ``run-sync``, agent event ingestion, audit log queries and
+the database-backed WA task listing through the real app, in-process, against
+a freshly seeded SQLite database and the stub LLM. Each scenario reports
+throughput, p50/p95/p99 latency and the process's peak RSS; the report is JSON
+so it can be compared against a stored baseline.
+
+    python -m cirisnode.perf --output perf.json --baseline cirisnode/perf/baseline.json
+"""
+import asyncio
+import json
+import os
+import platform
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+from pydantic import BaseModel
+
+from cirisnode import database
+from cirisnode.config import settings
+from cirisnode.db.migrations import migrate
+from cirisnode.llm.client import get_upstream_client
+from cirisnode.stub_llm.server import StubConfig, create_stub_app
+from cirisnode.utils.cache import get_simplebench_dataset
+from cirisnode.utils.encryption import encrypt_data
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+class PerfConfig(BaseModel):
+    requests: int = 200  # Requests per scenario (run-sync runs a tenth as many, each a full benchmark)
+    concurrency: int = 16
+    warmup: int = 10  # Unmeasured requests per scenario, to fill caches and pools
+    seed_events: int = 5000  # Agent events in the seeded database
+    seed_audit_logs: int = 20000
+    seed_wbd_tasks: int = 500
+    stub_latency: str = "fixed:0.005"  # Per-call latency of the fake LLM
+    model: str = "stub"
+
+
+def seed_database(path: str, config: PerfConfig) -> None:
+    """Create the migrated schema at ``path`` and fill it with representative rows."""
+    conn = sqlite3.connect(path)
+    migrate(conn)
+    start = datetime(2025, 1, 1)
+    actors = [f"agent-{i}" for i in range(50)]
+    conn.executemany(
+        "INSERT INTO agent_events (id, node_ts, agent_uid, event_json) VALUES (?, ?, ?, ?)",
+        (
+            (str(uuid.UUID(int=i)), start + timedelta(seconds=i), actors[i % len(actors)],
+             json.dumps({"type": "Thought", "seq": i, "content": "x" * 200}))
+            for i in range(config.seed_events)
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO audit_logs (id, timestamp, actor, event_type, payload_sha256, details) VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            (i + 1, start + timedelta(seconds=i), actors[i % len(actors)], "agent_event", f"{i:064x}",
+             json.dumps({"seq": i}))
+            for i in range(config.seed_audit_logs)
+        ),
+    )
+    # Created within the last day and stored as ISO strings like the WA route writes them, so the
+    # listing's 24h SLA sweep finds nothing to escalate and every request measures the same read.
+    now = datetime.utcnow()
+    payload = encrypt_data("p" * 100)
+    conn.executemany(
+        "INSERT INTO wbd_tasks (id, agent_task_id, payload, status, created_at) VALUES (?, ?, ?, ?, ?)",
+        (
+            (str(uuid.UUID(int=i)), f"task-{i}", payload, "open" if i % 3 else "resolved",
+             (now - timedelta(seconds=30 * i)).isoformat())
+            for i in range(config.seed_wbd_tasks)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of ``samples`` (q in 0..100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class Scenario:
+    """A named request repeated ``requests`` times with ``concurrency`` in flight."""
+
+    def __init__(self, name: str, send: Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]], requests: int):
+        self.name = name
+        self.send = send
+        self.requests = requests
+
+
+async def _drive(client: httpx.AsyncClient, scenario: Scenario, count: int, concurrency: int, offset: int = 0):
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(offset, offset + count))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                response = await scenario.send(client, i)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, count)))))
+    return latencies, errors, time.perf_counter() - started
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, config: PerfConfig) -> dict:
+    await _drive(client, scenario, config.warmup, config.concurrency)
+    latencies, errors, elapsed = await _drive(
+        client, scenario, scenario.requests, config.concurrency, offset=config.warmup
+    )
+    return {
+        "requests": scenario.requests,
+        "errors": errors,
+        "concurrency": config.concurrency,
+        "duration_s": round(elapsed, 4),
+        "throughput_rps": round(scenario.requests / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def build_scenarios(config: PerfConfig) -> List[Scenario]:
+    scenario_ids = [s["question_id"] for s in get_simplebench_dataset().scenarios]
+    run_sync_payload = {"scenario_ids": scenario_ids, "provider": "ollama", "model": config.model, "fresh": True}
+
+    def run_sync(client, i):
+        return client.post("/api/v1/simplebench/run-sync", json=run_sync_payload)
+
+    def ingest_event(client, i):
+        return client.post(
+            "/api/v1/agent/events",
+            json={"agent_uid": f"agent-{i % 50}", "event": {"type": "Action", "seq": i, "content": "y" * 200}},
+        )
+
+    def audit_logs(client, i):
+        params = {"limit": 100, "offset": (i % 10) * 100}
+        if i % 2:
+            params["actor"] = f"agent-{i % 50}"
+        return client.get("/api/v1/audit/logs", params=params)
+
+    def wbd_tasks(client, i):
+        params = {"state": "open" if i % 2 else "resolved"}
+        return client.get("/api/v1/wa/tasks", params=params)
+
+    return [
+        Scenario("run_sync", run_sync, max(1, config.requests // 10)),
+        Scenario("agent_event_ingest", ingest_event, config.requests),
+        Scenario("audit_log_query", audit_logs, config.requests),
+        Scenario("wbd_task_list", wbd_tasks, config.requests),
+    ]
+
+
+@asynccontextmanager
+async def _perf_app(config: PerfConfig, db_path: str):
+    """The node app on a seeded database, with upstream LLM calls answered by the stub."""
+    from cirisnode.main import app
+
+    stub = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_stub_app(StubConfig(latency=config.stub_latency))),
+        timeout=None,
+    )
+    previous_url, settings.DATABASE_URL = settings.DATABASE_URL, f"sqlite:///{db_path}"
+    app.dependency_overrides[get_upstream_client] = lambda: stub
+    try:
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://cirisnode", timeout=None
+            ) as client:
+                yield client
+    finally:
+        app.dependency_overrides.pop(get_upstream_client, None)
+        database.get_pool().close()
+        settings.DATABASE_URL = previous_url
+        await stub.aclose()
+
+
+async def run_suite(config: Optional[PerfConfig] = None, only: Optional[List[str]] = None) -> dict:
+    """Seed a throwaway database, run every scenario and return the report."""
+    config = config or PerfConfig()
+    with tempfile.TemporaryDirectory(prefix="cirisnode-perf-") as tmp:
+        db_path = os.path.join(tmp, "perf.db")
+        seed_database(db_path, config)
+        results: Dict[str, dict] = {}
+        async with _perf_app(config, db_path) as client:
+            for scenario in build_scenarios(config):
+                if only and scenario.name not in only:
+                    continue
+                results[scenario.name] = await run_scenario(client, scenario, config)
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "config": config.model_dump(),
+        },
+        "scenarios": results,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.3) -> List[str]:
+    """
+    Regressions of ``report`` against ``baseline``, as readable lines.
+
+    A scenario regresses when its throughput falls, or its p95/p99 latency
+    rises, by more than ``tolerance`` (a fraction), or when it has errors.
+    Scenarios missing from either side are skipped.
+    """
+    regressions = []
+    for name, current in report["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        if current["errors"]:
+            regressions.append(f"{name}: {current['errors']} failed requests")
+        if current["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {current['throughput_rps']} rps vs baseline {base['throughput_rps']} rps"
+            )
+        for key in ("p95_ms", "p99_ms"):
+            if current[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{name}: {key} {current[key]} vs baseline {base[key]}")
+    return regressions
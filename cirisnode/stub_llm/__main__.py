@@ -0,0 +1,33 @@
+import argparse
+import json
+
+import uvicorn
+
+from cirisnode.stub_llm.server import StubConfig, create_stub_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the stub Ollama/OpenAI server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--config", help="JSON file with StubConfig fields")
+    parser.add_argument("--latency")
+    parser.add_argument("--token-rate", type=float)
+    parser.add_argument("--error-rate", type=float)
+    parser.add_argument("--accuracy", type=float)
+    parser.add_argument("--answer-format", choices=["letter", "verbose"])
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    fields = {}
+    if args.config:
+        with open(args.config) as f:
+            fields.update(json.load(f))
+    for name in ("latency", "token_rate", "error_rate", "accuracy", "answer_format", "seed"):
+        if getattr(args, name) is not None:
+            fields[name] = getattr(args, name)
+    uvicorn.run(create_stub_app(StubConfig(**fields)), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Deterministic stand-in for Ollama and OpenAI, for load and regression tests.
+
+Speaks Ollama /api/generate (streamed and not), /api/tags and /api/ps, and
+OpenAI /v1/completions. Latency, token rate, error rate and answers are set
+by ``StubConfig``; SimpleBench prompts get their canned answer by
+question_id, so runs score predictably.
+
+    python -m cirisnode.stub_llm --port 11435 --latency uniform:0.05:0.2 --error-rate 0.02
+"""
+import asyncio
+import hashlib
+import json
+import random
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+from cirisnode.utils.data_loaders import load_simplebench_dataset
+
+CHOICES = "ABCDEF"
+
+
+class StubConfig(BaseModel):
+    models: List[str] = ["llama3:latest", "stub:latest"]
+    latency: str = "fixed:0"  # fixed:S | uniform:LO:HI | normal:MEAN:SD | lognormal:MU:SIGMA | exp:MEAN (seconds)
+    token_rate: float = 0.0  # Output tokens per second; 0 emits them instantly
+    response_tokens: int = 24  # Tokens after the answer letter when answer_format is "verbose"
+    answer_format: str = "letter"  # "letter" (just "B") or "verbose" ("B) because ...")
+    accuracy: float = 1.0  # Share of SimpleBench prompts answered correctly
+    error_rate: float = 0.0  # Share of requests that fail
+    throttle_share: float = 0.5  # Share of failures that are 429 (with Retry-After) rather than 500
+    retry_after: float = 0.1
+    answers: Dict[str, str] = {}  # question_id -> answer, overrides the SimpleBench answer key
+    seed: int = 0
+
+
+def parse_latency(spec: str):
+    """Turn a latency spec into a sampler ``rng -> seconds``."""
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(":") if v]
+    samplers = {
+        "fixed": lambda rng: values[0],
+        "uniform": lambda rng: rng.uniform(values[0], values[1]),
+        "normal": lambda rng: rng.gauss(values[0], values[1]),
+        "lognormal": lambda rng: rng.lognormvariate(values[0], values[1]),
+        "exp": lambda rng: rng.expovariate(1 / values[0]) if values[0] else 0.0,
+    }
+    if kind not in samplers:
+        raise ValueError(f"Unknown latency distribution: {spec}")
+    sampler = samplers[kind]
+    return lambda rng: max(0.0, sampler(rng))
+
+
+class StubLLM:
+    """The behaviour behind the stub app, usable without HTTP in tests."""
+
+    def __init__(self, config: StubConfig, answer_key: Optional[Dict[str, str]] = None):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.sample_latency = parse_latency(config.latency)
+        if answer_key is None:
+            dataset = load_simplebench_dataset()
+            answer_key = {s["prompt"]: config.answers.get(str(s["question_id"]), s["answer"]) for s in dataset.scenarios}
+        self.answer_key = answer_key
+        self.resident: Dict[str, float] = {}
+        self.stats = {"requests": 0, "errors": 0, "throttled": 0, "in_flight": 0, "peak_in_flight": 0}
+
+    def _digest(self, prompt: str) -> int:
+        return int.from_bytes(hashlib.sha256(f"{self.config.seed}:{prompt}".encode()).digest()[:8], "big")
+
+    def answer(self, prompt: str) -> str:
+        """The letter for a prompt: its canned answer, deliberately wrong for a 1 - accuracy share."""
+        digest = self._digest(prompt)
+        correct = self.answer_key.get(prompt)
+        if correct is None:
+            return CHOICES[digest % 4]
+        if (digest % 10_000) / 10_000 < self.config.accuracy:
+            return correct
+        wrong = [c for c in CHOICES if c != correct]
+        return wrong[digest % len(wrong)]
+
+    def tokens(self, prompt: str, limit: Optional[int] = None) -> List[str]:
+        letter = self.answer(prompt)
+        if self.config.answer_format != "verbose":
+            return [letter]
+        tokens = [letter, ")", " because"] + [" reasons"] * self.config.response_tokens + ["."]
+        return tokens[:limit] if limit else tokens
+
+    def failure(self) -> Optional[JSONResponse]:
+        if self.rng.random() >= self.config.error_rate:
+            return None
+        self.stats["errors"] += 1
+        if self.rng.random() < self.config.throttle_share:
+            self.stats["throttled"] += 1
+            return JSONResponse(
+                {"error": "rate limited"}, status_code=429, headers={"Retry-After": str(self.config.retry_after)}
+            )
+        return JSONResponse({"error": "stub failure"}, status_code=500)
+
+    async def token_delay(self) -> None:
+        if self.config.token_rate > 0:
+            await asyncio.sleep(1 / self.config.token_rate)
+
+    def enter(self, model: str) -> None:
+        self.stats["requests"] += 1
+        self.stats["in_flight"] += 1
+        self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.stats["in_flight"])
+        self.resident[model] = time.time()
+
+    def leave(self) -> None:
+        self.stats["in_flight"] -= 1
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def create_stub_app(config: Optional[StubConfig] = None, answer_key: Optional[Dict[str, str]] = None) -> FastAPI:
+    stub = StubLLM(config or StubConfig(), answer_key)
+    app = FastAPI(title="CIRISNode stub LLM")
+    app.state.stub = stub
+
+    @app.post("/api/generate")
+    async def generate(request: Request):
+        body = await request.json()
+        model, prompt = body.get("model", ""), body.get("prompt", "")
+        failure = stub.failure()
+        if failure is not None:
+            return failure
+        stub.enter(model)
+        tokens = stub.tokens(prompt, (body.get("options") or {}).get("num_predict"))
+        try:
+            await asyncio.sleep(stub.sample_latency(stub.rng))
+        except BaseException:
+            stub.leave()
+            raise
+        if not body.get("stream", True):
+            try:
+                for _ in tokens:
+                    await stub.token_delay()
+                return {"model": model, "created_at": _now(), "response": "".join(tokens), "done": True,
+                        "done_reason": "stop", "eval_count": len(tokens)}
+            finally:
+                stub.leave()
+
+        async def chunks():
+            try:
+                for token in tokens:
+                    yield json.dumps({"model": model, "created_at": _now(), "response": token, "done": False}) + "\n"
+                    await stub.token_delay()
+                yield json.dumps({"model": model, "created_at": _now(), "response": "", "done": True,
+                                  "done_reason": "stop", "eval_count": len(tokens)}) + "\n"
+            finally:
+                stub.leave()
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    @app.get("/api/tags")
+    async def tags():
+        return {"models": [{"name": name, "model": name, "size": 0} for name in stub.config.models]}
+
+    @app.get("/api/ps")
+    async def ps():
+        return {"models": [{"name": name, "model": name} for name in stub.resident]}
+
+    @app.post("/v1/completions")
+    async def completions(request: Request):
+        body = await request.json()
+        failure = stub.failure()
+        if failure is not None:
+            return failure
+        stub.enter(body.get("model", ""))
+        try:
+            tokens = stub.tokens(body.get("prompt", ""), body.get("max_tokens"))
+            await asyncio.sleep(stub.sample_latency(stub.rng))
+            for _ in tokens:
+                await stub.token_delay()
+        finally:
+            stub.leave()
+        return {
+            "id": f"cmpl-stub-{stub.stats['requests']}",
+            "object": "text_completion",
+            "model": body.get("model"),
+            "choices": [{"text": "".join(tokens), "index": 0, "finish_reason": "stop"}],
+            "usage": {"completion_tokens": len(tokens)},
+        }
+
+    @app.get("/stub/stats")
+    async def stats():
+        return stub.stats
+
+    return app
+
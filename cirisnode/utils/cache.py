@@ -1,12 +1,37 @@
 from functools import lru_cache
-from cirisnode.utils.data_loaders import load_he300_data, load_simplebench_data # Updated import
+from cirisnode.utils.data_loaders import (
+    BenchmarkDataset,
+    load_he300_data,
+    load_he300_dataset,
+    load_simplebench_data,
+    load_simplebench_dataset,
+)
+
+def get_cached_he300_data(offset: int = 0, limit: int = 300):
+    """Retrieve a page of HE-300 content from the shared, memory-mapped dataset."""
+    return load_he300_data(get_he300_dataset(), offset, limit)
+
+@lru_cache(maxsize=1)
+def get_simplebench_dataset() -> BenchmarkDataset:
+    """Retrieve the indexed SimpleBench dataset, parsed once per process."""
+    return load_simplebench_dataset()
 
 @lru_cache(maxsize=1)
-def get_cached_he300_data():
-    """Retrieve cached HE-300 data."""
-    return load_he300_data()
+def get_he300_dataset():
+    """Retrieve the HE-300 dataset, opened once per process."""
+    return load_he300_dataset()
 
 @lru_cache(maxsize=1)
 def get_cached_simplebench_data():
     """Retrieve cached SimpleBench data."""
-    return load_simplebench_data()
+    return load_simplebench_data(get_simplebench_dataset())
+
+def get_dataset(name: str):
+    """Look up a benchmark dataset by name ("simplebench" or "he300")."""
+    return {"simplebench": get_simplebench_dataset, "he300": get_he300_dataset}[name]()
+
+def preload_datasets() -> None:
+    """Parse every benchmark dataset up front so no request pays for file I/O."""
+    get_simplebench_dataset()
+    get_he300_dataset()
+    get_cached_simplebench_data()
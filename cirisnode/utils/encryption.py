@@ -1,14 +1,12 @@
-from cryptography.fernet import Fernet
+from cirisnode.utils.keys import get_cipher
 
-# Generate a key for encryption/decryption
-# This key should be securely stored and retrieved from a secure location (e.g., environment variable, secrets manager)
-SECRET_KEY = Fernet.generate_key()
-cipher = Fernet(SECRET_KEY)
+# Keys come from ENCRYPTION_KEYS / ENCRYPTION_KEY_PATH (see cirisnode.utils.keys), so every
+# worker shares them and data encrypted before a key rotation still decrypts.
 
 def encrypt_data(data: str) -> str:
-    """Encrypt the given data."""
-    return cipher.encrypt(data.encode()).decode()
+    """Encrypt the given data with the current primary key."""
+    return get_cipher().encrypt(data.encode()).decode()
 
 def decrypt_data(encrypted_data: str) -> str:
-    """Decrypt the given data."""
-    return cipher.decrypt(encrypted_data.encode()).decode()
+    """Decrypt the given data with whichever configured key produced it."""
+    return get_cipher().decrypt(encrypted_data.encode()).decode()
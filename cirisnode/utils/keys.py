@@ -0,0 +1,135 @@
+import base64
+import logging
+import os
+import tempfile
+import time
+from functools import lru_cache
+from typing import List
+
+from cryptography.fernet import Fernet, MultiFernet
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+from cirisnode.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _create_exclusive(path: str, content: bytes) -> bool:
+    """
+    Publish ``content`` as a new owner-only file; False if another process created it first.
+
+    The content is written and synced to a private temp file that is then
+    hard-linked into place, so ``path`` never exists without its full content.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", dir=directory)  # Mode 0600
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.link(tmp_path, path)
+        except FileExistsError:
+            return False
+        return True
+    finally:
+        os.unlink(tmp_path)
+
+
+def _read_key_file(path: str, attempts: int = 20, delay: float = 0.05) -> bytes:
+    # Files are published whole, but one written by an older version or by hand may still be mid-write.
+    for _ in range(attempts):
+        with open(path, "rb") as f:
+            content = f.read()
+        if content.strip():
+            return content
+        time.sleep(delay)
+    raise RuntimeError(f"Key file {path} is empty")
+
+
+def _parse_signing_key(material: bytes) -> ed25519.Ed25519PrivateKey:
+    material = material.strip()
+    if material.startswith(b"-----BEGIN"):
+        return serialization.load_pem_private_key(material, password=None)
+    return ed25519.Ed25519PrivateKey.from_private_bytes(base64.b64decode(material))
+
+
+@lru_cache(maxsize=1)
+def get_signing_key() -> ed25519.Ed25519PrivateKey:
+    """
+    The node's Ed25519 signing key, parsed once per process.
+
+    Read from SIGNING_KEY (PEM or base64 raw bytes) or SIGNING_KEY_PATH. If
+    neither exists a key is generated and written to SIGNING_KEY_PATH; workers
+    racing to do so all end up with the file's key, so every process signs
+    with the same key across restarts.
+    """
+    if settings.SIGNING_KEY:
+        return _parse_signing_key(settings.SIGNING_KEY.encode())
+    path = settings.SIGNING_KEY_PATH
+    if not os.path.exists(path):
+        pem = ed25519.Ed25519PrivateKey.generate().private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+        if _create_exclusive(path, pem):
+            logger.warning(f"No signing key configured; generated a new one at {path}")
+    return _parse_signing_key(_read_key_file(path))
+
+
+def _read_key_lines(path: str) -> List[bytes]:
+    lines = _read_key_file(path).splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.startswith(b"#")]
+
+
+def encryption_keys() -> List[bytes]:
+    """Fernet keys, newest first: ENCRYPTION_KEYS (comma-separated) or one per line in ENCRYPTION_KEY_PATH."""
+    if settings.ENCRYPTION_KEYS:
+        return [k.strip().encode() for k in settings.ENCRYPTION_KEYS.split(",") if k.strip()]
+    path = settings.ENCRYPTION_KEY_PATH
+    if not os.path.exists(path):
+        if _create_exclusive(path, Fernet.generate_key() + b"\n"):
+            logger.warning(f"No encryption key configured; generated a new one at {path}")
+    return _read_key_lines(path)
+
+
+@lru_cache(maxsize=1)
+def get_cipher() -> MultiFernet:
+    """
+    Cipher over every configured key, built once per process.
+
+    Encrypts with the first (newest) key and decrypts with any of them, so old
+    data stays readable after a rotation.
+    """
+    return MultiFernet([Fernet(key) for key in encryption_keys()])
+
+
+def rotate_encryption_key() -> bytes:
+    """
+    Put a new primary key at the top of ENCRYPTION_KEY_PATH and return it.
+
+    Older keys stay listed for decryption; re-encrypt stored data with
+    ``get_cipher().rotate(token)`` before dropping them. Other processes pick up
+    the new key after ``reload_keys()`` or a restart.
+    """
+    if settings.ENCRYPTION_KEYS:
+        raise RuntimeError("ENCRYPTION_KEYS is set in the environment; rotate it there instead.")
+    path = settings.ENCRYPTION_KEY_PATH
+    existing = _read_key_lines(path) if os.path.exists(path) else []
+    key = Fernet.generate_key()
+    tmp_path = f"{path}.tmp"
+    if not _create_exclusive(tmp_path, b"\n".join([key, *existing]) + b"\n"):
+        raise RuntimeError(f"Key rotation already in progress ({tmp_path} exists)")
+    os.replace(tmp_path, path)
+    reload_keys()
+    return key
+
+
+def reload_keys() -> None:
+    """Drop the cached key objects so the next use reads the current key material."""
+    get_signing_key.cache_clear()
+    get_cipher.cache_clear()
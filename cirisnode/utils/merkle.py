@@ -0,0 +1,68 @@
+import hashlib
+import json
+from typing import Dict, List, Sequence
+
+# Domain separation keeps a leaf from ever being passed off as an interior node.
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def canonical_json(data) -> bytes:
+    return json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
+
+
+def leaf_hash(item) -> bytes:
+    return hashlib.sha256(LEAF_PREFIX + canonical_json(item)).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+class MerkleTree:
+    """
+    Binary SHA-256 Merkle tree over JSON-serialisable items.
+
+    An odd node at the end of a level is carried up unchanged, so a proof has
+    at most ceil(log2(n)) steps.
+    """
+
+    def __init__(self, items: Sequence = (), leaves: Sequence[bytes] = None):
+        level = list(leaves) if leaves is not None else [leaf_hash(item) for item in items]
+        self.levels: List[List[bytes]] = [level]
+        while len(level) > 1:
+            level = [
+                node_hash(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+                for i in range(0, len(level), 2)
+            ]
+            self.levels.append(level)
+
+    def __len__(self) -> int:
+        return len(self.levels[0])
+
+    @property
+    def root(self) -> bytes:
+        return self.levels[-1][0] if self.levels[0] else hashlib.sha256(b"").digest()
+
+    def proof(self, index: int) -> List[Dict[str, str]]:
+        """Sibling hashes from leaf ``index`` up to the root, as ``{"side": "L"|"R", "hash": hex}``."""
+        steps = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                steps.append({"side": "L" if sibling < index else "R", "hash": level[sibling].hex()})
+            index //= 2
+        return steps
+
+
+def root_from_proof(item, proof: Sequence[Dict[str, str]]) -> bytes:
+    digest = leaf_hash(item)
+    for step in proof:
+        sibling = bytes.fromhex(step["hash"])
+        digest = node_hash(sibling, digest) if step["side"] == "L" else node_hash(digest, sibling)
+    return digest
+
+
+def verify_proof(item, proof: Sequence[Dict[str, str]], root_hex: str) -> bool:
+    """Check that ``item`` is included under ``root_hex`` without needing the other items."""
+    return root_from_proof(item, proof).hex() == root_hex
@@ -1,22 +1,46 @@
 from cryptography.hazmat.primitives import serialization, hashes
-from cryptography.hazmat.primitives.asymmetric import ed25519
 import json
-from typing import Dict # Import Dict
-
-# Generate Ed25519 key pair
-private_key = ed25519.Ed25519PrivateKey.generate()
-public_key = private_key.public_key()
+from typing import Dict, List # Import Dict
+import base64
+from cirisnode.utils.keys import get_signing_key
+from cirisnode.utils.merkle import MerkleTree, verify_proof
 
 def sign_data(data: Dict) -> bytes:
-    """Sign the given data using the Ed25519 private key."""
+    """Sign the given data using the node's Ed25519 private key."""
     message = json.dumps(data, sort_keys=True).encode()
-    signature = private_key.sign(message)
+    signature = get_signing_key().sign(message)
     return signature
 
 def get_public_key_pem() -> str:
     """Return the Ed25519 public key in PEM format."""
-    pem = public_key.public_bytes(
+    pem = get_signing_key().public_key().public_bytes(
         encoding=serialization.Encoding.PEM,
         format=serialization.PublicFormat.SubjectPublicKeyInfo
     )
     return pem.decode()
+
+def sign_batch(items: List[Dict], header: Dict) -> Dict:
+    """
+    Sign a batch of results with one signature over their Merkle root.
+
+    Returns the attestation (``header`` plus ``merkle_root`` and ``leaf_count``),
+    its base64 signature and one inclusion proof per item, in item order. Only
+    the small attestation is signed, so the signature cost is the same for ten
+    results or ten thousand.
+    """
+    tree = MerkleTree(items)
+    attestation = {**header, "merkle_root": tree.root.hex(), "leaf_count": len(tree)}
+    return {
+        "attestation": attestation,
+        "signature": base64.b64encode(sign_data(attestation)).decode(),
+        "proofs": [tree.proof(i) for i in range(len(tree))],
+    }
+
+def verify_signed_item(item: Dict, proof: List[Dict], attestation: Dict, signature: str, key=None) -> bool:
+    """Verify one result against a signed attestation using only its own proof."""
+    key = key or get_signing_key().public_key()
+    try:
+        key.verify(base64.b64decode(signature), json.dumps(attestation, sort_keys=True).encode())
+    except Exception:
+        return False
+    return verify_proof(item, proof, attestation["merkle_root"])
@@ -0,0 +1,27 @@
+from cirisnode.celery_app import celery_app
+
+# Run Celery tasks (and chords) in-process so job endpoints work without a broker.
+celery_app.conf.update(
+    broker_url="memory://",
+    result_backend="cache+memory://",
+    task_always_eager=True,
+    task_store_eager_result=True,
+)
+
+import os
+import tempfile
+
+from cirisnode.config import settings
+
+# Keep the LLM response cache in memory only so tests never share a cache file.
+settings.LLM_CACHE_PATH = ""
+
+# Node keys are generated on first use; keep them out of the source tree.
+_key_dir = tempfile.mkdtemp(prefix="cirisnode-keys-")
+settings.SIGNING_KEY_PATH = os.path.join(_key_dir, "signing_key.pem")
+settings.ENCRYPTION_KEY_PATH = os.path.join(_key_dir, "fernet.keys")
+
+# Tables come from the versioned migrations, as on a deployed node.
+from cirisnode.db.init_db import initialize_database
+
+initialize_database()
@@ -0,0 +1,72 @@
+import asyncio
+
+import httpx
+
+from cirisnode.llm.affinity import ModelAffinityGate
+from cirisnode.llm.ollama_pool import OllamaPool
+
+
+async def _run_interleaved(gate, models, log, hold=0.005):
+    async def one(model):
+        async with gate.slot(model):
+            log.append(model)
+            await asyncio.sleep(hold)
+
+    await asyncio.gather(*(one(m) for m in models))
+
+
+async def test_interleaved_models_run_in_batches():
+    gate = ModelAffinityGate()
+    log = []
+    await _run_interleaved(gate, ["a", "b"] * 10, log)
+    assert log == ["a"] * 10 + ["b"] * 10
+    assert gate.switches == 1 and gate.in_flight == 0
+
+
+async def test_waiting_model_gets_a_turn_after_max_batch():
+    gate = ModelAffinityGate(max_batch=3)
+    log = []
+    await _run_interleaved(gate, ["a", "b", "b"] + ["a"] * 6, log)
+    assert log == ["a"] * 3 + ["b"] * 2 + ["a"] * 4
+
+
+async def test_cancelled_waiter_does_not_block_others():
+    gate = ModelAffinityGate()
+    release = asyncio.Event()
+
+    async def hold_a():
+        async with gate.slot("a"):
+            await release.wait()
+
+    holder = asyncio.ensure_future(hold_a())
+    await asyncio.sleep(0)
+    waiter_b = asyncio.ensure_future(gate.slot("b").__aenter__())
+    await asyncio.sleep(0)
+    waiter_b.cancel()
+    release.set()
+    await holder
+
+    async with gate.slot("c"):
+        assert gate.active == "c"
+
+
+def test_pick_prefers_endpoint_with_model_resident():
+    pool = OllamaPool(["http://a", "http://b"], swap_penalty=4)
+    a, b = pool.endpoints
+    b.resident = {"llama3:latest"}
+    a.outstanding, b.outstanding = 1, 3
+    assert pool.pick("llama3") is b
+    b.outstanding = 6
+    assert pool.pick("llama3") is a
+
+
+async def test_refresh_reads_resident_models():
+    def handler(request):
+        if request.url.path == "/api/ps":
+            return httpx.Response(200, json={"models": [{"name": "phi3:latest"}]})
+        return httpx.Response(200, json={"models": [{"name": "phi3:latest"}, {"name": "llama3:latest"}]})
+
+    pool = OllamaPool(["http://a"])
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        await pool.refresh_models(client, pool.endpoints[0])
+    assert pool.endpoints[0].is_resident("phi3") and not pool.endpoints[0].is_resident("llama3")
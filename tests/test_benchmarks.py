@@ -1,5 +1,13 @@
+from uuid import uuid4
+
+import httpx
+import pytest
 from fastapi.testclient import TestClient
 from cirisnode.main import app
+from cirisnode.api.benchmarks import runner
+from cirisnode.dao.job_dao import JobDAO
+from cirisnode.database import db_connection
+from cirisnode.utils.signer import verify_signed_item
 import jwt
 
 client = TestClient(app)
@@ -9,23 +17,35 @@ def get_auth_header():
     token = jwt.encode({"sub": "testuser"}, TEST_SECRET, algorithm="HS256")
     return {"Authorization": f"Bearer {token}"}
 
+@pytest.fixture(autouse=True)
+def fake_llm(monkeypatch):
+    async def fake_generate(provider, model, prompt, **kwargs):
+        return "B"
+    monkeypatch.setattr(runner, "generate", fake_generate)
+
 def test_run_benchmark():
     headers = get_auth_header()
     response = client.post(
         "/api/v1/benchmarks/run",
-        json={"scenario_id": "HE-300-1"},
+        json={"provider": "ollama", "model": "llama3"},
         headers=headers
     )
     assert response.status_code == 200
     data = response.json()
     assert "job_id" in data
+    assert data["shards"] >= 1
+
+def test_run_benchmark_requires_model():
+    headers = get_auth_header()
+    response = client.post("/api/v1/benchmarks/run", json={"provider": "ollama"}, headers=headers)
+    assert response.status_code == 400
 
 def test_get_benchmark_results():
     headers = get_auth_header()
     # First, run a benchmark to get a job_id
     run_response = client.post(
         "/api/v1/benchmarks/run",
-        json={"scenario_id": "HE-300-1"},
+        json={"provider": "ollama", "model": "llama3"},
         headers=headers
     )
     job_id = run_response.json()["job_id"]
@@ -37,9 +57,29 @@ def test_get_benchmark_results():
     assert "result" in data
     assert "signature" in data["result"]
 
+def test_benchmark_results_aggregate_shards():
+    headers = get_auth_header()
+    run_response = client.post(
+        "/api/v1/simplebench/run",
+        json={"provider": "ollama", "model": "llama3", "scenario_ids": ["1", "2", "3", "4", "5"], "shard_size": 2},
+        headers=headers
+    )
+    assert run_response.json()["shards"] == 3
+    job_id = run_response.json()["job_id"]
+
+    result = client.get(f"/api/v1/simplebench/results/{job_id}", headers=headers).json()["result"]
+    assert [s["shard"] for s in result["shards"]] == [0, 1, 2]
+    assert result["total"] == 5
+    assert [r["scenario_id"] for r in result["results"]] == ["1", "2", "3", "4", "5"]
+    assert result["passed"] == sum(1 for r in result["results"] if r["passed"])
+
 def test_run_simplebench():
     headers = get_auth_header()
-    response = client.post("/api/v1/simplebench/run", headers=headers)
+    response = client.post(
+        "/api/v1/simplebench/run",
+        json={"provider": "ollama", "model": "llama3"},
+        headers=headers
+    )
     assert response.status_code == 200
     data = response.json()
     assert "job_id" in data
@@ -47,7 +87,11 @@ def test_run_simplebench():
 def test_get_simplebench_results():
     headers = get_auth_header()
     # First, run simplebench to get a job_id
-    run_response = client.post("/api/v1/simplebench/run", headers=headers)
+    run_response = client.post(
+        "/api/v1/simplebench/run",
+        json={"provider": "ollama", "model": "llama3"},
+        headers=headers
+    )
     job_id = run_response.json()["job_id"]
     
     # Then, get the results
@@ -56,3 +100,70 @@ def test_get_simplebench_results():
     data = results_response.json()
     assert "id" in data
     assert data["id"] == "SimpleBench"
+    assert data["status"] == "completed"
+
+def test_benchmark_job_is_persisted_with_progress():
+    headers = get_auth_header()
+    job_id = client.post(
+        "/api/v1/simplebench/run",
+        json={"provider": "ollama", "model": "llama3", "scenario_ids": ["1", "2", "3"], "shard_size": 1},
+        headers=headers
+    ).json()["job_id"]
+
+    # A fresh DAO (as another API worker would use) sees the stored job.
+    with db_connection() as conn:
+        job = JobDAO(conn).get_job(job_id)
+    assert job["status"] == "completed"
+    assert (job["completed"], job["total"]) == (3, 3)
+    assert (job["shards_done"], job["shards_total"]) == (3, 3)
+    result = job["results_json"]
+    assert result["signature"] and result["attestation"]["leaf_count"] == 3
+    # Any single result verifies on its own against the signed root.
+    item = {k: v for k, v in result["results"][1].items() if k != "proof"}
+    assert verify_signed_item(item, result["results"][1]["proof"], result["attestation"], result["signature"])
+
+    listing = client.get("/api/v1/benchmarks/jobs?status=completed&type=simplebench", headers=headers).json()
+    assert job_id in [j["id"] for j in listing["jobs"]]
+
+def test_failed_shard_marks_job_failed(monkeypatch):
+    async def broken_generate(provider, model, prompt, **kwargs):
+        raise httpx.ConnectError("ollama down")
+    monkeypatch.setattr(runner, "generate", broken_generate)
+    with pytest.raises(httpx.ConnectError):
+        # Eager mode re-raises the shard error in-process; a real worker would not.
+        client.post(
+            "/api/v1/simplebench/run",
+            json={"provider": "ollama", "model": "llama3", "scenario_ids": ["1"]},
+            headers=get_auth_header()
+        )
+    with db_connection() as conn:
+        jobs = JobDAO(conn).list_jobs(status="failed", job_type="simplebench")
+    assert any("ollama down" in (j["error"] or "") for j in jobs)
+
+def test_unknown_job_returns_404():
+    assert client.get("/api/v1/benchmarks/results/does-not-exist").status_code == 404
+
+def test_api_key_is_sealed_in_shard_args(monkeypatch):
+    from cirisnode import celery_tasks
+    sent = []
+    monkeypatch.setattr(celery_tasks, "chord", lambda header: sent.extend(header) or (lambda callback: None))
+    celery_tasks.enqueue_benchmark_job(
+        f"sealed-{uuid4()}", "simplebench", [{"question_id": "1"}], "openai", "gpt-4o", api_key="sk-secret"
+    )
+    sealed = sent[0].args[5]
+    assert "sk-secret" not in repr(sent[0].args) and "sk-secret" not in repr(sent[0].kwargs)
+    assert celery_tasks.open_api_key(sealed) == "sk-secret"
+
+def test_expired_api_key_fails_the_job():
+    import time
+    from cryptography.fernet import InvalidToken
+    from cirisnode import celery_tasks
+    from cirisnode.utils.keys import get_cipher
+    job_id = f"stale-{uuid4()}"
+    stale = get_cipher().encrypt_at_time(b"sk-secret", int(time.time()) - 7 * 3600).decode()
+    with db_connection() as conn:
+        JobDAO(conn).create_job(job_id, "simplebench", "openai", "gpt-4o", 1, 1)
+    with pytest.raises(InvalidToken):
+        celery_tasks.run_simplebench_task.run(job_id, 0, [], "openai", "gpt-4o", stale)
+    with db_connection() as conn:
+        assert "expired" in JobDAO(conn).get_job(job_id)["error"]
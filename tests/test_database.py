@@ -0,0 +1,87 @@
+import sqlite3
+import threading
+
+import pytest
+
+from cirisnode.database import ConnectionPool
+
+
+def test_connections_are_tuned_once_and_reused(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.db"), size=2)
+    with pool.connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        first = conn
+    with pool.connection() as conn:
+        assert conn is first
+        assert conn.execute("SELECT count(*) FROM t").fetchone()[0] == 0
+    assert pool.stats()["open"] == 1 and pool.stats()["in_use"] == 0
+
+
+def test_failed_request_rolls_back_and_returns_the_connection(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.db"), size=1)
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+    with pytest.raises(RuntimeError):
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO t VALUES (1)")
+            raise RuntimeError("handler failed")
+    with pool.connection() as conn:
+        assert conn.execute("SELECT count(*) FROM t").fetchone()[0] == 0
+
+    # A handler that closes its connection gets it replaced rather than reused.
+    with pytest.raises(sqlite3.ProgrammingError):
+        with pool.connection() as conn:
+            conn.close()
+    with pool.connection() as conn:
+        assert conn.execute("SELECT 1").fetchone() == (1,)
+
+
+def test_exhausted_pool_waits_and_records_it(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.db"), size=1, timeout=5)
+    held = pool.acquire()
+    released = threading.Timer(0.05, pool.release, args=(held,))
+    released.start()
+    with pool.connection() as conn:
+        assert conn is held
+    stats = pool.stats()
+    assert stats["waited"] == 1 and stats["wait_seconds_max"] >= 0.04
+
+    blocker = pool.acquire()
+    pool.timeout = 0.01
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+    pool.release(blocker)
+
+
+async def test_async_queries_leave_the_event_loop_free(tmp_path, monkeypatch):
+    import asyncio
+    import time
+
+    from cirisnode import database
+
+    monkeypatch.setattr(database, "DATABASE_PATH", str(tmp_path / "async.db"))
+    async with database.async_db_connection() as db:
+        db.raw.create_function("slow", 1, lambda s: time.sleep(s) or 1)
+        await db.execute("CREATE TABLE t (x INTEGER)")
+        await db.executemany("INSERT INTO t VALUES (?)", [(1,), (2,)])
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.ensure_future(ticker())
+        cur = await db.execute("SELECT slow(0.2)")
+        assert await cur.fetchone() == (1,)
+        task.cancel()
+        assert ticks >= 5
+        count = await db.run(lambda conn, table: conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0], "t")
+        assert count == 2
+    assert database.pool_stats()["in_use"] == 0
+    database.get_pool().close()
@@ -0,0 +1,34 @@
+from fastapi.testclient import TestClient
+
+from cirisnode.main import app
+from cirisnode.utils import cache
+from cirisnode.utils.data_loaders import BenchmarkDataset, load_simplebench_data
+
+
+def test_simplebench_dataset_is_indexed_by_question_id():
+    dataset = cache.get_simplebench_dataset()
+    assert len(dataset) == 10
+    assert dataset.get(3)["question_id"] == 3
+    assert dataset.get("3") is dataset.get(3)
+    assert dataset.get("999") is None
+
+
+def test_dataset_is_loaded_once():
+    assert cache.get_dataset("simplebench") is cache.get_dataset("simplebench")
+
+
+def test_select_keeps_request_order_and_skips_unknown_ids():
+    dataset = BenchmarkDataset("demo", [{"id": i, "prompt": str(i)} for i in range(5)], "id")
+    selected = dataset.select(["3", 1, "missing", "3"])
+    assert [s["id"] for s in selected] == [3, 1]
+
+
+def test_content_shape_matches_dataset():
+    content = load_simplebench_data(cache.get_simplebench_dataset())
+    assert content[0] == {"id": "SB-1", "prompt": cache.get_simplebench_dataset().get(1)["prompt"]}
+
+
+def test_lifespan_preloads_datasets():
+    cache.get_simplebench_dataset.cache_clear()
+    with TestClient(app):
+        assert cache.get_simplebench_dataset.cache_info().currsize == 1
@@ -0,0 +1,104 @@
+import csv
+import os
+
+from cirisnode.utils import data_loaders
+from cirisnode.utils.ethics_store import EthicsCorpus, open_ethics_corpus
+
+
+def _write_csv(path, header, rows):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        if header:
+            writer.writerow(header)
+        writer.writerows(rows)
+
+
+def _ethics_tree(root):
+    _write_csv(
+        os.path.join(root, "ethics", "commonsense", "cm_test.csv"),
+        ["label", "input", "is_short", "edited"],
+        [[0, "I helped my neighbour.", True, False], [1, "I took the café's tip jar.", True, False]],
+    )
+    _write_csv(
+        os.path.join(root, "ethics", "virtue", "virtue_test.csv"),
+        ["label", "scenario"],
+        [[1, "She gave away her lunch. [SEP] generous"]],
+    )
+    _write_csv(
+        os.path.join(root, "ethics", "utilitarianism", "util_test.csv"),
+        None,
+        [["I won a prize.", "I lost my keys."], ["I ate cake.", "I missed the bus."]],
+    )
+    return str(root)
+
+
+def test_cache_round_trip(tmp_path):
+    corpus = open_ethics_corpus(_ethics_tree(tmp_path / "src"), str(tmp_path / "cache"))
+    assert len(corpus) == 5
+    assert corpus.category_names == ["commonsense", "utilitarianism", "virtue"]
+    assert corpus.labels.tolist() == [0, 1, 0, 1, 1]
+
+    tip_jar = corpus.get("HE-commonsense-1")
+    assert "café" in tip_jar["prompt"]
+    assert tip_jar["answer"] == "B" and tip_jar["category"] == "commonsense"
+    assert '"generous"' in corpus.get("HE-virtue-0")["prompt"]
+    # Utilitarianism pairs alternate which side is the more pleasant one.
+    assert corpus.get("HE-utilitarianism-1")["prompt"].startswith("Scenario A: I missed the bus.")
+    assert corpus.get("HE-virtue-1") is None and corpus.get("SB-1") is None
+    assert [s["id"] for s in corpus.select(["HE-virtue-0", "nope", "HE-commonsense-0", "HE-virtue-0"])] == [
+        "HE-virtue-0", "HE-commonsense-0",
+    ]
+    assert [s["id"] for s in corpus.scenarios[-2:]] == ["HE-utilitarianism-1", "HE-virtue-0"]
+
+
+def test_cache_is_reused_until_sources_change(tmp_path):
+    source = _ethics_tree(tmp_path / "src")
+    cache_dir = str(tmp_path / "cache")
+    open_ethics_corpus(source, cache_dir)
+    built_at = os.stat(os.path.join(cache_dir, "meta.json")).st_mtime_ns
+
+    assert len(open_ethics_corpus(source, cache_dir)) == 5
+    assert os.stat(os.path.join(cache_dir, "meta.json")).st_mtime_ns == built_at
+
+    _write_csv(
+        os.path.join(source, "ethics", "justice", "justice_test.csv"),
+        ["label", "scenario"],
+        [[1, "I deserve a raise because I worked overtime."]],
+    )
+    corpus = open_ethics_corpus(source, cache_dir)
+    assert len(corpus) == 6 and "justice" in corpus.category_names
+    assert isinstance(EthicsCorpus(cache_dir).get("HE-justice-0"), dict)
+
+
+def _open_and_count(source, cache_dir):
+    return len(open_ethics_corpus(source, cache_dir))
+
+
+def test_concurrent_workers_build_a_cold_cache_once(tmp_path, monkeypatch):
+    import multiprocessing
+
+    from cirisnode.utils import ethics_store
+
+    source = _ethics_tree(tmp_path / "src")
+    cache_dir = str(tmp_path / "cache")
+    builds = tmp_path / "builds.log"
+    build = ethics_store.build_ethics_cache
+
+    def counting_build(root, directory):
+        with open(builds, "a") as f:
+            f.write(f"{os.getpid()}\n")
+        build(root, directory)
+
+    monkeypatch.setattr(ethics_store, "build_ethics_cache", counting_build)
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        sizes = pool.starmap(_open_and_count, [(source, cache_dir)] * 8)
+    assert sizes == [5] * 8
+    assert len(builds.read_text().split()) == 1
+
+
+def test_missing_dataset_falls_back(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loaders.settings, "HE300_DATA_PATH", str(tmp_path / "absent"))
+    dataset = data_loaders.load_he300_dataset()
+    assert [s["id"] for s in dataset.scenarios] == ["HE-300-FB-1", "HE-300-FB-2"]
+    assert data_loaders.load_he300_data(dataset, limit=1) == [data_loaders.HE300_FALLBACK[0]]
@@ -0,0 +1,131 @@
+import csv
+import os
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from cirisnode.api.he300 import routes as he300_routes
+from cirisnode.api.he300 import sampling
+from cirisnode.main import app
+from cirisnode.utils.ethics_store import open_ethics_corpus
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    sizes = {"commonsense": 200, "justice": 120, "virtue": 30}
+    for category, size in sizes.items():
+        path = tmp_path / "ethics" / category / {"commonsense": "cm_test.csv"}.get(category, f"{category}_test.csv")
+        os.makedirs(path.parent)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["label", "input" if category == "commonsense" else "scenario"])
+            writer.writerows([[i % 2, f"{category} item {i} [SEP] kind"] for i in range(size)])
+    corpus = open_ethics_corpus(str(tmp_path), str(tmp_path / "cache"))
+    monkeypatch.setattr(sampling, "get_he300_dataset", lambda: corpus)
+    monkeypatch.setattr(he300_routes, "get_he300_dataset", lambda: corpus)
+    sampling.get_he300_sample.cache_clear()
+    yield corpus
+    sampling.get_he300_sample.cache_clear()
+
+
+def test_stratified_pages_are_deterministic_and_balanced():
+    categories = np.repeat(np.arange(3), [200, 120, 30])
+    pages = sampling.stratified_pages(categories, 6, 50, seed=7)
+    again = sampling.stratified_pages(categories, 6, 50, seed=7)
+    assert all(np.array_equal(a, b) for a, b in zip(pages, again))
+    assert [len(p) for p in pages] == [50] * 6
+
+    drawn = np.concatenate(pages)
+    assert len(np.unique(drawn)) == 300
+    # Categories too small for an even share are taken whole; the rest fills the draw.
+    assert np.bincount(categories[drawn]).tolist() == [150, 120, 30]
+    assert {np.count_nonzero(categories[p] == 2) for p in pages} == {5}
+
+
+def test_start_returns_six_stable_ids(corpus):
+    first = client.post("/api/v1/he300").json()
+    assert len(first["benchmark_ids"]) == 6
+    assert client.post("/api/v1/he300", json={"seed": first["seed"]}).json() == first
+    assert client.post("/api/v1/he300", json={"seed": 1}).json()["benchmark_ids"] != first["benchmark_ids"]
+    assert client.post("/api/v1/he300", json={"seed": "x"}).status_code == 400
+
+
+def test_prompt_pages_partition_the_sample(corpus):
+    ids = client.post("/api/v1/he300", json={"seed": 11}).json()["benchmark_ids"]
+    seen = set()
+    for benchmark_id in ids:
+        response = client.get(
+            "/api/v1/bench/he300/prompts",
+            params={"benchmark_id": benchmark_id, "model_id": "m", "agent_id": "a"},
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["agent_id"] == "a" and len(body["prompts"]) == 50
+        assert set(body["prompts"][0]) == {"id", "prompt", "category"}
+        seen.update(p["id"] for p in body["prompts"])
+    assert len(seen) == 300
+    again = client.get("/api/v1/bench/he300/prompts", params={"benchmark_id": ids[0]}).json()
+    assert [p["id"] for p in again["prompts"]] == [
+        corpus.scenario_id(int(i)) for i in sampling.get_he300_sample(11).indices(ids[0])
+    ]
+
+
+def test_unknown_benchmark_id_is_404(corpus):
+    assert client.get("/api/v1/bench/he300/prompts", params={"benchmark_id": "he300-11-7"}).status_code == 404
+    assert client.get("/api/v1/bench/he300/prompts", params={"benchmark_id": "bogus"}).status_code == 404
+
+
+def test_score_answers_per_category_with_intervals():
+    from cirisnode.api.he300.scoring import answer_codes, score_answers
+
+    assert answer_codes(["A", " b.", "(B)", "maybe", ""]).tolist() == [0, 1, 1, -1, -1]
+    score = score_answers(
+        ["x1", "x2", "x3", "x4"],
+        np.array([0, 1, 1, 0]),
+        np.array([0, 0, 1, 1]),
+        ["commonsense", "justice", "virtue"],
+        ["x3", "x1", "x2", "nope", "x2"],
+        ["B", "A", "A", "A", "B"],
+    )
+    assert score["correct"] == 3 and score["total"] == 4 and score["answered"] == 3
+    assert score["unknown_ids"] == 1 and score["accuracy"] == 0.75
+    assert set(score["categories"]) == {"commonsense", "justice"}
+    assert score["categories"]["commonsense"]["accuracy"] == 1.0
+    low, high = score["ci95"]
+    assert 0 < low < 0.75 < high <= 1
+
+
+def test_upload_answers_scores_the_page(corpus):
+    benchmark_id = client.post("/api/v1/he300", json={"seed": 5}).json()["benchmark_ids"][0]
+    prompts = client.get("/api/v1/bench/he300/prompts", params={"benchmark_id": benchmark_id}).json()["prompts"]
+    answers = [{"id": p["id"], "answer": corpus.get(p["id"])["answer"]} for p in prompts[:40]]
+    response = client.put(
+        "/api/v1/bench/he300/answers",
+        json={"benchmark_id": benchmark_id, "model_id": "m", "agent_id": "a", "answers": answers},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["correct"] == 40 and body["total"] == 50 and body["accuracy"] == 0.8
+    assert sum(c["total"] for c in body["categories"].values()) == 50
+
+
+def test_benchmark_runs_default_to_the_seeded_sample(corpus, monkeypatch):
+    from fastapi import HTTPException
+    from cirisnode.api.benchmarks import routes as benchmark_routes
+    from cirisnode.utils import cache
+
+    monkeypatch.setattr(cache, "get_he300_dataset", lambda: corpus)
+    sample = sampling.get_he300_sample(benchmark_routes.settings.HE300_SEED)
+    scenarios = benchmark_routes._select_scenarios("he300", {})
+    assert len(corpus) == 350 and len(scenarios) == 300
+    assert [s["id"] for s in scenarios] == [
+        corpus.scenario_id(int(i)) for bid in sample.benchmark_ids for i in sample.indices(bid)
+    ]
+
+    too_many = [f"HE-commonsense-{i}" for i in range(benchmark_routes.settings.BENCHMARK_MAX_SCENARIOS + 1)]
+    with pytest.raises(HTTPException) as rejected:
+        benchmark_routes._select_scenarios("he300", {"scenario_ids": too_many})
+    assert rejected.value.status_code == 400
@@ -0,0 +1,32 @@
+from fastapi import Depends
+from fastapi.testclient import TestClient
+
+from cirisnode.llm import client as llm_client
+from cirisnode.main import app
+
+
+def test_create_http_client_is_pooled():
+    client = llm_client.create_http_client()
+    pool = client._transport._pool
+    assert pool._max_connections == llm_client.settings.HTTP_MAX_CONNECTIONS
+    assert pool._http2 is llm_client.settings.HTTP2_ENABLED
+    assert client.timeout.connect == llm_client.settings.HTTP_CONNECT_TIMEOUT
+
+
+def test_lifespan_shares_one_client_and_closes_it():
+    seen = []
+
+    @app.get("/_test/upstream-client")
+    def upstream(client=Depends(llm_client.get_upstream_client)):
+        seen.append(client)
+        return {}
+
+    try:
+        with TestClient(app) as test_client:
+            test_client.get("/_test/upstream-client")
+            test_client.get("/_test/upstream-client")
+            assert seen[0] is seen[1] is app.state.http_client
+            assert llm_client.get_http_client() is app.state.http_client
+        assert seen[0].is_closed
+    finally:
+        app.router.routes = [r for r in app.router.routes if getattr(r, "path", "") != "/_test/upstream-client"]
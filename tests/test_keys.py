@@ -0,0 +1,90 @@
+import base64
+
+import pytest
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+from cirisnode.utils import keys
+from cirisnode.utils.encryption import decrypt_data, encrypt_data
+from cirisnode.utils.signer import sign_data
+
+
+@pytest.fixture
+def key_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(keys.settings, "SIGNING_KEY", "")
+    monkeypatch.setattr(keys.settings, "ENCRYPTION_KEYS", "")
+    monkeypatch.setattr(keys.settings, "SIGNING_KEY_PATH", str(tmp_path / "signing_key.pem"))
+    monkeypatch.setattr(keys.settings, "ENCRYPTION_KEY_PATH", str(tmp_path / "fernet.keys"))
+    keys.reload_keys()
+    yield tmp_path
+    keys.reload_keys()
+
+
+def test_signing_key_survives_a_restart(key_files):
+    signature = sign_data({"a": 1})
+    assert keys.get_signing_key() is keys.get_signing_key()
+    keys.reload_keys()  # as a fresh worker process would
+    keys.get_signing_key().public_key().verify(signature, b'{"a": 1}')
+    assert (key_files / "signing_key.pem").stat().st_mode & 0o077 == 0
+
+
+def test_signing_key_from_env(key_files, monkeypatch):
+    raw = ed25519.Ed25519PrivateKey.generate().private_bytes(
+        serialization.Encoding.Raw, serialization.PrivateFormat.Raw, serialization.NoEncryption()
+    )
+    monkeypatch.setattr(keys.settings, "SIGNING_KEY", base64.b64encode(raw).decode())
+    keys.reload_keys()
+    assert keys.get_signing_key().private_bytes(
+        serialization.Encoding.Raw, serialization.PrivateFormat.Raw, serialization.NoEncryption()
+    ) == raw
+    assert not (key_files / "signing_key.pem").exists()
+
+
+def test_encrypted_data_decrypts_after_rotation(key_files):
+    token = encrypt_data("wbd payload")
+    keys.reload_keys()
+    assert decrypt_data(token) == "wbd payload"
+
+    new_key = keys.rotate_encryption_key()
+    assert keys.encryption_keys()[0] == new_key and len(keys.encryption_keys()) == 2
+    assert decrypt_data(token) == "wbd payload"
+    assert Fernet(new_key).decrypt(encrypt_data("fresh").encode()) == b"fresh"
+
+
+def test_env_keys_take_precedence(key_files, monkeypatch):
+    old, new = Fernet.generate_key(), Fernet.generate_key()
+    token = Fernet(old).encrypt(b"legacy").decode()
+    monkeypatch.setattr(keys.settings, "ENCRYPTION_KEYS", f"{new.decode()}, {old.decode()}")
+    keys.reload_keys()
+    assert decrypt_data(token) == "legacy"
+    with pytest.raises(InvalidToken):
+        Fernet(old).decrypt(encrypt_data("x").encode())
+    with pytest.raises(RuntimeError):
+        keys.rotate_encryption_key()
+
+
+def _public_key_of_generated_signing_key(_):
+    keys.reload_keys()
+    return keys.get_signing_key().public_key().public_bytes(
+        serialization.Encoding.Raw, serialization.PublicFormat.Raw
+    )
+
+
+def test_racing_workers_share_one_generated_key(key_files):
+    import multiprocessing
+
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        public_keys = pool.map(_public_key_of_generated_signing_key, range(8))
+    assert len(set(public_keys)) == 1
+    assert [p.name for p in key_files.iterdir()] == ["signing_key.pem"]
+
+
+def test_readers_wait_out_an_empty_key_file(key_files):
+    import threading
+
+    path = key_files / "fernet.keys"
+    path.write_bytes(b"")
+    key = Fernet.generate_key()
+    threading.Timer(0.1, path.write_bytes, [key + b"\n"]).start()
+    assert keys.encryption_keys() == [key]
@@ -1 +1,57 @@
-# Removed: Matrix integration is not present in the current codebase.
+import hashlib
+import json
+import threading
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from cirisnode.dao.job_dao import JobDAO
+from cirisnode.database import db_connection
+from cirisnode.jobs import scheduler
+from cirisnode.matrix import bot
+from cirisnode.utils.merkle import MerkleTree
+
+
+def _completed_job(root: str) -> str:
+    job_id = str(uuid4())
+    with db_connection() as conn:
+        dao = JobDAO(conn)
+        dao.create_job(job_id, "simplebench", "ollama", "llama3", 1, 1)
+        dao.complete_job(job_id, {"attestation": {"merkle_root": root}})
+    return job_id
+
+
+def test_daily_merkle_root_covers_jobs_completed_since():
+    since = datetime.utcnow().isoformat()
+    roots = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(3)]
+    job_ids = [_completed_job(root) for root in roots]
+
+    run_ids, root = scheduler.daily_merkle_root(since)
+    assert run_ids == job_ids
+    assert root == MerkleTree(leaves=[bytes.fromhex(r) for r in roots]).root.hex()
+
+    later = (datetime.utcnow() + timedelta(seconds=1)).isoformat()
+    assert scheduler.daily_merkle_root(later) == ([], MerkleTree(leaves=[]).root.hex())
+
+
+async def test_daily_audit_task_publishes_the_root(monkeypatch):
+    threads = []
+    monkeypatch.setattr(
+        scheduler,
+        "daily_merkle_root",
+        lambda since: threads.append(threading.current_thread()) or (["job-1"], "ab" * 32),
+    )
+    monkeypatch.setattr(bot.settings, "matrix_logging_enabled", "")
+    sent = []
+
+    async def send(run_ids, merkle_root=None):
+        sent.append(await bot.send_audit_root(run_ids, merkle_root=merkle_root))
+        return sent[-1]
+
+    monkeypatch.setattr(scheduler, "send_audit_root", send)
+    await scheduler.daily_audit_task()
+
+    assert threads and threading.main_thread() not in threads
+    message = sent[0]
+    assert (message["run_ids"], message["merkle_root"]) == (["job-1"], "ab" * 32)
+    body = {k: v for k, v in message.items() if k not in ("sha256", "signature")}
+    assert message["sha256"] == hashlib.sha256(json.dumps(body, sort_keys=True).encode()).hexdigest()
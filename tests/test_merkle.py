@@ -0,0 +1,29 @@
+import pytest
+
+from cirisnode.utils.merkle import MerkleTree, verify_proof
+from cirisnode.utils.signer import sign_batch, verify_signed_item
+
+ITEMS = [{"scenario_id": str(i), "passed": i % 2 == 0} for i in range(7)]
+
+
+@pytest.mark.parametrize("count", [1, 2, 5, 7])
+def test_every_item_verifies_against_the_root(count):
+    tree = MerkleTree(ITEMS[:count])
+    for index, item in enumerate(ITEMS[:count]):
+        assert verify_proof(item, tree.proof(index), tree.root.hex())
+
+
+def test_tampered_item_fails():
+    tree = MerkleTree(ITEMS)
+    forged = {**ITEMS[3], "passed": not ITEMS[3]["passed"]}
+    assert not verify_proof(forged, tree.proof(3), tree.root.hex())
+    assert not verify_proof(ITEMS[3], tree.proof(4), tree.root.hex())
+
+
+def test_sign_batch_signs_the_root_once():
+    signed = sign_batch(ITEMS, {"job_id": "j1"})
+    attestation = signed["attestation"]
+    assert attestation["leaf_count"] == 7 and attestation["job_id"] == "j1"
+    assert len(signed["proofs"]) == 7
+    assert verify_signed_item(ITEMS[5], signed["proofs"][5], attestation, signed["signature"])
+    assert not verify_signed_item(ITEMS[5], signed["proofs"][5], {**attestation, "job_id": "j2"}, signed["signature"])
@@ -0,0 +1,95 @@
+import sqlite3
+from contextlib import nullcontext
+
+import pytest
+
+from cirisnode.db import migrate_to_postgres
+from cirisnode.db.migrate_to_postgres import (
+    Migration,
+    copy_batches,
+    iter_chunks,
+    migrate_sqlite_to_postgres,
+    sqlite_columns,
+    sqlite_tables,
+)
+from cirisnode.db.migrations import migrate
+from cirisnode.utils.audit import write_audit_log
+from tests.test_postgres_backend import PostgresDouble
+
+
+def _source(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "node.db"))
+    conn.execute("CREATE TABLE agent_events (id TEXT PRIMARY KEY, agent_uid TEXT, event_json TEXT)")
+    conn.executemany(
+        "INSERT INTO agent_events VALUES (?, ?, ?)", [(f"e{i}", "a", "{}") for i in range(7)]
+    )
+    conn.execute("DELETE FROM agent_events WHERE id = 'e3'")
+    conn.commit()
+    return conn
+
+
+def test_chunks_follow_rowids_and_resume_past_the_mark(tmp_path):
+    conn = _source(tmp_path)
+    assert sqlite_tables(conn) == ["agent_events"]
+    assert sqlite_columns(conn, "agent_events") == ["id", "agent_uid", "event_json"]
+
+    # Rowids start at 1 and skip the deleted row, so checkpoints are rowids rather than row counts.
+    chunks = list(iter_chunks(conn, "agent_events", ["id"], 0, 2))
+    assert [(mark, [r[0] for r in rows]) for mark, rows in chunks] == [
+        (2, ["e0", "e1"]), (5, ["e2", "e4"]), (7, ["e5", "e6"]),
+    ]
+    # A run that stopped after the first checkpoint continues with the next row.
+    assert [r[0] for _, rows in iter_chunks(conn, "agent_events", ["id"], 3, 100) for r in rows] == ["e4", "e5", "e6"]
+
+
+def test_rows_the_app_wrote_get_valid_ids(tmp_path):
+    # A node database as the app creates and fills it: SERIAL ids in SQLite are not rowid aliases, so they are NULL.
+    conn = sqlite3.connect(str(tmp_path / "node.db"))
+    migrate(conn)
+    write_audit_log(conn, actor="alice", event_type="login", payload={"n": 1})
+    conn.execute("INSERT INTO audit_logs (id, actor, event_type) VALUES (7, 'bob', 'imported')")
+    write_audit_log(conn, actor="carol", event_type="login")
+    conn.execute("INSERT INTO users (username, password, role) VALUES ('alice', 'x', 'anonymous')")
+    conn.execute("INSERT INTO wbd_tasks (agent_task_id, status) VALUES ('agent-1', 'open')")
+    conn.commit()
+
+    columns = sqlite_columns(conn, "audit_logs")
+    (_, rows), = iter_chunks(conn, "audit_logs", columns, 0, 100)
+    assert [row[columns.index("id")] for row in rows] == [None, 7, None]
+    (with_id, imported), (without_id, written) = copy_batches(columns, rows, serial_id=True)
+    assert with_id == columns and [row[with_id.index("actor")] for row in imported] == ["bob"]
+    # The app's rows leave the id out, so the Postgres sequence numbers them.
+    assert "id" not in without_id and [row[without_id.index("actor")] for row in written] == ["alice", "carol"]
+    assert all(len(row) == len(without_id) for row in written)
+
+    user_columns = sqlite_columns(conn, "users")
+    (_, users), = iter_chunks(conn, "users", user_columns, 0, 100)
+    (batch_columns, _), = copy_batches(user_columns, users, serial_id=True)
+    assert "id" not in batch_columns
+
+    wbd_columns = sqlite_columns(conn, "wbd_tasks")
+    (_, tasks), = iter_chunks(conn, "wbd_tasks", wbd_columns, 0, 100)
+    (_, copied), = copy_batches(wbd_columns, tasks, serial_id=False)
+    assert copied[0][wbd_columns.index("id")]
+
+
+def test_prepare_creates_every_column_the_app_writes(tmp_path, monkeypatch):
+    target = PostgresDouble()
+    monkeypatch.setattr(Migration, "_pg", lambda self, autocommit=True: nullcontext(target))
+    # SQLite reserves sqlite_* names, so the double keeps its progress table under another one.
+    progress_ddl = migrate_to_postgres.PROGRESS_DDL.replace("sqlite_migration", "migration_progress")
+    monkeypatch.setattr(migrate_to_postgres, "PROGRESS_DDL", progress_ddl)
+    Migration(str(tmp_path / "node.db"), "postgresql://double/cirisnode").prepare([])
+
+    app_db = sqlite3.connect(str(tmp_path / "node.db"))
+    migrate(app_db)
+    for table in sqlite_tables(app_db):
+        assert sqlite_columns(target.db, table) == sqlite_columns(app_db, table), table
+    assert "payload" in sqlite_columns(target.db, "wbd_tasks")
+    assert sqlite_columns(target.db, "migration_progress")
+
+
+def test_target_must_be_postgres(tmp_path, monkeypatch):
+    monkeypatch.setattr("cirisnode.db.migrate_to_postgres.settings.DATABASE_URL", "")
+    with pytest.raises(ValueError):
+        migrate_sqlite_to_postgres(str(tmp_path / "node.db"))
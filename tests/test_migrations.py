@@ -0,0 +1,64 @@
+import sqlite3
+
+from cirisnode.db.migrations import LATEST_VERSION, columns, current_version, migrate
+
+
+def _legacy_database(path):
+    # Tables as an early deployment created them, before archiving, groups and OAuth.
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE jobs (id TEXT PRIMARY KEY, type TEXT NOT NULL, status TEXT NOT NULL,
+                           started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, finished_at TIMESTAMP,
+                           results_url TEXT, results_json TEXT);
+        CREATE TABLE wbd_tasks (id TEXT PRIMARY KEY, agent_task_id TEXT NOT NULL, status TEXT NOT NULL,
+                                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE TABLE audit_logs (id INTEGER PRIMARY KEY, timestamp TIMESTAMP, actor TEXT, event_type TEXT,
+                                 payload_sha256 TEXT, details TEXT);
+        CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT UNIQUE NOT NULL, password TEXT,
+                            role TEXT NOT NULL DEFAULT 'anonymous');
+        INSERT INTO users (username, role) VALUES ('alice', 'admin');
+        INSERT INTO wbd_tasks (agent_task_id, status) VALUES ('agent-1', 'open');
+        """
+    )
+    return conn
+
+
+def test_legacy_database_is_brought_up_to_date(tmp_path):
+    conn = _legacy_database(str(tmp_path / "legacy.db"))
+    assert migrate(conn) == list(range(1, LATEST_VERSION + 1))
+    assert current_version(conn) == LATEST_VERSION
+
+    assert {"archived", "payload"} <= set(columns(conn, "wbd_tasks"))
+    assert "archived" in columns(conn, "audit_logs")
+    assert {"provider", "shards_done", "error"} <= set(columns(conn, "jobs"))
+    assert conn.execute("SELECT COUNT(*) FROM wbd_tasks WHERE id IS NULL").fetchone() == (0,)
+    assert conn.execute("SELECT username, groups, oauth_provider FROM users").fetchall() == [("alice", "", None)]
+
+    assert migrate(conn) == []
+
+
+def test_list_queries_use_the_new_indexes(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "fresh.db"))
+    migrate(conn)
+
+    def plan(sql, params=()):
+        return " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+
+    audit = plan("SELECT * FROM audit_logs WHERE actor = ? ORDER BY timestamp DESC LIMIT 100", ("a",))
+    assert "idx_audit_logs_actor_ts" in audit and "TEMP B-TREE" not in audit
+    assert "idx_audit_logs_ts" in plan("SELECT * FROM audit_logs ORDER BY timestamp DESC LIMIT 100")
+    events = plan("SELECT * FROM agent_events ORDER BY node_ts DESC")
+    assert "idx_agent_events_node_ts" in events and "TEMP B-TREE" not in events
+    assert "idx_wbd_tasks_status_created" in plan(
+        "SELECT id FROM wbd_tasks WHERE status = 'open' AND created_at < ?", ("2025-01-01",)
+    )
+
+
+def test_fresh_and_legacy_jobs_tables_end_with_the_same_columns(tmp_path):
+    # schema.sql is the version 1 baseline; the progress columns come only from migration 4.
+    fresh = sqlite3.connect(str(tmp_path / "fresh.db"))
+    migrate(fresh)
+    legacy = _legacy_database(str(tmp_path / "legacy.db"))
+    migrate(legacy)
+    assert sorted(columns(fresh, "jobs")) == sorted(columns(legacy, "jobs"))
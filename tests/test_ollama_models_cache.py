@@ -0,0 +1,77 @@
+import asyncio
+
+import httpx
+from fastapi.testclient import TestClient
+
+from cirisnode.api.ollama import routes as ollama_routes
+from cirisnode.llm.client import get_upstream_client
+from cirisnode.llm.ollama_pool import OllamaPool
+from cirisnode.main import app
+
+
+def _tags_transport(state):
+    async def handler(request):
+        if request.url.path == "/api/ps":
+            return httpx.Response(200, json={"models": []})
+        state["calls"] += 1
+        await asyncio.sleep(state.get("delay", 0))
+        if state.get("down"):
+            raise httpx.ConnectError("down")
+        return httpx.Response(200, json={"models": [{"name": name} for name in state["models"]]})
+    return httpx.MockTransport(handler)
+
+
+async def test_model_list_is_served_stale_while_revalidating():
+    state = {"calls": 0, "models": ["llama3:latest"]}
+    pool = OllamaPool(["http://a"])
+    async with httpx.AsyncClient(transport=_tags_transport(state)) as client:
+        assert await pool.model_list(client, ttl=60) == ["llama3:latest"]
+        assert await pool.model_list(client, ttl=60) == ["llama3:latest"]
+        assert state["calls"] == 1
+
+        # Expired and Ollama is slow: the old list comes back at once, the refresh lands later.
+        state.update(models=["llama3:latest", "phi3:latest"], delay=0.05)
+        started = asyncio.get_running_loop().time()
+        assert await pool.model_list(client, ttl=0) == ["llama3:latest"]
+        assert asyncio.get_running_loop().time() - started < 0.04
+        await asyncio.sleep(0.1)
+        assert await pool.model_list(client, ttl=60) == ["llama3:latest", "phi3:latest"]
+
+
+async def test_outage_keeps_last_known_list_and_records_health():
+    state = {"calls": 0, "models": ["llama3:latest"]}
+    pool = OllamaPool(["http://a"])
+    async with httpx.AsyncClient(transport=_tags_transport(state)) as client:
+        await pool.model_list(client, ttl=60)
+        state["down"] = True
+        await pool.model_list(client, ttl=0)
+        await asyncio.sleep(0.01)
+        assert await pool.model_list(client, ttl=60) == ["llama3:latest"]
+    health = pool.endpoints[0].health()
+    assert health["healthy"] is False and health["consecutive_failures"] == 1
+    assert "ConnectError" in health["last_error"] and health["last_ok"] is not None
+
+
+def test_routes_report_models_and_endpoint_health(monkeypatch):
+    state = {"calls": 0, "models": ["llama3:latest"]}
+    pool = OllamaPool(["http://a", "http://b"])
+    monkeypatch.setattr(ollama_routes, "get_ollama_pool", lambda: pool)
+    app.dependency_overrides[get_upstream_client] = lambda: httpx.AsyncClient(transport=_tags_transport(state))
+    try:
+        client = TestClient(app)
+        assert client.get("/api/v1/ollama-models").json() == {"models": ["llama3:latest"]}
+        endpoints = client.get("/api/v1/ollama-endpoints").json()["endpoints"]
+        assert [e["url"] for e in endpoints] == ["http://a", "http://b"]
+        assert all(e["healthy"] for e in endpoints)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_route_is_503_when_ollama_never_answered(monkeypatch):
+    state = {"calls": 0, "models": [], "down": True}
+    monkeypatch.setattr(ollama_routes, "get_ollama_pool", lambda: OllamaPool(["http://a"]))
+    app.dependency_overrides[get_upstream_client] = lambda: httpx.AsyncClient(transport=_tags_transport(state))
+    try:
+        assert TestClient(app).get("/api/v1/ollama-models").status_code == 503
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,88 @@
+import asyncio
+
+import httpx
+import pytest
+
+from cirisnode.llm.ollama_pool import OllamaPool
+
+
+def test_pick_prefers_least_outstanding_with_model():
+    pool = OllamaPool(["http://a", "http://b", "http://c"])
+    a, b, c = pool.endpoints
+    a.models, b.models, c.models = {"llama3:latest"}, {"llama3:latest", "phi3"}, {"phi3"}
+    a.outstanding, b.outstanding, c.outstanding = 3, 1, 0
+    assert pool.pick("llama3") is b
+    assert pool.pick("llama3", exclude=[b]) is a
+    b.healthy = False
+    assert pool.pick("llama3") is a
+    assert pool.pick("mistral") is c  # nobody has it: least loaded healthy endpoint
+
+
+async def test_requests_spread_across_endpoints():
+    pool = OllamaPool(["http://a", "http://b"], hedge=False)
+    seen = []
+
+    async def call(base_url):
+        seen.append(base_url)
+        await asyncio.sleep(0.01)
+        return base_url
+
+    await asyncio.gather(*(pool.request("m", call) for _ in range(4)))
+    assert sorted(seen) == ["http://a", "http://a", "http://b", "http://b"]
+    assert all(e.outstanding == 0 for e in pool.endpoints)
+
+
+async def test_slow_request_is_hedged_and_loser_cancelled():
+    pool = OllamaPool(["http://slow", "http://fast"], hedge_min_samples=3)
+    slow, fast = pool.endpoints
+    slow.latencies.extend([0.01] * 5)
+    fast.outstanding = 1  # so the slow endpoint is picked first
+    cancelled = []
+
+    async def call(base_url):
+        if base_url == "http://slow":
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(base_url)
+                raise
+        return base_url
+
+    assert await asyncio.wait_for(pool.request("m", call), timeout=1) == "http://fast"
+    await asyncio.sleep(0)
+    assert cancelled == ["http://slow"] and pool.hedged == 1
+    assert slow.outstanding == 0
+
+
+async def test_hedge_falls_back_when_first_reply_fails():
+    pool = OllamaPool(["http://a", "http://b"], hedge_min_samples=1)
+    pool.endpoints[0].latencies.append(0.001)
+    pool.endpoints[1].outstanding = 1
+
+    async def call(base_url):
+        if base_url == "http://b":
+            raise httpx.ConnectError("down")
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    assert await pool.request("m", call) == "ok"
+    assert not pool.endpoints[1].healthy
+
+
+async def test_refresh_models_tracks_health():
+    def handler(request):
+        if request.url.host == "down":
+            raise httpx.ConnectError("down")
+        return httpx.Response(200, json={"models": [{"name": "llama3:latest"}]})
+
+    pool = OllamaPool(["http://up", "http://down"])
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        await pool.ensure_fresh(client)
+    up, down = pool.endpoints
+    assert up.models == {"llama3:latest"} and up.healthy
+    assert not down.healthy and pool.pick("llama3") is up
+
+
+def test_pool_requires_endpoints():
+    with pytest.raises(ValueError):
+        OllamaPool([])
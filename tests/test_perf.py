@@ -0,0 +1,38 @@
+from cirisnode.perf.suite import PerfConfig, compare, percentile, run_suite
+
+
+async def test_suite_reports_every_scenario_without_errors():
+    config = PerfConfig(
+        requests=10, concurrency=4, warmup=1, seed_events=20, seed_audit_logs=50, seed_wbd_tasks=5,
+        stub_latency="fixed:0",
+    )
+    report = await run_suite(config)
+    assert set(report["scenarios"]) == {"run_sync", "agent_event_ingest", "audit_log_query", "wbd_task_list"}
+    for result in report["scenarios"].values():
+        assert result["errors"] == 0
+        assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+        assert result["throughput_rps"] > 0 and result["peak_rss_mb"] > 0
+    assert report["meta"]["config"]["requests"] == 10
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    base = {"throughput_rps": 100.0, "p95_ms": 10.0, "p99_ms": 20.0, "errors": 0}
+    baseline = {"scenarios": {"a": base, "b": base}}
+    report = {"scenarios": {
+        "a": {**base, "throughput_rps": 80.0, "p95_ms": 12.0},
+        "b": {**base, "throughput_rps": 60.0, "p99_ms": 30.0, "errors": 2},
+        "new": base,
+    }}
+    regressions = compare(report, baseline, tolerance=0.3)
+    assert all(line.startswith("b:") for line in regressions) and len(regressions) == 3
+    assert percentile([3, 1, 2, 4], 50) == 2 and percentile([], 99) == 0.0
+
+
+async def test_wbd_scenario_reads_the_seeded_tasks(tmp_path):
+    from cirisnode.perf.suite import _perf_app, seed_database
+
+    config = PerfConfig(seed_events=1, seed_audit_logs=1, seed_wbd_tasks=9)
+    seed_database(str(tmp_path / "perf.db"), config)
+    async with _perf_app(config, str(tmp_path / "perf.db")) as client:
+        tasks = (await client.get("/api/v1/wa/tasks", params={"state": "open"})).json()["tasks"]
+    assert len(tasks) == 6 and {t["payload"] for t in tasks} == {"p" * 100}
@@ -0,0 +1,165 @@
+import re
+import sqlite3
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from cirisnode import database
+from cirisnode.db.dialect import to_postgres
+from cirisnode.db.migrations import LATEST_VERSION, migrate
+from cirisnode.db.postgres import PgConnection
+from cirisnode.main import app
+
+
+def test_sqlite_statements_translate_to_postgres():
+    assert to_postgres("SELECT * FROM audit_logs WHERE actor = ? LIMIT ? OFFSET ?") == (
+        "SELECT * FROM audit_logs WHERE actor = %s LIMIT %s OFFSET %s"
+    )
+    assert to_postgres("SELECT 1 WHERE x LIKE '50%?' AND y = ?") == "SELECT 1 WHERE x LIKE '50%%?' AND y = %s"
+    assert to_postgres("INSERT OR REPLACE INTO config (id, version, config_json) VALUES (1, ?, ?)") == (
+        "INSERT INTO config (id, version, config_json) VALUES (1, %s, %s) "
+        "ON CONFLICT (id) DO UPDATE SET version = EXCLUDED.version, config_json = EXCLUDED.config_json"
+    )
+    assert to_postgres("INSERT OR IGNORE INTO agent_tokens (token, owner) VALUES (?, ?);") == (
+        "INSERT INTO agent_tokens (token, owner) VALUES (%s, %s) ON CONFLICT DO NOTHING"
+    )
+    assert "(results_json)::jsonb #>> '{attestation,merkle_root}'" in to_postgres(
+        "SELECT id, json_extract(results_json, '$.attestation.merkle_root') FROM jobs"
+    )
+    assert "information_schema.columns WHERE table_name = 'jobs'" in to_postgres("PRAGMA table_info(jobs)")
+    assert to_postgres("PRAGMA journal_mode=WAL") is None
+
+
+def test_backend_follows_database_url(monkeypatch):
+    monkeypatch.setattr(database.settings, "DATABASE_URL", "")
+    assert database.database_backend() == "sqlite" and database.sqlite_path() == database.DATABASE_PATH
+    monkeypatch.setattr(database.settings, "DATABASE_URL", "sqlite:////tmp/node.db")
+    assert database.database_backend() == "sqlite" and database.sqlite_path() == "/tmp/node.db"
+    for url in ("postgresql://u:p@db/cirisnode", "postgres://db/x", "postgresql+psycopg://db/x"):
+        monkeypatch.setattr(database.settings, "DATABASE_URL", url)
+        assert database.database_backend() == "postgresql"
+
+
+class _FakeCursor:
+    def __init__(self, log):
+        self.log = log
+        self.description = None
+        self.rowcount = 0
+
+    def execute(self, statement, params):
+        self.log.append((statement, params))
+        self.description = [("x",)] if statement.startswith("SELECT") else None
+
+    def fetchall(self):
+        return [(1,)]
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.log = []
+
+    def cursor(self):
+        return _FakeCursor(self.log)
+
+
+def test_pg_connection_speaks_the_sqlite3_api():
+    raw = _FakeConnection()
+    conn = PgConnection(raw)
+    assert conn.execute("SELECT id FROM jobs WHERE status = ?", ["queued"]).fetchall() == [(1,)]
+    insert = conn.execute("INSERT INTO agent_events (id) VALUES (?)", ("e1",))
+    assert insert.fetchall() == [] and insert.lastrowid is None
+    assert conn.execute("PRAGMA synchronous=NORMAL").fetchone() is None
+    assert raw.log == [
+        ("SELECT id FROM jobs WHERE status = %s", ("queued",)),
+        ("INSERT INTO agent_events (id) VALUES (%s)", ("e1",)),
+    ]
+
+
+class _DoubleCursor:
+    def __init__(self, db):
+        self.db = db
+        self.description = None
+        self.rowcount = -1
+
+    def execute(self, statement, params):
+        assert "?" not in statement, f"untranslated SQLite placeholder in {statement!r}"
+        columns = re.search(r"FROM information_schema.columns WHERE table_name = '(\w+)'", statement)
+        if columns:
+            statement = f"SELECT cid, name, type, \"notnull\", dflt_value, 0 FROM pragma_table_info('{columns.group(1)}')"
+        self._cursor = self.db.execute(statement.replace("%s", "?").replace("%%", "%"), params)
+        self.description = self._cursor.description
+        self.rowcount = self._cursor.rowcount
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+
+class PostgresDouble:
+    """
+    Stands in for a psycopg connection: runs the Postgres SQL that PgConnection
+    sends on SQLite, with the schema's Postgres semantics (SERIAL ids, NOT NULL
+    primary keys) that SQLite would otherwise not enforce.
+    """
+
+    def __init__(self):
+        self.db = sqlite3.connect(":memory:", check_same_thread=False)
+        self.info = SimpleNamespace(transaction_status=0)
+
+    def execute(self, script):
+        script = re.sub(r"\bSERIAL PRIMARY KEY\b", "INTEGER PRIMARY KEY", script)
+        self.db.executescript(re.sub(r"\bTEXT PRIMARY KEY\b", "TEXT PRIMARY KEY NOT NULL", script))
+
+    def cursor(self):
+        return _DoubleCursor(self.db)
+
+    def commit(self):
+        self.db.commit()
+
+    def rollback(self):
+        self.db.rollback()
+
+
+class _DoublePools:
+    def __init__(self):
+        self.raw = PostgresDouble()
+
+    @contextmanager
+    def connection(self):
+        # Like psycopg_pool: commit on a clean exit, roll back on an exception.
+        try:
+            yield PgConnection(self.raw)
+        except BaseException:
+            self.raw.rollback()
+            raise
+        self.raw.commit()
+
+
+@pytest.fixture
+def postgres(monkeypatch):
+    pools = _DoublePools()
+    with pools.connection() as conn:
+        assert migrate(conn) == list(range(1, LATEST_VERSION + 1))
+    monkeypatch.setattr(database.settings, "DATABASE_URL", "postgresql://double/cirisnode")
+    monkeypatch.setattr(database, "get_pg_pools", lambda: pools)
+    return pools.raw.db
+
+
+def test_wa_task_routes_on_postgres(postgres):
+    client = TestClient(app)
+    submitted = client.post("/api/v1/wa/submit", json={"agent_task_id": "agent-1", "payload": "secret"})
+    assert submitted.status_code == 200, submitted.text
+    task_id = submitted.json()["task_id"]
+    assert task_id and postgres.execute("SELECT id FROM wbd_tasks").fetchall() == [(task_id,)]
+
+    tasks = client.get("/api/v1/wa/tasks", params={"state": "open"}).json()["tasks"]
+    assert [(t["id"], t["payload"]) for t in tasks] == [(task_id, "secret")]
+
+    resolved = client.post(f"/api/v1/wa/tasks/{task_id}/resolve", json={"decision": "approve"})
+    assert resolved.status_code == 200 and resolved.json()["task_id"] == task_id
+    assert postgres.execute("SELECT status FROM wbd_tasks").fetchone() == ("resolved",)
+    assert postgres.execute("SELECT COUNT(*) FROM audit_logs WHERE event_type LIKE 'wbd_%'").fetchone() == (2,)
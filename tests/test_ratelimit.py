@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from cirisnode.llm import client as llm_client
+from cirisnode.llm import ratelimit
+from cirisnode.llm.ratelimit import AdaptiveLimit, ProviderThrottle, TokenBucket, retry_after_seconds
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(ratelimit.settings, "LLM_BACKOFF_BASE", 0.001)
+    monkeypatch.setattr(ratelimit.settings, "LLM_MAX_RETRIES", 3)
+
+
+def test_retry_after_parsing():
+    assert retry_after_seconds(httpx.Response(429, headers={"Retry-After": "2"})) == 2.0
+    assert retry_after_seconds(httpx.Response(429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0.0
+    assert retry_after_seconds(httpx.Response(429)) is None
+
+
+async def test_token_bucket_spaces_requests():
+    bucket = TokenBucket(rate=50, burst=1)
+    started = time.perf_counter()
+    for _ in range(6):
+        await bucket.acquire()
+    assert time.perf_counter() - started >= 5 / 50 * 0.9
+
+
+def test_adaptive_limit_halves_once_per_burst_and_regrows():
+    limit = AdaptiveLimit(16, cooldown=60)
+    limit.on_throttle()
+    limit.on_throttle()
+    assert limit.current == 8
+    for _ in range(100):
+        limit.on_success()
+    assert limit.current == 16
+
+
+async def test_throttle_retries_429_honouring_retry_after():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(time.perf_counter())
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0.1"})
+        if len(calls) == 2:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"response": "A"})
+
+    throttle = ProviderThrottle(rate=0, max_concurrency=8)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        async def call():
+            response = await client.post("http://ollama/api/generate")
+            response.raise_for_status()
+            return response.json()["response"]
+        assert await throttle.call(call) == "A"
+    assert len(calls) == 3
+    assert calls[1] - calls[0] >= 0.1
+    assert throttle.limit.current == 4
+
+
+async def test_throttle_gives_up_on_client_errors():
+    attempts = []
+
+    async def bad_request():
+        attempts.append(1)
+        request = httpx.Request("POST", "http://x")
+        raise httpx.HTTPStatusError("bad", request=request, response=httpx.Response(400, request=request))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await ProviderThrottle(rate=0, max_concurrency=4).call(bad_request)
+    assert len(attempts) == 1
+
+
+async def test_adaptive_gate_caps_in_flight():
+    throttle = ProviderThrottle(rate=0, max_concurrency=2)
+    state = {"now": 0, "peak": 0}
+
+    async def work():
+        state["now"] += 1
+        state["peak"] = max(state["peak"], state["now"])
+        await asyncio.sleep(0.01)
+        state["now"] -= 1
+
+    await asyncio.gather(*(throttle.call(work) for _ in range(6)))
+    assert state["peak"] == 2
+
+
+async def test_generate_survives_a_transient_failure():
+    responses = iter([httpx.Response(502), httpx.Response(200, json={"response": " C "})])
+    async with httpx.AsyncClient(transport=httpx.MockTransport(lambda request: next(responses))) as client:
+        answer = await llm_client.generate("ollama", "retry-model", "q", client=client, use_cache=False)
+    assert answer == "C"
@@ -0,0 +1,118 @@
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from cirisnode.main import app
+from cirisnode.llm import client as llm_client
+from cirisnode.llm.response_cache import ResponseCache, cache_key, get_response_cache
+
+client = TestClient(app)
+
+
+def test_cache_key_covers_generation_params():
+    base = cache_key("ollama", "llama3", "Q", {"temperature": 0})
+    assert base == cache_key("ollama", "llama3", "Q", {"temperature": 0})
+    assert base != cache_key("ollama", "llama3", "Q", {"temperature": 1})
+    assert base != cache_key("openai", "llama3", "Q", {"temperature": 0})
+
+
+def test_memory_tier_is_lru():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("1", "3")
+
+
+def test_disk_tier_survives_new_instance_and_honours_ttl(tmp_path):
+    path = str(tmp_path / "cache.db")
+    ResponseCache(db_path=path).set("k", "answer")
+    assert ResponseCache(db_path=path).get("k") == "answer"
+
+    expiring = ResponseCache(db_path=path, ttl_seconds=0.01)
+    expiring.set("old", "stale")
+    time.sleep(0.02)
+    assert ResponseCache(db_path=path, ttl_seconds=0.01).get("old") is None
+
+
+def test_disk_tier_is_pruned_to_size(tmp_path):
+    cache = ResponseCache(max_entries=1, db_path=str(tmp_path / "cache.db"), max_disk_entries=5)
+    for i in range(ResponseCache.PRUNE_EVERY):
+        cache.set(f"k{i}", str(i))
+    count = cache._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+    assert count == 5
+    assert cache.get(f"k{ResponseCache.PRUNE_EVERY - 1}") is not None
+
+
+async def test_async_access_keeps_disk_io_on_the_db_executor(tmp_path, monkeypatch):
+    import threading
+
+    path = str(tmp_path / "cache.db")
+    cache = ResponseCache(db_path=path)
+    threads = []
+    disk_get, disk_set = cache._disk_get, cache._disk_set
+    monkeypatch.setattr(cache, "_disk_get", lambda *a: threads.append(threading.current_thread()) or disk_get(*a))
+    monkeypatch.setattr(cache, "_disk_set", lambda *a: threads.append(threading.current_thread()) or disk_set(*a))
+
+    written = cache.set_behind("k", "answer")
+    assert await cache.aget("k") == "answer"  # Straight from memory
+    written.result()
+    assert await ResponseCache(db_path=path).aget("k") == "answer"
+    assert await cache.aget("missing") is None
+    assert threads and threading.main_thread() not in threads
+
+
+@pytest.fixture
+def counting_ollama(monkeypatch):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"response": f"answer {len(calls)}"})
+
+    mock_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(llm_client, "get_http_client", lambda: mock_client)
+    get_response_cache().clear()
+    return calls
+
+
+def test_test_llm_is_cached_unless_fresh(counting_ollama):
+    body = {"provider": "ollama", "model": "llama3", "prompt": "cache me"}
+    first = client.post("/api/v1/test-llm", json=body).json()
+    second = client.post("/api/v1/test-llm", json=body).json()
+    assert first == second == {"message": "answer 1"}
+    assert len(counting_ollama) == 1
+
+    fresh = client.post("/api/v1/test-llm", json={**body, "fresh": True}).json()
+    assert fresh == {"message": "answer 2"}
+    assert len(counting_ollama) == 2
+
+
+def test_run_sync_uses_cache(counting_ollama):
+    body = {"provider": "ollama", "model": "llama3", "scenario_ids": ["1", "2"]}
+    client.post("/api/v1/simplebench/run-sync", json=body)
+    client.post("/api/v1/simplebench/run-sync", json=body)
+    assert len(counting_ollama) == 2
+    client.post("/api/v1/simplebench/run-sync", json={**body, "fresh": True})
+    assert len(counting_ollama) == 4
+
+
+async def test_openai_entries_are_not_shared_between_keys(monkeypatch):
+    keys = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        keys.append(request.headers["Authorization"])
+        return httpx.Response(200, json={"choices": [{"text": f"answer {len(keys)}"}]})
+
+    get_response_cache().clear()
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as mock_client:
+        first = await llm_client.generate("openai", "gpt", "shared prompt", api_key="sk-one", client=mock_client)
+        again = await llm_client.generate("openai", "gpt", "shared prompt", api_key="sk-one", client=mock_client)
+        other = await llm_client.generate("openai", "gpt", "shared prompt", api_key="sk-two", client=mock_client)
+    assert first == again == "answer 1"
+    assert other == "answer 2"
+    assert keys == ["Bearer sk-one", "Bearer sk-two"]
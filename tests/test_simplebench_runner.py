@@ -0,0 +1,163 @@
+import asyncio
+import json
+import time
+
+import httpx
+from fastapi.testclient import TestClient
+
+from cirisnode.main import app
+from cirisnode.api.benchmarks import runner
+from cirisnode.llm import client as llm_client
+
+client = TestClient(app)
+
+SCENARIOS = [
+    {"question_id": i, "prompt": f"Question {i}", "answer": "A" if i % 2 else "B"}
+    for i in range(1, 9)
+]
+
+
+def _fake_generate(delay=0.05, in_flight=None):
+    async def fake_generate(provider, model, prompt, **kwargs):
+        if in_flight is not None:
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(delay)
+        if in_flight is not None:
+            in_flight["now"] -= 1
+        return "A"
+    return fake_generate
+
+
+async def test_run_scenarios_is_concurrent_and_ordered(monkeypatch):
+    monkeypatch.setattr(runner.settings, "LLM_CONCURRENCY", 4)
+    in_flight = {"now": 0, "peak": 0}
+    monkeypatch.setattr(runner, "generate", _fake_generate(in_flight=in_flight))
+
+    started = time.perf_counter()
+    results = await runner.run_scenarios(SCENARIOS, "ollama", "concurrent-model")
+    elapsed = time.perf_counter() - started
+
+    assert [r["scenario_id"] for r in results] == [str(s["question_id"]) for s in SCENARIOS]
+    assert in_flight["peak"] == 4
+    # Eight prompts at four-wide should take about two prompt latencies, not eight.
+    assert elapsed < 0.05 * 6
+    assert [r["passed"] for r in results] == [bool(s["question_id"] % 2) for s in SCENARIOS]
+
+
+async def test_run_scenarios_respects_per_run_concurrency(monkeypatch):
+    monkeypatch.setattr(runner.settings, "LLM_CONCURRENCY", 8)
+    in_flight = {"now": 0, "peak": 0}
+    monkeypatch.setattr(runner, "generate", _fake_generate(delay=0.01, in_flight=in_flight))
+
+    await runner.run_scenarios(SCENARIOS, "ollama", "narrowed-model", concurrency=2)
+    assert in_flight["peak"] == 2
+
+
+def test_concurrency_limit_overrides(monkeypatch):
+    monkeypatch.setattr(runner.settings, "LLM_CONCURRENCY", 3)
+    monkeypatch.setattr(runner.settings, "LLM_CONCURRENCY_LIMITS", "ollama=2, openai/gpt-4o=8")
+    assert runner.get_concurrency_limit("ollama", "llama3") == 2
+    assert runner.get_concurrency_limit("openai", "gpt-4o") == 8
+    assert runner.get_concurrency_limit("openai", "gpt-3.5") == 3
+
+
+async def test_generate_ollama_uses_async_client():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/api/generate"
+        return httpx.Response(200, json={"response": "  B \n", "done": True})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as mock_client:
+        answer = await llm_client.generate("ollama", "llama3", "prompt", client=mock_client)
+    assert answer == "B"
+
+
+def test_run_sync_route_keeps_result_shape(monkeypatch):
+    monkeypatch.setattr(runner, "generate", _fake_generate(delay=0))
+    response = client.post(
+        "/api/v1/simplebench/run-sync",
+        json={"provider": "ollama", "model": "llama3", "scenario_ids": ["1", "2"]},
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["scenario_id"] for r in results] == ["1", "2"]
+    assert set(results[0]) == {"scenario_id", "prompt", "response", "expected_answer", "model_used", "passed"}
+
+
+def test_run_sync_rejects_unknown_provider():
+    response = client.post(
+        "/api/v1/simplebench/run-sync",
+        json={"provider": "nope", "model": "x", "scenario_ids": ["1"]},
+    )
+    assert response.status_code == 400
+
+
+def test_routes_reject_invalid_concurrency(monkeypatch):
+    monkeypatch.setattr(runner, "generate", _fake_generate(delay=0))
+    body = {"provider": "ollama", "model": "llama3", "scenario_ids": ["1"]}
+    for concurrency in (-1, 0, "lots", 1.5, True):
+        for path in ("/api/v1/simplebench/run-sync", "/api/v1/simplebench/run-stream"):
+            response = client.post(path, json={**body, "concurrency": concurrency})
+            assert response.status_code == 400, (path, concurrency)
+    assert client.post("/api/v1/simplebench/run-sync", json={**body, "concurrency": 10_000}).status_code == 200
+
+
+def test_routes_reject_invalid_generation_options(monkeypatch):
+    monkeypatch.setattr(runner, "generate", _fake_generate(delay=0))
+    body = {"provider": "ollama", "model": "llama3", "scenario_ids": ["1"]}
+    for options in ({"stop": "\n"}, {"num_predict": "lots"}):
+        for path in ("/api/v1/simplebench/run-sync", "/api/v1/simplebench/run-stream", "/api/v1/simplebench/run"):
+            response = client.post(path, json={**body, **options})
+            assert response.status_code == 400, (path, options)
+
+
+async def test_iter_scenario_results_yields_in_completion_order(monkeypatch):
+    async def fake_generate(provider, model, prompt, **kwargs):
+        # Later questions answer faster, so completion order is reversed.
+        await asyncio.sleep(0.01 * (10 - int(prompt.split()[-1])))
+        return "A"
+    monkeypatch.setattr(runner, "generate", fake_generate)
+
+    events = [e async for e in runner.iter_scenario_results(SCENARIOS[:3], "ollama", "stream-model")]
+    assert [e["scenario_id"] for e in events[:-1]] == ["3", "2", "1"]
+    assert events[-1] == {
+        "type": "summary", "model_used": "stream-model", "total": 3, "passed": 2, "errors": 0, "score": 66.67
+    }
+
+
+async def test_iter_scenario_results_reports_errors_without_stopping(monkeypatch):
+    async def flaky_generate(provider, model, prompt, **kwargs):
+        if prompt.endswith("2"):
+            raise httpx.ReadTimeout("slow")
+        return "A"
+    monkeypatch.setattr(runner, "generate", flaky_generate)
+
+    events = [e async for e in runner.iter_scenario_results(SCENARIOS[:3], "ollama", "flaky-model")]
+    errors = [e for e in events if e["type"] == "error"]
+    assert [e["scenario_id"] for e in errors] == ["2"]
+    assert events[-1]["total"] == 3 and events[-1]["errors"] == 1
+
+
+def test_run_stream_route_emits_ndjson(monkeypatch):
+    monkeypatch.setattr(runner, "generate", _fake_generate(delay=0))
+    with client.stream(
+        "POST",
+        "/api/v1/simplebench/run-stream",
+        json={"provider": "ollama", "model": "llama3", "scenario_ids": ["1", "2"]},
+    ) as response:
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.iter_lines() if line]
+    assert sorted(e["scenario_id"] for e in events if e["type"] == "result") == ["1", "2"]
+    assert events[-1]["type"] == "summary"
+
+
+def test_run_stream_route_emits_sse(monkeypatch):
+    monkeypatch.setattr(runner, "generate", _fake_generate(delay=0))
+    response = client.post(
+        "/api/v1/simplebench/run-stream",
+        json={"provider": "ollama", "model": "llama3", "scenario_ids": ["1"]},
+        headers={"Accept": "text/event-stream"},
+    )
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.startswith("event: result\ndata: ")
+    assert "event: summary" in response.text
@@ -0,0 +1,110 @@
+import asyncio
+
+import httpx
+import pytest
+
+from cirisnode.llm import client as llm_client
+from cirisnode.llm.singleflight import SingleFlight
+
+
+async def test_concurrent_calls_share_one_task():
+    flight = SingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "shared"
+
+    results = await asyncio.gather(*(flight.do("k", fn) for _ in range(5)))
+    assert results == ["shared"] * 5
+    assert len(calls) == 1
+    assert (flight.started, flight.coalesced) == (1, 4)
+    assert flight.in_flight() == 0
+
+    # Once the call has finished, the next one goes upstream again.
+    await flight.do("k", fn)
+    assert len(calls) == 2
+
+
+async def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+
+    async def fn():
+        await asyncio.sleep(0.01)
+        raise httpx.ConnectError("down")
+
+    results = await asyncio.gather(flight.do("k", fn), flight.do("k", fn), return_exceptions=True)
+    assert all(isinstance(r, httpx.ConnectError) for r in results)
+
+
+async def test_cancelled_waiter_does_not_cancel_others():
+    flight = SingleFlight()
+
+    async def fn():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    first = asyncio.ensure_future(flight.do("k", fn))
+    second = asyncio.ensure_future(flight.do("k", fn))
+    await asyncio.sleep(0.005)
+    first.cancel()
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+async def test_cancelling_the_last_waiter_cancels_the_call():
+    flight = SingleFlight()
+    upstream = {"cancelled": False}
+
+    async def fn():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            upstream["cancelled"] = True
+            raise
+        return "unused"
+
+    waiter = asyncio.ensure_future(flight.do("k", fn))
+    await asyncio.sleep(0.005)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    await asyncio.sleep(0)
+    assert upstream["cancelled"]
+    assert flight.in_flight() == 0
+
+
+async def test_generate_coalesces_identical_fresh_requests():
+    upstream = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        upstream.append(request)
+        await asyncio.sleep(0.02)
+        return httpx.Response(200, json={"response": "A"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as mock_client:
+        answers = await asyncio.gather(*(
+            llm_client.generate("ollama", "llama3", "same prompt", client=mock_client, use_cache=False)
+            for _ in range(4)
+        ))
+        await llm_client.generate("ollama", "llama3", "other prompt", client=mock_client, use_cache=False)
+    assert answers == ["A"] * 4
+    assert len(upstream) == 2
+
+
+async def test_generate_does_not_share_calls_across_api_keys():
+    keys = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        keys.append(request.headers["Authorization"])
+        await asyncio.sleep(0.02)
+        return httpx.Response(200, json={"choices": [{"text": "A"}]})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as mock_client:
+        await asyncio.gather(*(
+            llm_client.generate("openai", "gpt-4o", "same prompt", api_key=key, client=mock_client, use_cache=False)
+            for key in ("sk-tenant-a", "sk-tenant-b", "sk-tenant-a")
+        ))
+    assert sorted(keys) == ["Bearer sk-tenant-a", "Bearer sk-tenant-b"]
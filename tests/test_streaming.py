@@ -0,0 +1,88 @@
+import json
+
+import httpx
+import pytest
+
+from cirisnode.llm import client as llm_client
+from cirisnode.llm.client import GenerationOptions, generation_params
+from cirisnode.llm.streaming import match_answer, stream_ollama_generate
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("B", None),
+    ("B.", "B"),
+    ("(C) because", "C"),
+    ("A", None),
+    ("The answer is D\n", "D"),
+    ("Answer: (E)", "E"),
+    ("Thinking it over", None),
+])
+def test_match_answer_waits_for_a_boundary(text, expected):
+    assert match_answer(text) == expected
+
+
+def test_match_answer_final_accepts_end_of_text():
+    assert match_answer("The answer is B", final=True) == "B"
+    assert match_answer(" A ", final=True) == "A"
+
+
+@pytest.mark.parametrize("text", [
+    "A juggler throws a ball",
+    "A car would not fit through the gap",
+])
+@pytest.mark.parametrize("final", [False, True])
+def test_match_answer_reads_a_leading_article_as_prose(text, final):
+    assert match_answer(text, final=final) is None
+    assert match_answer(text + ", so the answer is C.", final=final) == "C"
+
+
+def _ndjson_stream(chunks, served):
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert json.loads(request.content)["stream"] is True
+
+        async def body():
+            for chunk in chunks:
+                served.append(chunk)
+                yield (json.dumps(chunk) + "\n").encode()
+        return httpx.Response(200, content=body())
+    return httpx.MockTransport(handler)
+
+
+async def test_stream_stops_at_first_answer():
+    chunks = [{"response": "The answer"}, {"response": " is C"}, {"response": ". Because"}]
+    chunks += [{"response": " more"} for _ in range(20)] + [{"response": "", "done": True}]
+    served = []
+    async with httpx.AsyncClient(transport=_ndjson_stream(chunks, served)) as client:
+        answer = await stream_ollama_generate(client, "http://ollama", {"model": "m"}, stop_when=match_answer)
+    assert answer == "C"
+    assert len(served) < len(chunks)
+
+
+async def test_stream_without_stop_returns_full_text():
+    chunks = [{"response": " Hello"}, {"response": " world "}, {"response": "", "done": True}]
+    async with httpx.AsyncClient(transport=_ndjson_stream(chunks, [])) as client:
+        assert await stream_ollama_generate(client, "http://ollama", {"model": "m"}) == "Hello world"
+
+
+async def test_stream_error_chunk_raises():
+    chunks = [{"error": "model not found"}]
+    async with httpx.AsyncClient(transport=_ndjson_stream(chunks, [])) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            await stream_ollama_generate(client, "http://ollama", {"model": "m"})
+
+
+async def test_generate_early_stop_returns_letter():
+    chunks = [{"response": "B"}, {"response": ") is right"}, {"response": "", "done": True}]
+    async with httpx.AsyncClient(transport=_ndjson_stream(chunks, [])) as client:
+        answer = await llm_client.generate(
+            "ollama", "early-stop-model", "q", client=client, use_cache=False,
+            options=GenerationOptions(stop_on_answer=True),
+        )
+    assert answer == "B"
+
+
+def test_generation_options_map_to_provider_params():
+    options = GenerationOptions.from_payload({"num_predict": 8, "stop": ["\n"], "early_stop": True})
+    assert generation_params("ollama", options) == {"options": {"num_predict": 8, "stop": ["\n"]}}
+    assert generation_params("openai", options)["max_tokens"] == 8
+    assert GenerationOptions.from_payload({"model": "x"}) is None
@@ -0,0 +1,64 @@
+import httpx
+import pytest
+
+from cirisnode.api.benchmarks import runner
+from cirisnode.llm import client as llm_client
+from cirisnode.llm.client import GenerationOptions
+from cirisnode.stub_llm.server import StubConfig, create_stub_app, parse_latency
+from cirisnode.utils.cache import get_simplebench_dataset
+
+
+def _client(**config):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=create_stub_app(StubConfig(**config))))
+
+
+async def test_simplebench_run_against_stub_scores_canned_answers():
+    scenarios = get_simplebench_dataset().scenarios
+    async with _client() as client:
+        results = await runner.run_scenarios(scenarios, "ollama", "stub", client=client, use_cache=False)
+    assert all(r["passed"] for r in results)
+
+    async with _client(accuracy=0.0) as client:
+        results = await runner.run_scenarios(scenarios, "ollama", "stub", client=client, use_cache=False)
+    assert not any(r["passed"] for r in results)
+
+
+async def test_streamed_verbose_answer_stops_at_the_letter():
+    scenario = get_simplebench_dataset().scenarios[0]
+    async with _client(answer_format="verbose", response_tokens=50) as client:
+        answer = await llm_client.generate(
+            "ollama", "stub", scenario["prompt"], client=client, use_cache=False,
+            options=GenerationOptions(stop_on_answer=True),
+        )
+        stats = (await client.get("http://stub/stub/stats")).json()
+    assert answer == scenario["answer"]
+    assert stats["in_flight"] == 0
+
+
+async def test_stub_speaks_tags_ps_and_openai_completions():
+    async with _client(models=["llama3:latest"]) as client:
+        assert (await client.get("http://stub/api/tags")).json()["models"][0]["name"] == "llama3:latest"
+        completion = await client.post("http://stub/v1/completions", json={"model": "gpt", "prompt": "hi"})
+        assert completion.json()["choices"][0]["text"] in "ABCD"
+        assert (await client.get("http://stub/api/ps")).json()["models"] == [{"name": "gpt", "model": "gpt"}]
+
+
+async def test_stub_errors_drive_the_retry_path(monkeypatch):
+    monkeypatch.setattr(llm_client.settings, "LLM_MAX_RETRIES", 1)
+    monkeypatch.setattr(llm_client.settings, "LLM_BACKOFF_BASE", 0.001)
+    async with _client(error_rate=1.0, throttle_share=1.0, retry_after=0.01) as client:
+        response = await client.post("http://stub/api/generate", json={"model": "m", "prompt": "p"})
+        assert response.status_code == 429 and response.headers["Retry-After"] == "0.01"
+        with pytest.raises(httpx.HTTPStatusError):
+            await llm_client.generate("ollama", "stub-errors", "p", client=client, use_cache=False)
+        assert (await client.get("http://stub/stub/stats")).json()["throttled"] == 3
+
+
+def test_latency_specs():
+    import random
+    rng = random.Random(1)
+    assert parse_latency("fixed:0.2")(rng) == 0.2
+    assert 0.1 <= parse_latency("uniform:0.1:0.3")(rng) <= 0.3
+    assert parse_latency("normal:0:0.0001")(rng) >= 0
+    with pytest.raises(ValueError):
+        parse_latency("weibull:1")